@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+
+from dashboard.tag_index import TagIndex
+
+# the dimensions every sidebar filter maps onto
+CUBE_KEYS = ("release_year", "price_tier", "genres", "categories")
+# rows kept per cell for the gallery, the top-N slider goes up to 50
+TOP_K = 50
+
+
+class Cube:
+    """
+    Pre-aggregated view of the catalogue for the sidebar filters.
+
+    One cell per distinct (release_year, price_tier, genre set, category
+    set) combination, so a game with several tags still counts once.
+    Each cell holds its game count, the sum of current players and the
+    row positions of its top `top_k` games by current players. Filters
+    select cells through TagIndex/isin over the cells, and the charts
+    and gallery are answered from the selected cells without scanning
+    the rows.
+    """
+
+    def __init__(self, df: pd.DataFrame, top_k: int = TOP_K):
+        self.df = df
+        self.top_k = top_k
+        keys = list(CUBE_KEYS)
+        grouped = df.groupby(keys, dropna=False, sort=False)
+        cell_of_row = grouped.ngroup().to_numpy()
+        self.cells = grouped.agg(
+            games=("appid", "size"), sum_players=("current_players", "sum")
+        ).reset_index()
+        self.tag_index = {
+            column: TagIndex(self.cells[column])
+            for column in ("genres", "categories")
+        }
+
+        # per-cell top-K rows, stored CSR style: the rows of cell i are
+        #  top_rows[offsets[i]:offsets[i + 1]], best first
+        players = self.players = df["current_players"].to_numpy(
+            dtype=float, na_value=np.nan
+        )
+        ranked = np.nan_to_num(players, nan=-np.inf)
+        order = np.lexsort((np.arange(len(df)), -ranked, cell_of_row))
+        sorted_cells = cell_of_row[order]
+        starts = np.searchsorted(sorted_cells, sorted_cells, side="left")
+        keep = np.arange(len(order)) - starts < top_k
+        self.top_rows = order[keep]
+        lengths = np.bincount(sorted_cells[keep], minlength=len(self.cells))
+        self.offsets = np.concatenate(([0], np.cumsum(lengths)))
+
+    def cell_mask(self, filters) -> np.ndarray:
+        cells = self.cells
+        mask = np.ones(len(cells), dtype=bool)
+        for column, tags in (
+            ("genres", filters.genres), ("categories", filters.categories)
+        ):
+            if tags:
+                mask &= self.tag_index[column].match(tags, filters.match)
+        for column, values in (
+            ("release_year", filters.years), ("price_tier", filters.tiers)
+        ):
+            if values:
+                mask &= cells[column].isin(values).to_numpy(
+                    dtype=bool, na_value=False
+                )
+        return mask
+
+    def release_counts(self, filters) -> pd.Series:
+        selected = self.cells[self.cell_mask(filters)]
+        counts = selected.groupby("release_year")["games"].sum()
+        return counts.sort_index().rename("games")
+
+    def top_rows_for(self, filters, top_n: int) -> np.ndarray:
+        """Row positions of the top_n games by current players."""
+        if top_n > self.top_k:
+            raise ValueError(
+                f"top_n={top_n} exceeds the cube's top_k={self.top_k}"
+            )
+        lengths = np.diff(self.offsets)
+        candidates = self.top_rows[
+            np.repeat(self.cell_mask(filters), lengths)
+        ]
+        players = self.players[candidates]
+        candidates = candidates[~np.isnan(players)]
+        players = players[~np.isnan(players)]
+        # highest first, ties in row order like DataFrame.nlargest
+        order = np.lexsort((candidates, -players))
+        return candidates[order[:top_n]]
@@ -0,0 +1,41 @@
+from dataclasses import dataclass
+import pandas as pd
+
+from dashboard.queries import frame_query
+from etl.load.snapshot import read_snapshot
+
+
+@dataclass(frozen=True)
+class Dataset:
+    """
+    One read-only copy of the catalogue columns the dashboard reads.
+
+    Held once per server process (st.cache_resource) and shared by every
+    session, so nothing here may be modified in place. The columns are
+    Arrow-backed and immutable, and sessions only ever derive masks and
+    small results from them.
+    """
+
+    frame: pd.DataFrame
+    version: str
+    loaded_at: pd.Timestamp
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.frame.memory_usage(index=True, deep=True).sum())
+
+
+def load_dataset(engine, version: str | None = None) -> Dataset:
+    sql, params = frame_query()
+    with engine.connect() as conn:
+        frame = pd.read_sql(sql, conn, params=params, dtype_backend="pyarrow")
+    loaded_at = pd.Timestamp.now(tz="UTC")
+    return Dataset(frame, version or loaded_at.isoformat(), loaded_at)
+
+
+# the ETL's Arrow snapshot, memory-mapped: the columns point into the
+#  page cache and only the pages a view touches are ever read
+def load_snapshot(path, version: str | None = None) -> Dataset:
+    frame = read_snapshot(path).to_pandas(types_mapper=pd.ArrowDtype)
+    loaded_at = pd.Timestamp.now(tz="UTC")
+    return Dataset(frame, version or loaded_at.isoformat(), loaded_at)
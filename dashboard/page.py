@@ -0,0 +1,352 @@
+import os
+import pandas as pd
+import streamlit as st
+
+from dashboard.dataset import load_dataset, load_snapshot
+from dashboard.projections import TIERS, Projections, Scenario
+from dashboard.queries import SEARCH_PAGE_SIZE, SIMILAR_LIMIT, Filters
+from dashboard.sources import FrameSource, SqlSource
+from etl.load.load import TABLE
+from etl.load.snapshot import SNAPSHOT_PATH, snapshot_version
+from etl.load.version import data_versions
+from utils.memory import SessionMemory
+
+# "sql" pushes every filter into the database, "memory" loads the whole
+#  table once and filters it in pandas, "file" maps the ETL's Arrow
+#  snapshot and never connects to the database
+DASHBOARD_SOURCE = os.getenv("DASHBOARD_SOURCE", "sql")
+# how many games' details are kept across all sessions, and for how long
+DETAILS_CACHE_SIZE = int(os.getenv("DASHBOARD_DETAILS_CACHE_SIZE", "256"))
+DETAILS_CACHE_TTL = int(os.getenv("DASHBOARD_DETAILS_CACHE_TTL", "600"))
+# how often the published data version is checked, in seconds
+VERSION_CHECK_TTL = int(os.getenv("DASHBOARD_VERSION_CHECK_TTL", "5"))
+# filter combinations kept per cached view
+RESULT_CACHE_SIZE = int(os.getenv("DASHBOARD_RESULT_CACHE_SIZE", "512"))
+# shows the server's RSS per session in the sidebar
+SHOW_MEMORY = os.getenv("DASHBOARD_SHOW_MEMORY", "0") == "1"
+
+
+# builds the configured data source on top of an engine for one set of
+#  published data versions, see current_source for the cached one
+def make_source(engine, name: str | None = None, versions: tuple = ()):
+    name = name or os.getenv("DASHBOARD_SOURCE", DASHBOARD_SOURCE)
+    if name == "sql":
+        return SqlSource(engine, versions)
+    if name == "memory":
+        version = dict(versions).get(TABLE)
+        dataset = shared_dataset(engine, version)
+        return FrameSource(dataset.frame, engine, versions)
+    if name == "file":
+        dataset = shared_snapshot(SNAPSHOT_PATH, dict(versions).get("file"))
+        return FrameSource(dataset.frame, None, versions)
+    raise ValueError(f"Unknown DASHBOARD_SOURCE: {name}")
+
+
+# the versions the last load published, one tiny read shared by every
+#  session and repeated at most every VERSION_CHECK_TTL seconds
+@st.cache_data(ttl=VERSION_CHECK_TTL, show_spinner=False)
+def published_versions(_engine):
+    return data_versions(_engine)
+
+
+# the source for the published versions, rebuilt only when a load bumps
+#  one of them; the previous source is evicted
+@st.cache_resource(max_entries=1, show_spinner=False)
+def shared_source(_engine, name, versions):
+    return make_source(_engine, name, versions)
+
+
+def current_source(engine, name: str | None = None):
+    name = name or os.getenv("DASHBOARD_SOURCE", DASHBOARD_SOURCE)
+    if name == "file":
+        # a stat() of the snapshot, a new file means a new version
+        versions = (("file", snapshot_version(SNAPSHOT_PATH)),)
+    else:
+        versions = published_versions(engine)
+    return shared_source(engine, name, versions)
+
+
+# one read-only copy of the summary data per server process and version
+#  st.cache_resource hands every session the same object, where
+#  st.cache_data would unpickle a private copy for each caller
+@st.cache_resource(max_entries=1, show_spinner="Loading games…")
+def shared_dataset(_engine, version):
+    return load_dataset(_engine, version and str(version))
+
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def shared_snapshot(path, version):
+    return load_snapshot(path, version)
+
+
+@st.cache_resource
+def session_memory():
+    return SessionMemory()
+
+
+# counts this session once and logs what the process holds per session
+def track_session():
+    tracker = session_memory()
+    if not st.session_state.get("memory_tracked"):
+        st.session_state.memory_tracked = True
+        tracker.register()
+        print(f"Dashboard session joined: {tracker.report()}")
+    if SHOW_MEMORY:
+        st.sidebar.caption(tracker.report())
+
+
+# query results are cached per source and data version, so a load makes
+#  the next rerun read fresh results instead of waiting out a ttl
+#  the leading underscore keeps streamlit from hashing the source itself
+@st.cache_data(max_entries=RESULT_CACHE_SIZE, show_spinner=False)
+def filter_options(_source, source_key):
+    return _source.filter_options()
+
+
+@st.cache_data(max_entries=RESULT_CACHE_SIZE, show_spinner=False)
+def release_counts(_source, source_key, filters):
+    return _source.release_counts(filters)
+
+
+@st.cache_data(max_entries=RESULT_CACHE_SIZE, show_spinner=False)
+def top_games(_source, source_key, filters, top_n):
+    return _source.top_games(filters, top_n)
+
+
+# one row by appid, a bounded LRU/TTL cache shared by every session
+@st.cache_data(
+    ttl=DETAILS_CACHE_TTL, max_entries=DETAILS_CACHE_SIZE, show_spinner=False
+)
+def game_details(_source, source_key, appid):
+    return _source.game_details(appid)
+
+
+# one page of full-text matches, ranked by the database
+@st.cache_data(max_entries=RESULT_CACHE_SIZE, show_spinner=False)
+def search_games(_source, source_key, query, page, page_size):
+    return _source.search(query, page, page_size)
+
+
+# the precomputed neighbours of one game
+@st.cache_data(max_entries=RESULT_CACHE_SIZE, show_spinner=False)
+def similar_games(_source, source_key, appid):
+    return _source.similar_games(appid, SIMILAR_LIMIT)
+
+
+# player count trend from the rollup table, one small read per game
+@st.cache_data(max_entries=RESULT_CACHE_SIZE, show_spinner=False)
+def player_trend(_source, source_key, appid, grain):
+    return _source.player_trend(appid, grain)
+
+
+# per-game projection inputs as arrays, once per source and data version
+@st.cache_resource(max_entries=1, show_spinner=False)
+def shared_projections(_source, source_key):
+    return Projections(_source.projection_inputs())
+
+
+# one summary per scenario, the slider values are the cache key
+@st.cache_data(max_entries=RESULT_CACHE_SIZE, show_spinner=False)
+def revenue_projection(_projections, source_key, scenario):
+    return _projections.summary(scenario)
+
+
+def clear_selection():
+    st.session_state.selected_appid = None
+
+
+# Filtering options
+def sidebar_filters(source) -> Filters:
+    options = filter_options(source, source.cache_key)
+    st.sidebar.header("Filters")
+    sel_genres = st.sidebar.multiselect(
+        "Genres", options["genres"], default=[]
+    )
+    sel_categories = st.sidebar.multiselect(
+        "Categories", options["categories"], default=[]
+    )
+    match = st.sidebar.radio(
+        "Match genres/categories", ["any", "all"], horizontal=True
+    )
+    sel_years = st.sidebar.multiselect(
+        "Release Year", options["years"], default=[]
+    )
+    sel_tiers = st.sidebar.multiselect(
+        "Price Tier", options["tiers"], default=[]
+    )
+    return Filters.from_selection(
+        sel_genres, sel_categories, sel_years, sel_tiers, match
+    )
+
+
+# Gallery of top games
+def render_gallery(top_df: pd.DataFrame):
+    cols = st.columns(5)
+    for idx, row in top_df.iterrows():
+        col = cols[idx % 5]
+        with col:
+            # Display cover and caption
+            st.image(
+                row["header_image"],
+                caption=row["name"],
+                use_container_width=True
+            )
+            # Center the Details button via three sub-columns
+            left, center, right = col.columns([1, 2, 1])
+            with center:
+                if st.button("Details", key=f"details_{idx}"):
+                    st.session_state.selected_appid = int(row["appid"])
+                    st.rerun()
+
+
+# Details view
+def render_details(source, game):
+    # game title
+    st.markdown(
+        f"<h2 style='text-align: center;'>🕹️ {game['name']}</h2>",
+        unsafe_allow_html=True
+    )
+    # Back button
+    st.button("← Back to gallery", on_click=clear_selection)
+
+    # game details
+    c1, c2 = st.columns([1, 2])
+    with c1:
+        if pd.notna(game["header_image"]):
+            st.image(game["header_image"], use_container_width=True)
+
+    with c2:
+        # Split into two sub‐columns for readability
+        m1, m2 = st.columns(2)
+
+        with m1:
+            st.write("**Price:**", f"${game['price']:.2f}")
+            st.write("**Price tier:**", game["price_tier"])
+            st.write("**Current players:**", f"{game['current_players']:,}")
+            est_rev_k = game["estimated_revenue"] / 1000
+            st.write("**Est. revenue:**", f"${est_rev_k:.1f} k")
+            st.write("**Metacritic score:**", game["metacritic_score"])
+            st.write("**Positive ratio:**", f"{game['positive_ratio']:.1f}%")
+
+        with m2:
+            st.write("**Release date:**", game["release_date"])
+            st.write("**Developers:**", game["developers"])
+            st.write("**DLC count:**", int(game["dlc_count"]))
+            platforms = ", ".join(
+                p for p in ("Windows", "Mac", "Linux") if game[p.lower()]
+            )
+            st.write("**Platforms:**", platforms)
+            st.write("**Categories:**", game["categories"])
+            st.write("**Genres:**", game["genres"])
+
+    # Player count trend from the hourly/daily rollups
+    st.markdown("### Player count trend")
+    grain = st.radio("Granularity", ["day", "hour"], horizontal=True)
+    trend = player_trend(source, source.cache_key, int(game["appid"]), grain)
+    if trend.empty:
+        st.info("No player count history recorded for this game yet.")
+    else:
+        st.line_chart(trend[["max_players", "avg_players"]])
+
+    # Precomputed neighbours, each opens its own details view
+    st.markdown("### Similar games")
+    similar = similar_games(source, source.cache_key, int(game["appid"]))
+    if similar.empty:
+        st.info("No similar games computed for this game yet.")
+    else:
+        render_gallery(similar)
+
+    # Full description below the metrics
+    st.markdown("### About the game")
+    st.write(game["about_the_game"])
+
+
+# Search results, a page at a time
+def render_search(source, query: str):
+    page = st.number_input(
+        "Page", min_value=1, value=1, step=1, key=f"search_page_{query}"
+    )
+    results, total = search_games(
+        source, source.cache_key, query, int(page), SEARCH_PAGE_SIZE
+    )
+    if results.empty:
+        st.info("No games match your search." if page == 1
+                else "No more matches.")
+        return
+    first = (page - 1) * SEARCH_PAGE_SIZE + 1
+    st.caption(f"Matches {first}–{first + len(results) - 1} of {total}")
+    render_gallery(results)
+
+
+# Revenue projections for the whole catalogue under slider scenarios
+def render_projections(source):
+    with st.expander("Revenue projections"):
+        c1, c2 = st.columns(2)
+        with c1:
+            cut = st.slider("Platform cut (%)", 0, 50, 30)
+            discount = st.slider("Regional discount (%)", 0, 50, 0)
+            conversion = st.slider("Owners who pay (%)", 0, 100, 100)
+            refunds = st.slider("Refund rate (%)", 0, 30, 0)
+        with c2:
+            changes = tuple(
+                (tier, st.slider(f"{tier} price change (%)", -50, 50, 0)
+                 / 100)
+                for tier in TIERS if tier != "Free"
+            )
+        scenario = Scenario(
+            platform_cut=cut / 100,
+            regional_discount=discount / 100,
+            conversion_rate=conversion / 100,
+            refund_rate=refunds / 100,
+            tier_price_change=changes,
+        )
+        projections = shared_projections(source, source.cache_key)
+        result = revenue_projection(projections, source.cache_key, scenario)
+
+        st.metric(
+            "Projected revenue",
+            f"${result['projected']:,.0f}",
+            f"{result['projected'] - result['baseline']:+,.0f} vs. estimate",
+        )
+        st.bar_chart(result["by_tier"])
+        st.dataframe(result["top_games"], hide_index=True)
+
+
+def render_dashboard(source):
+    """Sidebar, charts, gallery and details view over a data source."""
+    track_session()
+    filters = sidebar_filters(source)
+
+    if "selected_appid" not in st.session_state:
+        st.session_state.selected_appid = None
+
+    if st.session_state.selected_appid is not None:
+        game = game_details(
+            source, source.cache_key, st.session_state.selected_appid
+        )
+        if game is not None:
+            render_details(source, game)
+            return
+        clear_selection()
+
+    # Full-text search replaces the charts while there is a query
+    query = st.text_input(
+        "Search games", placeholder="Name, developer, genre or description"
+    ).strip()
+    if query:
+        st.subheader("Search Results")
+        render_search(source, query)
+        return
+
+    # Games per year
+    st.subheader("Games Released per Year")
+    st.bar_chart(release_counts(source, source.cache_key, filters))
+
+    # games per current players
+    st.subheader("Top Games by Current Players")
+    top_n = st.slider(
+        "Display Top Games", min_value=5, max_value=50, value=10
+    )
+    render_gallery(top_games(source, source.cache_key, filters, top_n))
+
+    render_projections(source)
@@ -0,0 +1,100 @@
+from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+
+# price tiers as enrich_price assigns them, in chart order
+TIERS = ("Free", "Indie", "Standard", "Premium")
+# the columns a projection needs, read once per data version
+PROJECTION_COLUMNS = (
+    "appid", "name", "estimated_owners", "price", "price_tier",
+)
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """
+    One set of projection parameters, hashable so it can key a cache.
+    The defaults reproduce enrich_price's estimated_revenue.
+    """
+
+    platform_cut: float = 0.30
+    regional_discount: float = 0.0
+    conversion_rate: float = 1.0
+    refund_rate: float = 0.0
+    # relative price change per tier, as (tier, change) pairs
+    tier_price_change: tuple = ()
+
+    def tier_changes(self) -> np.ndarray:
+        changes = dict(self.tier_price_change)
+        return np.array([changes.get(t, 0.0) for t in TIERS], dtype=float)
+
+
+class Projections:
+    """
+    Per-game inputs as NumPy arrays, built once per data version.
+    project() evaluates any number of scenarios for every game at once
+    by broadcasting (scenarios x 1) parameters against (1 x games).
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.appids = df["appid"].to_numpy()
+        self.names = df["name"].to_numpy(dtype=object)
+        self.owners = df["estimated_owners"].to_numpy(
+            dtype=float, na_value=0.0
+        )
+        prices = pd.to_numeric(df["price"], errors="coerce")
+        self.prices = np.nan_to_num(
+            prices.to_numpy(dtype=float, na_value=np.nan)
+        )
+        tiers = df["price_tier"].astype(object).to_numpy()
+        self.tier_codes = np.select(
+            [tiers == t for t in TIERS], range(len(TIERS)), default=0
+        )
+        (self.baseline,) = self.project([Scenario()])
+
+    def project(self, scenarios) -> np.ndarray:
+        """Projected revenue, shape (len(scenarios), games)."""
+        params = np.array([
+            [s.platform_cut, s.regional_discount,
+             s.conversion_rate, s.refund_rate]
+            for s in scenarios
+        ], dtype=float)
+        cut, discount, conversion, refunds = (
+            params[:, [i]] for i in range(4)
+        )
+        tier_changes = np.stack([s.tier_changes() for s in scenarios])
+        prices = self.prices * (1 + tier_changes[:, self.tier_codes])
+        return (
+            self.owners * conversion * prices
+            * (1 - discount) * (1 - refunds) * (1 - cut)
+        )
+
+    def summary(self, scenario: Scenario, top_n: int = 10) -> dict:
+        """Totals against the baseline, per tier and the top games."""
+        baseline = self.baseline
+        (projected,) = self.project([scenario])
+        by_tier = pd.DataFrame({
+            "baseline": np.bincount(
+                self.tier_codes, baseline, minlength=len(TIERS)
+            ),
+            "projected": np.bincount(
+                self.tier_codes, projected, minlength=len(TIERS)
+            ),
+        }, index=pd.Index(TIERS, name="price_tier"))
+        # partition first, only the top_n games get sorted
+        top = np.arange(len(projected))
+        if top_n < len(projected):
+            top = np.argpartition(-projected, top_n)[:top_n]
+        top = top[np.argsort(-projected[top], kind="stable")]
+        top_games = pd.DataFrame({
+            "appid": self.appids[top],
+            "name": self.names[top],
+            "baseline": baseline[top].round(1),
+            "projected": projected[top].round(1),
+        })
+        return {
+            "baseline": float(baseline.sum()),
+            "projected": float(projected.sum()),
+            "by_tier": by_tier,
+            "top_games": top_games,
+        }
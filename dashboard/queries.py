@@ -0,0 +1,219 @@
+import re
+from dataclasses import dataclass
+from sqlalchemy import text
+
+from dashboard.projections import PROJECTION_COLUMNS
+from etl.load.load import TABLE
+from etl.load.queries import tag_filter_clause
+from etl.load.similar import SIMILAR_TABLE
+
+# the gallery only needs these, never the long description
+SUMMARY_COLUMNS = ("appid", "name", "header_image", "current_players")
+# what the in-memory source keeps per game: the summary and the filter
+#  columns, descriptions and images are fetched by appid when needed
+FRAME_COLUMNS = (
+    "appid", "name", "current_players",
+    "genres", "categories", "release_year", "price_tier",
+)
+# everything the details view shows for a single game
+DETAIL_COLUMNS = (
+    "appid", "name", "release_date", "price", "dlc_count", "header_image",
+    "about_the_game", "windows", "mac", "linux", "metacritic_score",
+    "developers", "categories", "genres", "current_players",
+    "estimated_revenue", "price_tier", "positive_ratio",
+)
+# neighbours shown in the details view
+SIMILAR_LIMIT = 5
+# matches per page of search results
+SEARCH_PAGE_SIZE = 20
+# ranked full-text search, the tsvector weights name > developers >
+#  genres > description and bm25 gets the same order on SQLite
+SEARCH_SQL = {
+    "postgresql": (
+        "SELECT {columns}, ts_rank(g.search_vector, q) AS rank, "
+        "COUNT(*) OVER () AS total "
+        "FROM {table} AS g, websearch_to_tsquery('english', :query) AS q "
+        "WHERE g.search_vector @@ q "
+        "ORDER BY rank DESC, g.current_players DESC NULLS LAST, g.appid "
+        "LIMIT :limit OFFSET :offset"
+    ),
+    # bm25() can't share a SELECT with a window function, hence the CTE
+    "sqlite": (
+        "WITH hits AS ("
+        "SELECT rowid AS appid, "
+        "-bm25(kr_so_capstone_search, 10.0, 4.0, 2.0, 1.0) AS rank "
+        "FROM kr_so_capstone_search WHERE kr_so_capstone_search MATCH :query"
+        ") "
+        "SELECT {columns}, h.rank, COUNT(*) OVER () AS total "
+        "FROM hits AS h JOIN {table} AS g ON g.appid = h.appid "
+        "ORDER BY h.rank DESC, g.current_players DESC, g.appid "
+        "LIMIT :limit OFFSET :offset"
+    ),
+}
+# sql for the distinct sidebar values, per dialect for the tag columns
+TAG_OPTIONS_SQL = {
+    "postgresql": {
+        "genres": "SELECT DISTINCT unnest(genre_tags) AS tag "
+                  f"FROM {TABLE} ORDER BY tag",
+        "categories": "SELECT DISTINCT unnest(category_tags) AS tag "
+                      f"FROM {TABLE} ORDER BY tag",
+    },
+    "sqlite": {
+        "genres": "SELECT DISTINCT genre AS tag "
+                  "FROM kr_so_capstone_genres ORDER BY tag",
+        "categories": "SELECT DISTINCT category AS tag "
+                      "FROM kr_so_capstone_categories ORDER BY tag",
+    },
+}
+
+
+@dataclass(frozen=True)
+class Filters:
+    """The sidebar selections, hashable so they can key st.cache_data."""
+
+    genres: tuple = ()
+    categories: tuple = ()
+    years: tuple = ()
+    tiers: tuple = ()
+    match: str = "any"
+
+    @classmethod
+    def from_selection(cls, genres=(), categories=(), years=(), tiers=(),
+                       match="any"):
+        # numpy ints from the option lists can't be sent as query params
+        return cls(
+            genres=tuple(str(g) for g in genres),
+            categories=tuple(str(c) for c in categories),
+            years=tuple(int(y) for y in years),
+            tiers=tuple(str(t) for t in tiers),
+            match=match,
+        )
+
+
+def where_clause(filters: Filters, dialect: str = "postgresql"):
+    """
+    Turn the sidebar filters into a parameterized WHERE clause.
+    Returns (sql, params), sql is "" when nothing is selected.
+    """
+    clauses, params = [], {}
+    for column, tags in (
+        ("genres", filters.genres), ("categories", filters.categories)
+    ):
+        clause, clause_params = tag_filter_clause(
+            column, tags, filters.match, dialect=dialect
+        )
+        if clause:
+            clauses.append(clause)
+            params.update(clause_params)
+    for column, values in (
+        ("release_year", filters.years), ("price_tier", filters.tiers)
+    ):
+        if values:
+            names = {f"{column}_{i}": v for i, v in enumerate(values)}
+            marks = ", ".join(f":{name}" for name in names)
+            clauses.append(f"{column} IN ({marks})")
+            params.update(names)
+    if not clauses:
+        return "", params
+    return " WHERE " + " AND ".join(clauses), params
+
+
+# games per release year for the bar chart, counted by the database
+def release_counts_query(filters: Filters, dialect: str = "postgresql"):
+    where, params = where_clause(filters, dialect)
+    sql = (
+        f"SELECT release_year, COUNT(*) AS games FROM {TABLE}{where} "
+        "GROUP BY release_year ORDER BY release_year"
+    )
+    return text(sql), params
+
+
+# the top N games by current players, ordered and limited by the database
+def top_games_query(
+    filters: Filters,
+    top_n: int,
+    dialect: str = "postgresql",
+    columns=SUMMARY_COLUMNS,
+):
+    where, params = where_clause(filters, dialect)
+    sql = (
+        f"SELECT {', '.join(columns)} FROM {TABLE}{where} "
+        "ORDER BY current_players DESC NULLS LAST LIMIT :top_n"
+    )
+    return text(sql), {**params, "top_n": int(top_n)}
+
+
+# a single game by its primary key for the details view
+def game_details_query(appid: int, columns=DETAIL_COLUMNS):
+    sql = f"SELECT {', '.join(columns)} FROM {TABLE} WHERE appid = :appid"
+    return text(sql), {"appid": int(appid)}
+
+
+# a game's precomputed neighbours, one primary key range read
+def similar_games_query(appid: int, limit: int = SIMILAR_LIMIT,
+                        columns=SUMMARY_COLUMNS):
+    sql = (
+        f"SELECT {', '.join(f'g.{c}' for c in columns)}, s.score "
+        f"FROM {SIMILAR_TABLE} AS s "
+        f"JOIN {TABLE} AS g ON g.appid = s.neighbour_appid "
+        "WHERE s.appid = :appid ORDER BY s.rank LIMIT :limit"
+    )
+    return text(sql), {"appid": int(appid), "limit": int(limit)}
+
+
+# per-game inputs of the revenue projections, read once per version
+def projection_query(columns=PROJECTION_COLUMNS):
+    return text(f"SELECT {', '.join(columns)} FROM {TABLE}"), {}
+
+
+# cover images for just the games in the gallery
+def header_images_query(appids):
+    params = {f"appid_{i}": int(a) for i, a in enumerate(appids)}
+    marks = ", ".join(f":{name}" for name in params) or "NULL"
+    sql = f"SELECT appid, header_image FROM {TABLE} WHERE appid IN ({marks})"
+    return text(sql), params
+
+
+# the columns the in-memory source loads, never the long text columns
+def frame_query(columns=FRAME_COLUMNS):
+    return text(f"SELECT {', '.join(columns)} FROM {TABLE}"), {}
+
+
+# FTS5 treats punctuation as syntax, so search for the quoted words only
+def fts_query(query: str) -> str:
+    return " ".join(f'"{word}"' for word in re.findall(r"\w+", query))
+
+
+# one page of games matching free text, best match first
+#  every row also carries the total number of matches
+def search_query(
+    query: str,
+    page: int = 1,
+    page_size: int = SEARCH_PAGE_SIZE,
+    dialect: str = "postgresql",
+    columns=SUMMARY_COLUMNS,
+):
+    sql = SEARCH_SQL.get(dialect, SEARCH_SQL["postgresql"]).format(
+        table=TABLE, columns=", ".join(f"g.{c}" for c in columns)
+    )
+    if dialect == "sqlite":
+        query = fts_query(query)
+    params = {
+        "query": query,
+        "limit": int(page_size),
+        "offset": (int(page) - 1) * int(page_size),
+    }
+    return text(sql), params
+
+
+def tag_options_query(column: str, dialect: str = "postgresql"):
+    queries = TAG_OPTIONS_SQL.get(dialect, TAG_OPTIONS_SQL["postgresql"])
+    return text(queries[column]), {}
+
+
+def distinct_values_query(column: str):
+    sql = (
+        f"SELECT DISTINCT {column} AS value FROM {TABLE} "
+        f"WHERE {column} IS NOT NULL ORDER BY value"
+    )
+    return text(sql), {}
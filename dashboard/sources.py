@@ -0,0 +1,203 @@
+import pandas as pd
+
+from dashboard.queries import (
+    SUMMARY_COLUMNS,
+    distinct_values_query,
+    fts_query,
+    game_details_query,
+    header_images_query,
+    projection_query,
+    release_counts_query,
+    search_query,
+    similar_games_query,
+    tag_options_query,
+    top_games_query,
+)
+from dashboard.cube import Cube
+from dashboard.projections import PROJECTION_COLUMNS
+from etl.load.history import player_trend
+
+
+class SqlSource:
+    """
+    Answers every dashboard view with its own parameterized query, so
+    only the rows and columns on screen ever leave the database.
+    """
+
+    name = "sql"
+
+    def __init__(self, engine, versions: tuple = ()):
+        self.engine = engine
+        self.dialect = engine.dialect.name
+        self.versions = versions
+
+    # what cached results are keyed on, new versions mean new entries
+    @property
+    def cache_key(self):
+        return self.name, self.versions
+
+    def _read(self, query) -> pd.DataFrame:
+        sql, params = query
+        with self.engine.connect() as conn:
+            return pd.read_sql(sql, conn, params=params)
+
+    def filter_options(self) -> dict:
+        return {
+            "genres": self._read(
+                tag_options_query("genres", self.dialect)
+            )["tag"].tolist(),
+            "categories": self._read(
+                tag_options_query("categories", self.dialect)
+            )["tag"].tolist(),
+            "years": self._read(
+                distinct_values_query("release_year")
+            )["value"].astype(int).tolist(),
+            "tiers": self._read(
+                distinct_values_query("price_tier")
+            )["value"].tolist(),
+        }
+
+    def release_counts(self, filters) -> pd.Series:
+        df = self._read(release_counts_query(filters, self.dialect))
+        return df.dropna().set_index("release_year")["games"]
+
+    def top_games(self, filters, top_n: int) -> pd.DataFrame:
+        return self._read(top_games_query(filters, top_n, self.dialect))
+
+    def game_details(self, appid: int):
+        df = self._read(game_details_query(appid))
+        return None if df.empty else df.iloc[0]
+
+    def search(self, query: str, page: int, page_size: int):
+        if not fts_query(query):
+            return empty_page()
+        return search_page(
+            self._read(search_query(query, page, page_size, self.dialect))
+        )
+
+    def similar_games(self, appid: int, limit: int) -> pd.DataFrame:
+        return self._read(similar_games_query(appid, limit))
+
+    def projection_inputs(self) -> pd.DataFrame:
+        return self._read(projection_query())
+
+    def player_trend(self, appid: int, grain: str) -> pd.DataFrame:
+        return player_trend(self.engine, appid, grain)
+
+
+class FrameSource:
+    """
+    Answers the same views from a DataFrame held in memory, for when
+    the whole catalogue is loaded up front. The frame only needs the
+    summary and filter columns, cover images and details are read by
+    appid through `engine` when the frame does not carry them.
+
+    The frame is shared by every session and never modified. A Cube is
+    built over it once per data version, and the charts and gallery
+    are answered from its cells, only the top-N rows are ever taken
+    out of the frame.
+    """
+
+    name = "memory"
+
+    def __init__(self, df: pd.DataFrame, engine=None, versions: tuple = ()):
+        self.df = df
+        self.engine = engine
+        self.versions = versions
+        self.cube = Cube(df)
+
+    @property
+    def cache_key(self):
+        return self.name, self.versions
+
+    def _read(self, query) -> pd.DataFrame:
+        sql, params = query
+        with self.engine.connect() as conn:
+            return pd.read_sql(sql, conn, params=params)
+
+    def filter_options(self) -> dict:
+        return {
+            "genres": self.cube.tag_index["genres"].tags,
+            "categories": self.cube.tag_index["categories"].tags,
+            "years": sorted(
+                self.df["release_year"].dropna().astype(int).unique()
+            ),
+            "tiers": sorted(self.df["price_tier"].dropna().unique()),
+        }
+
+    def release_counts(self, filters) -> pd.Series:
+        return self.cube.release_counts(filters)
+
+    def top_games(self, filters, top_n: int) -> pd.DataFrame:
+        top_rows = self.cube.top_rows_for(filters, top_n)
+        top = self.df.iloc[top_rows].reset_index(drop=True)
+        if "header_image" not in top.columns:
+            top["header_image"] = top["appid"].map(
+                self.header_images(top["appid"])
+            )
+        return top[list(SUMMARY_COLUMNS)]
+
+    # appid -> cover image, for the handful of games in the gallery
+    def header_images(self, appids) -> pd.Series:
+        df = self._read(header_images_query(list(appids)))
+        return df.set_index("appid")["header_image"]
+
+    # one row by primary key, the frame never holds the descriptions
+    def game_details(self, appid: int):
+        if self.engine is not None:
+            df = self._read(game_details_query(appid))
+            return None if df.empty else df.iloc[0]
+        rows = self.df[self.df["appid"] == appid]
+        return None if rows.empty else rows.iloc[0]
+
+    # ranked by the database index, the frame holds no descriptions;
+    #  without a database (the snapshot) only the short columns are matched
+    def search(self, query: str, page: int, page_size: int):
+        if self.engine is not None:
+            if not fts_query(query):
+                return empty_page()
+            dialect = self.engine.dialect.name
+            return search_page(
+                self._read(search_query(query, page, page_size, dialect))
+            )
+        df = self.df
+        hits = pd.Series(False, index=df.index)
+        for column in ("name", "developers", "genres"):
+            if column in df.columns:
+                hits |= df[column].str.contains(
+                    query, case=False, regex=False
+                ).fillna(False).astype(bool)
+        matches = df.loc[hits].sort_values(
+            "current_players", ascending=False, kind="stable"
+        )
+        start = (page - 1) * page_size
+        found = matches.iloc[start:start + page_size].reset_index(drop=True)
+        return found[list(SUMMARY_COLUMNS)], len(matches)
+
+    # the snapshot carries the inputs, the summary frame does not
+    def projection_inputs(self) -> pd.DataFrame:
+        if set(PROJECTION_COLUMNS) <= set(self.df.columns):
+            return self.df[list(PROJECTION_COLUMNS)]
+        return self._read(projection_query())
+
+    # the neighbours table lives in the database only
+    def similar_games(self, appid: int, limit: int) -> pd.DataFrame:
+        if self.engine is None:
+            return pd.DataFrame(columns=[*SUMMARY_COLUMNS, "score"])
+        return self._read(similar_games_query(appid, limit))
+
+    def player_trend(self, appid: int, grain: str) -> pd.DataFrame:
+        if self.engine is None:
+            return pd.DataFrame(columns=["max_players", "avg_players"])
+        return player_trend(self.engine, appid, grain)
+
+
+# the page of matches and the total number of matches from search_query
+def search_page(df: pd.DataFrame):
+    total = 0 if df.empty else int(df["total"].iloc[0])
+    return df[list(SUMMARY_COLUMNS)], total
+
+
+# no words to match, e.g. punctuation only, which FTS5 rejects
+def empty_page():
+    return pd.DataFrame(columns=list(SUMMARY_COLUMNS)), 0
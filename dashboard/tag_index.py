@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+
+
+class TagIndex:
+    """
+    Multi-hot index over a comma-joined tag column.
+
+    Built once per loaded dataset: `tags` is the sorted vocabulary and
+    `matrix` holds one boolean column per tag, so "any of" and "all of"
+    filters are a single vectorized reduction over the selected columns
+    instead of a Python loop over every row.
+    """
+
+    def __init__(self, cells: pd.Series):
+        dummies = cells.fillna("").str.get_dummies(sep=",")
+        dummies = dummies.drop(columns=[""], errors="ignore")
+        self.tags = sorted(dummies.columns)
+        self.positions = {tag: i for i, tag in enumerate(self.tags)}
+        self.matrix = dummies[self.tags].to_numpy(dtype=bool)
+
+    def __len__(self):
+        return len(self.matrix)
+
+    def match(self, tags, how: str = "any") -> np.ndarray:
+        """Boolean row mask for rows having any (or all) of `tags`."""
+        cols = [self.positions[t] for t in tags if t in self.positions]
+        if how == "all":
+            # a tag nobody has can never be matched by every row
+            if len(cols) < len(set(tags)):
+                return np.zeros(len(self), dtype=bool)
+            return self.matrix[:, cols].all(axis=1)
+        return self.matrix[:, cols].any(axis=1)
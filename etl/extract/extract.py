@@ -2,6 +2,8 @@ import os
 import time
 from kaggle.api.kaggle_api_extended import KaggleApi
 
+from utils import metrics
+
 # Set up paths
 output_dir = os.path.abspath(
     os.path.join(os.path.dirname(__file__), "..", "..", "data")
@@ -32,6 +34,7 @@ def extract_steam_data():
         #  checks if the file is downloaded
         if not os.path.exists(csv_path):
             raise FileNotFoundError(f"CSV file not found at {csv_path}")
+        metrics.record(bytes_written=metrics.file_size(csv_path))
     except Exception as e:
         print(f"Error during data extraction: {e}")
 
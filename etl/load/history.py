@@ -0,0 +1,135 @@
+from pathlib import Path
+import pandas as pd
+from sqlalchemy import text
+
+from etl.load.load import DB_SCHEMA, PROJECT_ROOT, get_engine
+from etl.load.version import bump_version
+
+HISTORY_TABLE = "player_count_history"
+ROLLUP_TABLE = "player_count_rollup"
+SAMPLES_PATH = PROJECT_ROOT / "data" / "steam_players_samples.csv"
+# rollup grains kept for the dashboard, raw samples are never charted
+GRAINS = ("hour", "day")
+
+ROLLUP_SQL = """
+INSERT INTO {schema}.{rollup} AS r (
+    appid, grain, bucket_start,
+    sample_count, sum_players, max_players, avg_players
+)
+SELECT
+    appid,
+    '{grain}',
+    date_trunc('{grain}', observed_at, 'UTC'),
+    count(*),
+    sum(player_count),
+    max(player_count),
+    round(avg(player_count), 1)
+FROM player_count_staging
+GROUP BY appid, date_trunc('{grain}', observed_at, 'UTC')
+ON CONFLICT (appid, grain, bucket_start) DO UPDATE SET
+    sample_count = r.sample_count + excluded.sample_count,
+    sum_players = r.sum_players + excluded.sum_players,
+    max_players = greatest(r.max_players, excluded.max_players),
+    avg_players = round(
+        (r.sum_players + excluded.sum_players)::numeric
+        / (r.sample_count + excluded.sample_count), 1
+    )
+"""
+
+
+# one partition per calendar month (UTC) of observed_at
+def partition_ddl(month: pd.Timestamp) -> str:
+    start = month.strftime("%Y-%m-01")
+    end = (month + pd.offsets.MonthBegin(1)).strftime("%Y-%m-01")
+    name = f"{HISTORY_TABLE}_y{month:%Y}m{month:%m}"
+    return (
+        f"CREATE TABLE IF NOT EXISTS {DB_SCHEMA}.{name} "
+        f"PARTITION OF {DB_SCHEMA}.{HISTORY_TABLE} "
+        f"FOR VALUES FROM ('{start}') TO ('{end}')"
+    )
+
+
+# the months covered by a batch of samples, as month-start timestamps
+def sample_months(samples: pd.DataFrame) -> list:
+    observed = pd.to_datetime(samples["observed_at"], utc=True)
+    months = observed.dt.tz_localize(None).dt.to_period("M").unique()
+    return sorted(p.to_timestamp() for p in months)
+
+
+def append_player_history(samples_csv: Path = SAMPLES_PATH) -> int:
+    """
+    1) Create the history and rollup tables if they are missing.
+    2) Create a partition for every month in the new samples.
+    3) COPY the samples into a staging table, append them to the history
+       and fold them into the hourly/daily rollups in one transaction.
+    The samples file is removed once it has been appended, and the
+    rollup table's data version is bumped with it.
+    """
+    samples_csv = Path(samples_csv)
+    history_sql = (PROJECT_ROOT / "sql" / "create_history.sql").read_text()
+    version_sql = (PROJECT_ROOT / "sql" / "create_version.sql").read_text()
+
+    engine = get_engine()
+    with engine.begin() as conn:
+        conn.execute(text(history_sql + version_sql))
+
+    if not samples_csv.exists():
+        print("No new player count samples to append")
+        return 0
+    samples = pd.read_csv(samples_csv)
+    if samples.empty:
+        samples_csv.unlink()
+        return 0
+
+    with engine.begin() as conn:
+        for month in sample_months(samples):
+            conn.execute(text(partition_ddl(month)))
+
+    raw_conn = engine.raw_connection()
+    try:
+        cur = raw_conn.cursor()
+        cur.execute(
+            "CREATE TEMP TABLE player_count_staging "
+            f"(LIKE {DB_SCHEMA}.{HISTORY_TABLE}) ON COMMIT DROP"
+        )
+        with open(samples_csv, "r", encoding="utf-8") as f:
+            cur.copy_expert(
+                "COPY player_count_staging (appid, observed_at, player_count)"
+                " FROM STDIN WITH CSV HEADER", f
+            )
+        cur.execute(
+            f"INSERT INTO {DB_SCHEMA}.{HISTORY_TABLE} "
+            "SELECT appid, observed_at, player_count "
+            "FROM player_count_staging"
+        )
+        for grain in GRAINS:
+            cur.execute(ROLLUP_SQL.format(
+                schema=DB_SCHEMA, rollup=ROLLUP_TABLE, grain=grain
+            ))
+        bump_version(cur, ROLLUP_TABLE, schema=DB_SCHEMA)
+        raw_conn.commit()
+    finally:
+        raw_conn.close()
+
+    samples_csv.unlink()
+    print(f"✅ Appended {len(samples)} player count samples")
+    return len(samples)
+
+
+# reads the per-game trend from the rollup table, never the raw samples
+#  unqualified so it works for any load target (the engine sets the schema)
+def player_trend(engine, appid: int, grain: str = "day") -> pd.DataFrame:
+    if grain not in GRAINS:
+        raise ValueError(f"grain must be one of {GRAINS}")
+    sql = text(
+        f"SELECT bucket_start, max_players, avg_players "
+        f"FROM {ROLLUP_TABLE} "
+        "WHERE appid = :appid AND grain = :grain "
+        "ORDER BY bucket_start"
+    )
+    with engine.connect() as conn:
+        df = pd.read_sql(
+            sql, conn, params={"appid": int(appid), "grain": grain}
+        )
+    df["bucket_start"] = pd.to_datetime(df["bucket_start"], utc=True)
+    return df.set_index("bucket_start")
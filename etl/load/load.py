@@ -1,40 +1,63 @@
+import io
 import os
+import time
 from pathlib import Path
 from dotenv import load_dotenv
-from sqlalchemy import create_engine, event, text
+from sqlalchemy import text
+
+from etl.load.version import bump_version
+from utils import db, metrics, profiling
 
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 load_dotenv(PROJECT_ROOT / ".env.dev", override=True)
 
 
-# DB connection settings
+# DB connection settings come from utils.db, only the target lives here
 TABLE = "kr_so_capstone"
-DB_USER = os.getenv("DB_USER")
-DB_PWD = os.getenv("DB_PASSWORD", "")
-DB_HOST = os.getenv("DB_HOST")
-DB_PORT = os.getenv("DB_PORT", "5432")
-DB_NAME = os.getenv("DB_NAME")
+# where the streaming load collects its batches before the swap
+STAGING_TABLE = f"{TABLE}_staging"
 DB_SCHEMA = os.getenv("DB_SCHEMA", "c12de")
 
 
+# the shared pooled engine, tagged as the ETL and without a statement
+#  timeout because the COPY of the full catalogue runs for a while
 def get_engine():
-    if not all([DB_USER, DB_HOST, DB_NAME]):
-        raise RuntimeError(
-            "Missing DB_USER, DB_HOST, or DB_NAME in environment"
-        )
-    url = (
-        f"postgresql+psycopg2://{DB_USER}:{DB_PWD}@{DB_HOST}:"
-        f"{DB_PORT}/{DB_NAME}"
+    return db.get_engine(
+        application_name="ks-capstone-etl", statement_timeout_ms=0
+    )
+
+
+# rows and bytes a bulk load moved, and how fast, for the run metrics
+def record_copy(rows: int, csv_path: Path, seconds: float):
+    metrics.record(
+        rows_out=rows,
+        bytes_read=metrics.file_size(csv_path),
+        copy_seconds=round(seconds, 3),
+        copy_rows_per_second=round(rows / max(seconds, 1e-9)),
     )
-    engine = create_engine(url, echo=True)
 
-    @event.listens_for(engine, "connect")
-    def set_search_path(dbapi_conn, _):
-        cur = dbapi_conn.cursor()
-        cur.execute(f"SET search_path TO {DB_SCHEMA}")
-        cur.close()
 
-    return engine
+# COPY into the table's columns named by a CSV header line
+def copy_sql(header: str, table: str = TABLE) -> str:
+    return f"COPY {DB_SCHEMA}.{table} ({header}) FROM STDIN WITH CSV"
+
+
+# an empty unlogged copy of the table's columns for the streamed batches
+#  the table itself is only (re)created here when it is missing or lacks
+#  one of the batch columns, which is the only time readers see it empty
+def create_staging(cur, columns, table_sql: str):
+    cur.execute(
+        "SELECT column_name FROM information_schema.columns "
+        "WHERE table_schema = %s AND table_name = %s",
+        (DB_SCHEMA, TABLE),
+    )
+    if not set(columns) <= {row[0] for row in cur.fetchall()}:
+        cur.execute(table_sql)
+    cur.execute(f"DROP TABLE IF EXISTS {DB_SCHEMA}.{STAGING_TABLE}")
+    cur.execute(
+        f"CREATE UNLOGGED TABLE {DB_SCHEMA}.{STAGING_TABLE} "
+        f"(LIKE {DB_SCHEMA}.{TABLE})"
+    )
 
 
 def load_data_to_postgres(csv_path: Path):
@@ -42,30 +65,90 @@ def load_data_to_postgres(csv_path: Path):
     1) Exec create_tb.sql (drops & creates the table).
     2) Truncate the table.
     3) Bulk-load the CSV via COPY.
+    4) Bump the table's data version in the same transaction.
     """
     sql_file = PROJECT_ROOT / "sql" / "create_tb.sql"
     table_sql = sql_file.read_text()
+    version_sql = (PROJECT_ROOT / "sql" / "create_version.sql").read_text()
 
     engine = get_engine()
     with engine.begin() as conn:
         # (re)create the table
         conn.execute(text(table_sql))
+        conn.execute(text(version_sql))
         # clear out old rows
         conn.execute(text(f"TRUNCATE TABLE {DB_SCHEMA}.{TABLE}"))
 
     # COPY CSV
+    # genre_tags / category_tags are generated columns, COPY skips them and
+    #  postgres builds the TEXT[] values (and their GIN entries) on insert
+    # the CSV header names the columns, so their order does not matter
     raw_conn = engine.raw_connection()
     try:
         cur = raw_conn.cursor()
-        with open(csv_path, "r", encoding="utf-8") as f:
-            cur.copy_expert(
-                f"COPY {DB_SCHEMA}.{TABLE} FROM STDIN WITH CSV HEADER", f
+        start = time.perf_counter()
+        with open(csv_path, "r", encoding="utf-8") as f, \
+                profiling.step("copy"):
+            header = f.readline().strip()
+            cur.copy_expert(copy_sql(header), f)
+        record_copy(cur.rowcount, csv_path, time.perf_counter() - start)
+        version = bump_version(cur, TABLE, schema=DB_SCHEMA)
+        raw_conn.commit()
+    finally:
+        raw_conn.close()
+
+    print(
+        f"✅ Loaded '{csv_path.name}' into {DB_SCHEMA}.{TABLE} "
+        f"(version {version})"
+    )
+
+
+def load_batches_to_postgres(batches) -> int:
+    """
+    The streaming variant of load_data_to_postgres. Each batch is CSV
+    text with a header row, COPYed into an unlogged staging table as soon
+    as it arrives, while the dashboard keeps reading the old rows. Once
+    the last batch is in, one short transaction recreates the table,
+    moves the rows over with INSERT ... SELECT and bumps the version.
+    Returns the rows loaded.
+    """
+    table_sql = (PROJECT_ROOT / "sql" / "create_tb.sql").read_text()
+    version_sql = (PROJECT_ROOT / "sql" / "create_version.sql").read_text()
+
+    raw_conn = get_engine().raw_connection()
+    try:
+        cur = raw_conn.cursor()
+        header, rows = None, 0
+        with profiling.step("copy"):
+            for batch in batches:
+                batch_header, body = batch.split("\n", 1)
+                if header is None:
+                    header = batch_header
+                    create_staging(cur, header.split(","), table_sql)
+                    raw_conn.commit()
+                cur.copy_expert(
+                    copy_sql(batch_header, STAGING_TABLE), io.StringIO(body)
+                )
+                rows += cur.rowcount
+        # the live table is only locked from here to the commit
+        cur.execute(table_sql)
+        cur.execute(version_sql)
+        if header is not None:
+            cur.execute(
+                f"INSERT INTO {DB_SCHEMA}.{TABLE} ({header}) "
+                f"SELECT {header} FROM {DB_SCHEMA}.{STAGING_TABLE}"
             )
+            cur.execute(f"DROP TABLE {DB_SCHEMA}.{STAGING_TABLE}")
+        version = bump_version(cur, TABLE, schema=DB_SCHEMA)
         raw_conn.commit()
     finally:
         raw_conn.close()
 
-    print(f"✅ Loaded '{csv_path.name}' into {DB_SCHEMA}.{TABLE}")
+    print(
+        f"✅ Streamed {rows} rows into {DB_SCHEMA}.{TABLE} "
+        f"(version {version})"
+    )
+    return rows
 
 
 if __name__ == "__main__":
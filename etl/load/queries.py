@@ -0,0 +1,92 @@
+import pandas as pd
+from sqlalchemy import text
+
+from etl.load.load import DB_SCHEMA, TABLE
+
+# the comma-joined text columns and the TEXT[] columns generated from them
+#  in create_tb.sql, the array columns are the ones with the GIN indexes
+TAG_COLUMNS = {
+    "genres": "genre_tags",
+    "categories": "category_tags",
+}
+# && is "overlaps" (any of), @> is "contains" (all of)
+#  both operators can be answered from a GIN index
+MATCH_OPERATORS = {
+    "any": "&&",
+    "all": "@>",
+}
+# the embedded (SQLite) target has no arrays, it keeps bridge tables
+#  indexed by tag instead, see sql/embedded/create_tb.sql
+BRIDGE_TABLES = {
+    "genres": ("kr_so_capstone_genres", "genre"),
+    "categories": ("kr_so_capstone_categories", "category"),
+}
+
+
+def tag_filter_clause(
+    column, tags, match="any", param=None, dialect="postgresql"
+):
+    """
+    Build a WHERE fragment filtering `column` ("genres" or "categories")
+    on a list of tags. Returns (sql, params) ready for sqlalchemy.text().
+    An empty tag list returns (None, {}) so callers can skip the filter.
+    For dialect "sqlite" the fragment goes through the bridge tables.
+    """
+    if column not in TAG_COLUMNS:
+        raise ValueError(f"Unknown tag column: {column}")
+    if match not in MATCH_OPERATORS:
+        raise ValueError(f"match must be one of {tuple(MATCH_OPERATORS)}")
+    tags = [str(t).strip() for t in tags if str(t).strip()]
+    if not tags:
+        return None, {}
+    param = param or column
+    if dialect == "sqlite":
+        return _bridge_filter_clause(column, tags, match, param)
+    clause = (
+        f"{TAG_COLUMNS[column]} {MATCH_OPERATORS[match]} "
+        f"CAST(:{param} AS TEXT[])"
+    )
+    return clause, {param: tags}
+
+
+# any of: the appid has at least one of the tags in the bridge table
+# all of: the appid has as many distinct matching tags as were asked for
+def _bridge_filter_clause(column, tags, match, param):
+    bridge, tag_col = BRIDGE_TABLES[column]
+    params = {f"{param}_{i}": tag for i, tag in enumerate(tags)}
+    marks = ", ".join(f":{name}" for name in params)
+    clause = (
+        f"appid IN (SELECT appid FROM {bridge} "
+        f"WHERE {tag_col} IN ({marks})"
+    )
+    if match == "all":
+        clause += (
+            f" GROUP BY appid HAVING COUNT(DISTINCT {tag_col}) = "
+            f"{len(set(tags))}"
+        )
+    return clause + ")", params
+
+
+# runs an "any of" / "all of" genre and category query against the table
+#  returns the requested columns only
+def filter_games_by_tags(
+    engine,
+    genres=None,
+    categories=None,
+    match="any",
+    columns=("appid", "name"),
+):
+    dialect = engine.dialect.name
+    clauses, params = [], {}
+    for column, tags in (("genres", genres), ("categories", categories)):
+        clause, clause_params = tag_filter_clause(
+            column, tags or [], match, dialect=dialect
+        )
+        if clause:
+            clauses.append(clause)
+            params.update(clause_params)
+    where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+    table = TABLE if dialect == "sqlite" else f"{DB_SCHEMA}.{TABLE}"
+    sql = f"SELECT {', '.join(columns)} FROM {table}{where}"
+    with engine.connect() as conn:
+        return pd.read_sql(text(sql), conn, params=params)
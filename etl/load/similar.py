@@ -0,0 +1,45 @@
+from pathlib import Path
+from sqlalchemy import text
+
+from etl.load.load import DB_SCHEMA, PROJECT_ROOT, get_engine
+from etl.load.version import bump_version
+
+SIMILAR_TABLE = "kr_so_capstone_similar"
+SIMILAR_PATH = PROJECT_ROOT / "data" / "steam_games_similar.csv"
+
+
+def load_similar_games(csv_path: Path = SIMILAR_PATH) -> int:
+    """
+    1) Exec create_similar.sql (drops & creates the table).
+    2) Bulk-load the (appid, neighbour_appid, score, rank) CSV via COPY.
+    3) Bump the table's data version in the same transaction.
+    """
+    csv_path = Path(csv_path)
+    similar_sql = (PROJECT_ROOT / "sql" / "create_similar.sql").read_text()
+    version_sql = (PROJECT_ROOT / "sql" / "create_version.sql").read_text()
+
+    engine = get_engine()
+    with engine.begin() as conn:
+        conn.execute(text(similar_sql + version_sql))
+
+    if not csv_path.exists():
+        print("No similar games to load")
+        return 0
+
+    raw_conn = engine.raw_connection()
+    try:
+        cur = raw_conn.cursor()
+        with open(csv_path, "r", encoding="utf-8") as f:
+            header = f.readline().strip()
+            cur.copy_expert(
+                f"COPY {DB_SCHEMA}.{SIMILAR_TABLE} ({header}) "
+                "FROM STDIN WITH CSV", f
+            )
+        rows = cur.rowcount
+        bump_version(cur, SIMILAR_TABLE, schema=DB_SCHEMA)
+        raw_conn.commit()
+    finally:
+        raw_conn.close()
+
+    print(f"✅ Loaded {rows} similar-game pairs into {SIMILAR_TABLE}")
+    return rows
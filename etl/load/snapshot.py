@@ -0,0 +1,45 @@
+import os
+from pathlib import Path
+import pandas as pd
+import pyarrow as pa
+
+from etl.load.load import PROJECT_ROOT
+
+# Arrow IPC copy of the enriched dataset, for DASHBOARD_SOURCE=file
+SNAPSHOT_PATH = Path(
+    os.getenv("SNAPSHOT_PATH", PROJECT_ROOT / "data" / "steam_games.arrow")
+)
+
+
+def write_snapshot(csv_path: Path, path: Path = SNAPSHOT_PATH) -> Path:
+    """
+    Write the enriched CSV as an uncompressed Arrow IPC file, so readers
+    can memory-map it instead of parsing it. The file is written next
+    to the old one and swapped in with os.replace, dashboards that have
+    the previous snapshot mapped keep reading it until they reload.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    table = pa.Table.from_pandas(pd.read_csv(csv_path), preserve_index=False)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with pa.OSFile(str(tmp_path), "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, path)
+    print(f"✅ Wrote {table.num_rows} rows to snapshot '{path.name}'")
+    return path
+
+
+def read_snapshot(path: Path = SNAPSHOT_PATH) -> pa.Table:
+    """The snapshot as an Arrow table backed by a read-only memory map."""
+    source = pa.memory_map(str(path), "r")
+    return pa.ipc.open_file(source).read_all()
+
+
+# changes whenever a new snapshot is swapped in, without opening it
+def snapshot_version(path: Path = SNAPSHOT_PATH) -> str | None:
+    try:
+        stat = Path(path).stat()
+    except FileNotFoundError:
+        return None
+    return f"{stat.st_mtime_ns}-{stat.st_size}"
@@ -0,0 +1,378 @@
+import io
+import os
+import time
+from pathlib import Path
+import pandas as pd
+
+from etl.load import history, load, similar
+from etl.load.queries import BRIDGE_TABLES
+from etl.load.version import bump_version
+from etl.transform.sample import check_not_sampled
+from utils import db, profiling
+
+# which backend run_etl and the dashboard use, postgres unless overridden
+LOAD_TARGET = os.getenv("LOAD_TARGET", "postgres")
+EMBEDDED_DB_PATH = Path(
+    os.getenv("EMBEDDED_DB_PATH", load.PROJECT_ROOT / "data" / "steam.db")
+)
+EMBEDDED_SQL_DIR = load.PROJECT_ROOT / "sql" / "embedded"
+# rows per executemany call
+BATCH_SIZE = 5000
+# the load's temp tables, named after the tables they are swapped into
+STAGING_SUFFIX = "_staging"
+# hour/day buckets as ISO strings, SQLite has no date_trunc
+BUCKET_FORMATS = {
+    "hour": "%Y-%m-%dT%H:00:00Z",
+    "day": "%Y-%m-%dT00:00:00Z",
+}
+
+EMBEDDED_ROLLUP_SQL = """
+INSERT INTO player_count_rollup (
+    appid, grain, bucket_start,
+    sample_count, sum_players, max_players, avg_players
+)
+SELECT
+    appid,
+    '{grain}',
+    strftime('{fmt}', observed_at),
+    count(*),
+    sum(player_count),
+    max(player_count),
+    round(avg(player_count), 1)
+FROM player_count_staging
+WHERE true
+GROUP BY appid, strftime('{fmt}', observed_at)
+ON CONFLICT (appid, grain, bucket_start) DO UPDATE SET
+    sample_count = player_count_rollup.sample_count + excluded.sample_count,
+    sum_players = player_count_rollup.sum_players + excluded.sum_players,
+    max_players = max(player_count_rollup.max_players, excluded.max_players),
+    avg_players = round(
+        (player_count_rollup.sum_players + excluded.sum_players) * 1.0
+        / (player_count_rollup.sample_count + excluded.sample_count), 1
+    )
+"""
+
+
+class LoadTarget:
+    """
+    A database the enriched dataset can be loaded into.
+
+    Subclasses implement load() for the enriched CSV, load_similar()
+    for the similar-games table and append_history() for the player
+    count samples, and hand out the engine the dashboard reads from.
+    """
+
+    name = None
+    # only sample targets accept the outputs of run_etl --sample
+    sample = False
+
+    def engine(self, **kwargs):
+        raise NotImplementedError
+
+    def check_source(self, csv_path: Path):
+        if not self.sample:
+            check_not_sampled(csv_path)
+
+    def load(self, csv_path: Path):
+        raise NotImplementedError
+
+    # CSV text batches (each with a header) loaded as they arrive,
+    #  replacing the table like load() does, returns the rows loaded
+    def load_stream(self, batches) -> int:
+        raise NotImplementedError
+
+    def load_similar(self, csv_path: Path) -> int:
+        raise NotImplementedError
+
+    def append_history(self, samples_csv: Path) -> int:
+        raise NotImplementedError
+
+
+class PostgresTarget(LoadTarget):
+    """The production target, COPY into Postgres (see etl.load.load)."""
+
+    name = "postgres"
+
+    def engine(self, **kwargs):
+        return db.get_engine(**kwargs)
+
+    def load(self, csv_path: Path):
+        self.check_source(csv_path)
+        load.load_data_to_postgres(csv_path)
+
+    def load_stream(self, batches) -> int:
+        return load.load_batches_to_postgres(batches)
+
+    def load_similar(self, csv_path: Path) -> int:
+        self.check_source(csv_path)
+        return similar.load_similar_games(csv_path)
+
+    def append_history(self, samples_csv: Path) -> int:
+        return history.append_player_history(samples_csv)
+
+
+class SQLiteTarget(LoadTarget):
+    """
+    Embedded single-file target for edge boxes, offline use and CI.
+    Same table, indexes and rollup tables as Postgres, with bridge
+    tables standing in for the TEXT[] tag columns. Runs in WAL mode so
+    the dashboard can keep reading while a load is in progress. A
+    `sample` target holds the outputs of run_etl --sample.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: Path | None = None, sample: bool = False):
+        self.path = Path(path or EMBEDDED_DB_PATH)
+        self.sample = sample
+
+    def engine(self, **kwargs):
+        return db.get_engine(url=f"sqlite:///{self.path}")
+
+    def _connect(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        raw_conn = self.engine().raw_connection()
+        raw_conn.execute("PRAGMA journal_mode=WAL")
+        raw_conn.execute("PRAGMA synchronous=NORMAL")
+        return raw_conn
+
+    def load(self, csv_path: Path):
+        """
+        1) Make sure the history tables exist for the dashboard.
+        2) Insert the CSV in batches into temp staging tables, table and
+           bridge tables together.
+        3) In one short transaction exec sql/embedded/create_tb.sql
+           (drops & creates the tables), copy the staged rows over,
+           rebuild the FTS5 search index and bump the data version.
+        """
+        csv_path = Path(csv_path)
+        self.check_source(csv_path)
+        rows, seconds, version = self._replace(
+            pd.read_csv(csv_path, chunksize=BATCH_SIZE)
+        )
+        load.record_copy(rows, csv_path, seconds)
+        print(
+            f"✅ Loaded {rows} rows from '{csv_path.name}' into {self.path} "
+            f"(version {version})"
+        )
+
+    def load_stream(self, batches) -> int:
+        rows, _, version = self._replace(
+            pd.read_csv(io.StringIO(batch)) for batch in batches
+        )
+        print(f"✅ Streamed {rows} rows into {self.path} (version {version})")
+        return rows
+
+    # load() and load_stream() insert into temp staging tables, so readers
+    #  keep the old rows until one short transaction swaps the new ones in
+    #  returns the rows inserted, the seconds the inserts took and the
+    #  new data version
+    def _replace(self, chunks):
+        table_sql = (EMBEDDED_SQL_DIR / "create_tb.sql").read_text()
+        history_sql = (EMBEDDED_SQL_DIR / "create_history.sql").read_text()
+        version_sql = (EMBEDDED_SQL_DIR / "create_version.sql").read_text()
+
+        raw_conn = self._connect()
+        try:
+            raw_conn.executescript(history_sql + version_sql)
+            cur = raw_conn.cursor()
+            columns = []
+            start = time.perf_counter()
+            with profiling.step("insert"):
+                rows = self._insert_rows(
+                    cur, self._staged(raw_conn, chunks, columns, table_sql),
+                    STAGING_SUFFIX,
+                )
+            seconds = time.perf_counter() - start
+            raw_conn.commit()
+            raw_conn.executescript(
+                "BEGIN IMMEDIATE;\n" + table_sql + self._swap_sql(columns)
+            )
+            # index the full-text search table in one pass
+            cur.execute(
+                "INSERT INTO kr_so_capstone_search (kr_so_capstone_search) "
+                "VALUES ('rebuild')"
+            )
+            version = bump_version(cur, load.TABLE, dialect="sqlite")
+            raw_conn.commit()
+        finally:
+            # executescript commits first, so a failed swap is undone here
+            raw_conn.rollback()
+            raw_conn.executescript(self._drop_staging_sql())
+            raw_conn.close()
+        return rows, seconds, version
+
+    # creates the staging tables from the first chunk's columns, which are
+    #  appended to `columns`, the table itself is only (re)created when it
+    #  is missing or lacks one of them
+    def _staged(self, raw_conn, chunks, columns, table_sql):
+        for chunk in chunks:
+            if not columns:
+                columns.extend(chunk.columns)
+                live = {
+                    row[1] for row in raw_conn.execute(
+                        f"PRAGMA main.table_info({load.TABLE})"
+                    )
+                }
+                if not set(columns) <= live:
+                    raw_conn.executescript(table_sql)
+                raw_conn.executescript(
+                    self._drop_staging_sql()
+                    + f"CREATE TEMP TABLE {load.TABLE}{STAGING_SUFFIX} AS "
+                    f"SELECT {', '.join(columns)} FROM main.{load.TABLE} "
+                    "WHERE false;\n"
+                    + "".join(
+                        f"CREATE TEMP TABLE {bridge}{STAGING_SUFFIX} AS "
+                        f"SELECT {tag_col}, appid FROM main.{bridge} "
+                        "WHERE false;\n"
+                        for bridge, tag_col in BRIDGE_TABLES.values()
+                    )
+                )
+            yield chunk
+
+    # copies the staged rows into the freshly created tables
+    @staticmethod
+    def _swap_sql(columns) -> str:
+        if not columns:
+            return ""
+        column_list = ", ".join(columns)
+        return (
+            f"INSERT INTO main.{load.TABLE} ({column_list}) "
+            f"SELECT {column_list} FROM temp.{load.TABLE}{STAGING_SUFFIX};\n"
+            + "".join(
+                f"INSERT OR IGNORE INTO main.{bridge} ({tag_col}, appid) "
+                f"SELECT {tag_col}, appid FROM temp.{bridge}{STAGING_SUFFIX};\n"
+                for bridge, tag_col in BRIDGE_TABLES.values()
+            )
+        )
+
+    # temp tables outlive the load on a pooled connection, drop them
+    @staticmethod
+    def _drop_staging_sql() -> str:
+        return "".join(
+            f"DROP TABLE IF EXISTS temp.{table}{STAGING_SUFFIX};\n"
+            for table in (load.TABLE,
+                          *(bridge for bridge, _ in BRIDGE_TABLES.values()))
+        )
+
+    # the SQLite stand-in for COPY, returns the number of rows inserted
+    @staticmethod
+    def _insert_rows(cur, chunks, suffix: str = "") -> int:
+        rows = 0
+        for chunk in chunks:
+            chunk = chunk.astype(object).where(chunk.notna(), None)
+            columns = ", ".join(chunk.columns)
+            marks = ", ".join("?" for _ in chunk.columns)
+            cur.executemany(
+                f"INSERT INTO {load.TABLE}{suffix} ({columns}) "
+                f"VALUES ({marks})",
+                chunk.itertuples(index=False, name=None),
+            )
+            for column, (bridge, tag_col) in BRIDGE_TABLES.items():
+                cur.executemany(
+                    f"INSERT OR IGNORE INTO {bridge}{suffix} "
+                    f"({tag_col}, appid) VALUES (?, ?)",
+                    split_tags(chunk, column),
+                )
+            rows += len(chunk)
+        return rows
+
+    def load_similar(self, csv_path: Path) -> int:
+        csv_path = Path(csv_path)
+        self.check_source(csv_path)
+        similar_sql = (EMBEDDED_SQL_DIR / "create_similar.sql").read_text()
+        version_sql = (EMBEDDED_SQL_DIR / "create_version.sql").read_text()
+
+        raw_conn = self._connect()
+        try:
+            raw_conn.executescript(similar_sql + version_sql)
+            if not csv_path.exists():
+                print("No similar games to load")
+                return 0
+            cur = raw_conn.cursor()
+            rows = 0
+            for chunk in pd.read_csv(csv_path, chunksize=BATCH_SIZE):
+                columns = ", ".join(chunk.columns)
+                marks = ", ".join("?" for _ in chunk.columns)
+                cur.executemany(
+                    f"INSERT INTO {similar.SIMILAR_TABLE} ({columns}) "
+                    f"VALUES ({marks})",
+                    chunk.astype(object).itertuples(index=False, name=None),
+                )
+                rows += len(chunk)
+            bump_version(cur, similar.SIMILAR_TABLE, dialect="sqlite")
+            raw_conn.commit()
+        finally:
+            raw_conn.close()
+
+        print(f"✅ Loaded {rows} similar-game pairs into {self.path}")
+        return rows
+
+    def append_history(self, samples_csv: Path) -> int:
+        samples_csv = Path(samples_csv)
+        history_sql = (EMBEDDED_SQL_DIR / "create_history.sql").read_text()
+        version_sql = (EMBEDDED_SQL_DIR / "create_version.sql").read_text()
+
+        raw_conn = self._connect()
+        try:
+            raw_conn.executescript(history_sql + version_sql)
+            if not samples_csv.exists():
+                print("No new player count samples to append")
+                return 0
+            samples = pd.read_csv(samples_csv)
+            cur = raw_conn.cursor()
+            cur.execute(
+                "CREATE TEMP TABLE player_count_staging "
+                "AS SELECT * FROM player_count_history WHERE false"
+            )
+            cur.executemany(
+                "INSERT INTO player_count_staging "
+                "(appid, observed_at, player_count) VALUES (?, ?, ?)",
+                samples[["appid", "observed_at", "player_count"]]
+                .itertuples(index=False, name=None),
+            )
+            cur.execute(
+                "INSERT INTO player_count_history "
+                "SELECT appid, observed_at, player_count "
+                "FROM player_count_staging"
+            )
+            for grain, fmt in BUCKET_FORMATS.items():
+                cur.execute(EMBEDDED_ROLLUP_SQL.format(grain=grain, fmt=fmt))
+            cur.execute("DROP TABLE player_count_staging")
+            bump_version(cur, history.ROLLUP_TABLE, dialect="sqlite")
+            raw_conn.commit()
+        finally:
+            raw_conn.close()
+
+        samples_csv.unlink()
+        print(f"✅ Appended {len(samples)} player count samples")
+        return len(samples)
+
+
+# (tag, appid) pairs for one comma-joined tag column of a batch
+def split_tags(chunk: pd.DataFrame, column: str):
+    for appid, cell in zip(chunk["appid"], chunk[column]):
+        if not cell:
+            continue
+        for tag in str(cell).split(","):
+            if tag.strip():
+                yield tag.strip(), int(appid)
+
+
+TARGETS = {
+    PostgresTarget.name: PostgresTarget,
+    SQLiteTarget.name: SQLiteTarget,
+}
+
+
+def get_load_target(name: str | None = None) -> LoadTarget:
+    """
+    Returns the load target selected by `name` or the LOAD_TARGET env var
+    ("postgres" or "sqlite"). Raises ValueError for anything else.
+    """
+    name = name or os.getenv("LOAD_TARGET", LOAD_TARGET)
+    if name not in TARGETS:
+        raise ValueError(
+            f"Unknown load target: {name}, expected one of {tuple(TARGETS)}"
+        )
+    return TARGETS[name]()
@@ -0,0 +1,51 @@
+from sqlalchemy import exc, text
+
+VERSION_TABLE = "dataset_version"
+# postgres channel every bump is announced on, as "<table>:<version>"
+VERSION_CHANNEL = "dataset_version"
+
+BUMP_SQL = """
+INSERT INTO {version_table} (table_name, version, loaded_at)
+VALUES ({mark}, 1, CURRENT_TIMESTAMP)
+ON CONFLICT (table_name) DO UPDATE SET
+    version = {version_table}.version + 1,
+    loaded_at = excluded.loaded_at
+RETURNING version
+"""
+
+
+def bump_version(cur, table: str, dialect: str = "postgresql",
+                 schema: str | None = None) -> int:
+    """
+    Publish a new version of `table` on a DB-API cursor, inside the
+    load's own transaction so readers see the new version exactly when
+    they can see the new rows. On postgres the bump is also sent as a
+    NOTIFY on VERSION_CHANNEL, delivered when the load commits.
+    """
+    mark = "%s" if dialect == "postgresql" else "?"
+    version_table = f"{schema}.{VERSION_TABLE}" if schema else VERSION_TABLE
+    cur.execute(
+        BUMP_SQL.format(version_table=version_table, mark=mark), (table,)
+    )
+    version = cur.fetchone()[0]
+    if dialect == "postgresql":
+        cur.execute(
+            "SELECT pg_notify(%s, %s)", (VERSION_CHANNEL, f"{table}:{version}")
+        )
+    return version
+
+
+def data_versions(engine) -> tuple:
+    """
+    The published (table, version) pairs, a single primary key scan.
+    Empty when the database has not been loaded since versions existed.
+    """
+    sql = text(
+        f"SELECT table_name, version FROM {VERSION_TABLE} ORDER BY table_name"
+    )
+    try:
+        with engine.connect() as conn:
+            rows = conn.execute(sql).all()
+    except exc.DBAPIError:
+        return ()
+    return tuple((name, int(version)) for name, version in rows)
@@ -0,0 +1,179 @@
+import contextvars
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+# stages run at once at most, when their inputs allow it
+MAX_WORKERS = int(os.getenv("ETL_MAX_WORKERS", "4"))
+
+
+@dataclass(frozen=True)
+class Stage:
+    """
+    One step of the ETL DAG.
+
+    `inputs` and `outputs` are the files the stage reads and writes.
+    A stage depends on every stage that writes one of its inputs, and
+    on the stages named in `after` for ordering that is not about files.
+    Stages sharing a `resources` entry never run at the same time, e.g.
+    two writers of one SQLite database. `cancel`, when given, is called
+    if another stage fails while this one runs, to make `run` return
+    early instead of finishing work the failed run has no use for.
+    """
+
+    name: str
+    run: Callable[[], object]
+    inputs: tuple = ()
+    outputs: tuple = ()
+    after: tuple = ()
+    resources: tuple = ()
+    cancel: Callable[[], object] | None = None
+
+
+class PipelineError(RuntimeError):
+    """A stage failed or could not start, the message says which."""
+
+
+def dependencies(stages) -> dict:
+    """Stage name -> names of the stages it has to wait for."""
+    producers = {}
+    for stage in stages:
+        for path in stage.outputs:
+            producers[Path(path)] = stage.name
+    return {
+        stage.name: {
+            producers[Path(path)] for path in stage.inputs
+            if Path(path) in producers
+        } | set(stage.after)
+        for stage in stages
+    }
+
+
+def _closure(start: set, edges: dict) -> set:
+    seen, todo = set(), list(start)
+    while todo:
+        name = todo.pop()
+        if name not in seen:
+            seen.add(name)
+            todo.extend(edges.get(name, ()))
+    return seen
+
+
+def select_stages(stages, only=None, start=None, stop=None) -> list:
+    """
+    The stages to run, in declaration order: `only` the named ones, or
+    everything downstream of `start` and/or upstream of `stop`.
+    """
+    names = [stage.name for stage in stages]
+    for name in [*(only or ()), start, stop]:
+        if name is not None and name not in names:
+            raise PipelineError(
+                f"Unknown stage: {name}, expected one of {tuple(names)}"
+            )
+    deps = dependencies(stages)
+    if only:
+        selected = set(only)
+    else:
+        selected = set(names)
+        if start is not None:
+            dependents = {n: set() for n in names}
+            for name, upstream in deps.items():
+                for parent in upstream:
+                    dependents[parent].add(name)
+            selected &= _closure({start}, dependents)
+        if stop is not None:
+            selected &= _closure({stop}, deps)
+    return [stage for stage in stages if stage.name in selected]
+
+
+def check_inputs(stages, selected):
+    """
+    Every input of a selected stage has to be produced by another
+    selected stage or persisted by an earlier run, or nothing starts.
+    """
+    produced = {Path(p) for stage in selected for p in stage.outputs}
+    producers = {
+        Path(p): stage.name for stage in stages for p in stage.outputs
+    }
+    for stage in selected:
+        for path in map(Path, stage.inputs):
+            if path not in produced and not path.exists():
+                hint = producers.get(path)
+                raise PipelineError(
+                    f"Stage {stage.name} needs {path.name}, which does "
+                    "not exist" + (f", run --from {hint}" if hint else "")
+                )
+
+
+def run_pipeline(stages, selected=None, max_workers: int = MAX_WORKERS):
+    """
+    Run the selected stages (all by default), each as soon as the
+    stages it depends on finished, independent ones concurrently.
+    Dependencies outside the selection are taken as already done, their
+    persisted outputs are read instead. After a failure no new stage
+    starts, the running ones are cancelled if they can be, otherwise
+    they finish, and a PipelineError lists what ran.
+    Returns {stage name: seconds}.
+    """
+    selected = list(stages if selected is None else selected)
+    check_inputs(stages, selected)
+    names = {stage.name for stage in selected}
+    waiting = {
+        name: deps & names for name, deps in dependencies(selected).items()
+    }
+    by_name = {stage.name: stage for stage in selected}
+    timings, failed, busy = {}, [], set()
+    running = {}
+
+    def timed(stage):
+        start = time.perf_counter()
+        stage.run()
+        return time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while waiting or running:
+            ready = [name for name, deps in waiting.items() if not deps]
+            if not failed:
+                for name in ready:
+                    stage = by_name[name]
+                    if busy & set(stage.resources):
+                        continue
+                    busy |= set(stage.resources)
+                    del waiting[name]
+                    # each stage starts from the caller's context, so the
+                    #  run metrics see it as a top-level stage
+                    context = contextvars.copy_context()
+                    running[executor.submit(context.run, timed, stage)] = name
+            if not running:
+                if waiting and not failed:
+                    raise PipelineError(
+                        f"Stages {', '.join(waiting)} wait on each other"
+                    )
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                busy -= set(by_name[name].resources)
+                try:
+                    timings[name] = future.result()
+                except Exception as exc:
+                    failed.append((name, exc))
+                    for other in running.values():
+                        if by_name[other].cancel is not None:
+                            by_name[other].cancel()
+                    continue
+                for deps in waiting.values():
+                    deps.discard(name)
+
+    if failed:
+        name, exc = failed[0]
+        raise PipelineError(
+            f"Stage {name} failed: {exc!r}. Completed: "
+            f"{', '.join(timings) or 'nothing'}. Not run: "
+            f"{', '.join(waiting) or 'nothing'}. "
+            f"Rerun with --from {name} once it is fixed."
+        ) from exc
+    return timings
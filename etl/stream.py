@@ -0,0 +1,131 @@
+import contextvars
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+
+from etl.load.load import record_copy
+from utils import metrics
+
+# enriched batches that may wait for the loader before enrich blocks
+STREAM_QUEUE_SIZE = int(os.getenv("ETL_STREAM_QUEUE_SIZE", "4"))
+# how often a blocked producer checks whether the consumer gave up
+POLL_SECONDS = 0.1
+
+# put on the queue after the last batch
+_DONE = object()
+
+
+def stream_batches(batches, consume, maxsize: int = STREAM_QUEUE_SIZE):
+    """
+    Pull `batches` (any iterable, usually a generator) in a producer
+    thread and hand them to `consume` in this thread through a queue of
+    `maxsize` batches. `consume` gets an iterator over the batches and
+    its return value is returned. A full queue blocks the producer, so
+    at most `maxsize` batches wait in memory. If either side fails,
+    the other stops and the error is raised here.
+    """
+    batches_queue = queue.Queue(maxsize=maxsize)
+    stop = threading.Event()
+    errors = []
+    waits = {"producer": 0.0, "consumer": 0.0}
+
+    def put(item):
+        start = time.perf_counter()
+        while not stop.is_set():
+            try:
+                batches_queue.put(item, timeout=POLL_SECONDS)
+                break
+            except queue.Full:
+                continue
+        waits["producer"] += time.perf_counter() - start
+
+    def produce():
+        try:
+            for batch in batches:
+                put(batch)
+                if stop.is_set():
+                    break
+        except BaseException as exc:
+            errors.append(exc)
+        finally:
+            put(_DONE)
+            # runs the generator's cleanup, e.g. cancels pending API calls
+            close = getattr(batches, "close", None)
+            if close is not None:
+                close()
+
+    def drain():
+        while True:
+            start = time.perf_counter()
+            item = batches_queue.get()
+            waits["consumer"] += time.perf_counter() - start
+            if item is _DONE:
+                if errors:
+                    raise errors[0]
+                return
+            yield item
+
+    # the producer records its metrics against the caller's stage
+    producer = threading.Thread(
+        target=contextvars.copy_context().run, args=(produce,),
+        name="stream-producer", daemon=True,
+    )
+    producer.start()
+    try:
+        return consume(drain())
+    finally:
+        stop.set()
+        producer.join()
+        metrics.record(
+            producer_blocked_seconds=round(waits["producer"], 3),
+            consumer_idle_seconds=round(waits["consumer"], 3),
+        )
+
+
+def stream_to_target(
+    batches, target, csv_path: Path, maxsize: int = STREAM_QUEUE_SIZE
+) -> int:
+    """
+    Load enriched DataFrame batches into `target` while they are still
+    being produced. Each batch is turned into CSV text once, for the
+    target's load_stream() and for `csv_path`, which the similar games,
+    the snapshot and the next incremental run read. The CSV replaces
+    the old one only after the load committed. Returns the rows loaded.
+    Every batch is written in the first batch's column order: the rows
+    kept from the previous CSV and the freshly enriched ones need not
+    share it, and the file has a single header.
+    """
+    csv_path = Path(csv_path)
+    target.check_source(csv_path)
+    tmp_path = csv_path.with_name(f"{csv_path.stem}.streaming.csv")
+    columns = []
+
+    def consume(stream):
+        with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+            def written():
+                for batch in stream:
+                    if not columns:
+                        columns.extend(batch.columns)
+                    extra = set(batch.columns) - set(columns)
+                    if extra:
+                        raise ValueError(
+                            f"Batch has columns {sorted(extra)} the first "
+                            "batch lacks, rerun with --full"
+                        )
+                    text = batch.reindex(columns=columns).to_csv(index=False)
+                    # the file keeps the header of the first batch only
+                    f.write(text if f.tell() == 0 else text.split("\n", 1)[1])
+                    yield text
+            return target.load_stream(written())
+
+    start = time.perf_counter()
+    try:
+        rows = stream_batches(batches, consume, maxsize)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    os.replace(tmp_path, csv_path)
+    record_copy(rows, csv_path, time.perf_counter() - start)
+    return rows
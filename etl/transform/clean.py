@@ -1,11 +1,32 @@
 import ast
+import numpy as np
 import pandas as pd
 import time
 from pathlib import Path
 
+from utils import metrics
+from utils.profiling import profiled
+
+# the raw columns the pipeline uses, etl.transform.validate checks them
+COLUMNS_FOR_ANALYSIS = [
+    'appid', 'name', 'release_date', 'price', 'dlc_count',
+    'header_image', 'about_the_game', 'windows', 'mac', 'linux',
+    'metacritic_score', 'recommendations', 'developers', 'categories',
+    'genres', 'positive', 'negative', 'estimated_owners', 'peak_ccu'
+]
+# nearly one value per game, hashing them directly beats factorizing first
+UNIQUE_TEXT_COLUMNS = {'name', 'header_image'}
+# what hash_array gives a null once the values are factorized, their
+#  nulls get it too so the row hashes still match hash_pandas_object
+NULL_HASH = np.iinfo(np.uint64).max
+# change between snapshots without the game changing (peak_ccu), left
+#  out of the row hashes so they do not mark every row as changed
+VOLATILE_COLUMNS = {'current_players', 'peak_ccu'}
+
 
 # loads the downloaded dataset
 #  and converts the release_date column to datetime
+@profiled()
 def load_data(filepath):
     df = pd.read_csv(filepath)
     df = df.copy()
@@ -13,20 +34,54 @@ def load_data(filepath):
     return df
 
 
+# one 64-bit hash per column, combined the way pandas combines them
+#  in hash_pandas_object, over every column but the volatile ones
+#  each column is folded into the row hashes as soon as it is hashed,
+#  only the column hashes named in `keep` stay alive
+#  returns the row hashes and the kept column hashes by name
+def hash_columns(df: pd.DataFrame, keep=()):
+    columns = [col for col in df.columns if col not in VOLATILE_COLUMNS]
+    out = np.full(len(df), 0x345678, dtype=np.uint64)
+    mult = np.uint64(1000003)
+    kept = {}
+    for i, col in enumerate(columns):
+        values = df[col].to_numpy()
+        unique = col in UNIQUE_TEXT_COLUMNS
+        hashes = pd.util.hash_array(values, categorize=not unique)
+        if unique:
+            hashes[pd.isna(values)] = NULL_HASH
+        out ^= hashes
+        out *= mult
+        mult += np.uint64(82520 + 2 * (len(columns) - i))
+        if col in keep:
+            kept[col] = hashes
+    out += np.uint64(97531)
+    return out, kept
+
+
+# stored as a signed BIGINT, which the databases take and uint64 is not
+def to_signed(hashes) -> np.ndarray:
+    hashes = np.asarray(hashes)
+    return hashes.view(np.int64) if hashes.dtype == np.uint64 else hashes
+
+
 # keeps only the necessary columns for analysis
 # renames the peak_ccu column to current_players
-# drops duplicates from the name column and the dataframe
+# drops duplicates from the dataframe and the name column
+#  both on hashes computed once, the long text columns are hashed a
+#  single time instead of once per drop_duplicates
+#  rows that only differ in current_players share a name, so leaving it
+#  out of the hashes drops no row the name dedup would have kept
+# the row_hash column stays for change detection and upserts downstream
 def drop_unnecessary_columns(df):
-    columns_for_analysis = [
-        'appid', 'name', 'release_date', 'price', 'dlc_count',
-        'header_image', 'about_the_game', 'windows', 'mac', 'linux',
-        'metacritic_score', 'recommendations', 'developers', 'categories',
-        'genres', 'positive', 'negative', 'estimated_owners', 'peak_ccu'
-    ]
-    df = df[columns_for_analysis].copy()
+    df = df[COLUMNS_FOR_ANALYSIS].copy()
     df.rename(columns={"peak_ccu": "current_players"}, inplace=True)
-    df.drop_duplicates(inplace=True)
-    df.drop_duplicates(subset=['name'], keep='first', inplace=True)
+    row_hash, column_hashes = hash_columns(df, keep=('name',))
+    keep = ~pd.Series(row_hash).duplicated().to_numpy()
+    keep[keep] = ~pd.Series(column_hashes['name'][keep]).duplicated() \
+        .to_numpy()
+    df = df.loc[keep]
+    df['row_hash'] = to_signed(row_hash[keep])
     return df
 
 
@@ -49,6 +104,7 @@ def clean_categorical_columns(df):
 
 # removes duplicates from the categories and genres columns
 # makes it consistent format
+@profiled()
 def normalize_list_columns(df):
     for col in ('categories', 'genres'):
         def normalize(cell):
@@ -80,6 +136,9 @@ def owner_to_numeric(value):
 # runs the above functions in order
 def load_and_clean_data(filepath):
     df = load_data(filepath)
+    metrics.record(
+        rows_in=len(df), bytes_read=metrics.file_size(filepath)
+    )
     df = drop_unnecessary_columns(df)
     df = clean_numerical_columns(df)
     df = clean_categorical_columns(df)
@@ -87,6 +146,9 @@ def load_and_clean_data(filepath):
     # saves the cleaned dataset to a new CSV file
     output_path = Path('data') / 'steam_games_clean.csv'
     df.to_csv(output_path, index=False)
+    metrics.record(
+        rows_out=len(df), bytes_written=metrics.file_size(output_path)
+    )
     print(f"Cleaned dataset saved to {output_path}")
     return df
 
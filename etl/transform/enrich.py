@@ -5,9 +5,23 @@ import requests
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+from utils import metrics, profiling
+from utils.profiling import profiled
+
 STEAM_API_KEY = os.getenv("STEAM_API_KEY")
 SESSION = requests.Session()
+# the defaults, run_etl passes the paths of its data directory
 CACHE_PATH = Path("data") / "steam_players_cache.csv"
+# every count fetched from the API is also kept as a timestamped sample
+#  the load stage appends these to the player count history table
+SAMPLES_PATH = Path("data") / "steam_players_samples.csv"
+# rows per batch enrich_batches hands to a streaming load
+STREAM_BATCH_ROWS = int(os.getenv("ETL_STREAM_BATCH_ROWS", "5000"))
+# cached counts older than this are fetched again, a week so that
+#  nightly runs only refetch the counts of a few games each night
+PLAYER_CACHE_TTL = pd.Timedelta(
+    hours=float(os.getenv("PLAYER_CACHE_TTL_HOURS", "168"))
+)
 
 
 # makes a call to the Steam API to get the current players for a given appid
@@ -19,52 +33,140 @@ def fetch_current_players(appid: int) -> int:
         resp.raise_for_status()
         return resp.json().get("response", {}).get("player_count", 0)
     except requests.RequestException:
+        metrics.increment(api_errors=1)
         return 0
 
 # we making a lot of ccalls to the Steam API
 #  so we need to cache the results to avoid hitting the rate limit
-def load_player_cache() -> pd.DataFrame:
-    if CACHE_PATH.exists():
-        return pd.read_csv(CACHE_PATH, dtype={"appid": int, "current_players": int})
-    return pd.DataFrame(columns=["appid", "current_players"])
+#  caches written before fetched_at existed count as fetched when the
+#  file was last saved
+def load_player_cache(cache_path: Path | None = None) -> pd.DataFrame:
+    cache_path = Path(cache_path or CACHE_PATH)
+    if cache_path.exists():
+        cache = pd.read_csv(cache_path, dtype={"appid": int, "current_players": int})
+        if "fetched_at" not in cache.columns:
+            cache["fetched_at"] = pd.Timestamp(
+                cache_path.stat().st_mtime, unit="s", tz="UTC"
+            )
+        cache["fetched_at"] = pd.to_datetime(cache["fetched_at"], utc=True)
+        return cache
+    return pd.DataFrame({
+        "appid": pd.Series(dtype=int),
+        "current_players": pd.Series(dtype=int),
+        "fetched_at": pd.Series(dtype="datetime64[ns, UTC]"),
+    })
+
+
+# cache entries older than PLAYER_CACHE_TTL
+def stale_entries(cache: pd.DataFrame) -> pd.Series:
+    return cache["fetched_at"] < pd.Timestamp.now(tz="UTC") - PLAYER_CACHE_TTL
 
 
 # naturally we got to have the cache saved
-def save_player_cache(df_cache: pd.DataFrame):
-    CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
-    df_cache.to_csv(CACHE_PATH, index=False)
+def save_player_cache(
+    df_cache: pd.DataFrame, cache_path: Path | None = None
+):
+    cache_path = Path(cache_path or CACHE_PATH)
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    df_cache.to_csv(cache_path, index=False)
 
-# update the current players column in the dataframe
-#  by merging with the cache and fetching new data
-def update_current_players(df: pd.DataFrame) -> pd.DataFrame:
-    cache = load_player_cache()
-    df = df.merge(cache, on="appid", how="left", suffixes=("", "_cached"))
+# appends freshly fetched counts to the samples file for the history table
+def save_player_samples(
+    df_samples: pd.DataFrame, samples_path: Path | None = None
+):
+    samples_path = Path(samples_path or SAMPLES_PATH)
+    samples_path.parent.mkdir(parents=True, exist_ok=True)
+    df_samples[["appid", "observed_at", "player_count"]].to_csv(
+        samples_path, mode="a", header=not samples_path.exists(), index=False
+    )
+
+
+# the cached count for every appid with a fresh cache entry, the rest
+#  keep their peak_ccu, returns the frame and the appids still at 0 to
+#  ask the API
+def apply_player_cache(df: pd.DataFrame, cache: pd.DataFrame):
+    fresh = cache.loc[~stale_entries(cache), ["appid", "current_players"]]
+    df = df.merge(fresh, on="appid", how="left", suffixes=("", "_cached"))
     df["current_players"] = df["current_players"].fillna(0).astype(int)
     df["current_players"] = df.apply(
         lambda r: r["current_players_cached"]
         if pd.notna(r["current_players_cached"]) else r["current_players"],
         axis=1
     )
+    cache_hits = int(df["current_players_cached"].notna().sum())
     df.drop(columns=["current_players_cached"], inplace=True)
 
     mask = df["current_players"] == 0
     appids = df.loc[mask, "appid"].astype(int).unique()
-    new_entries = []
-    # we have to use threading to avoid hitting the rate limit
-    #  and to speed up the process it still takes 15min
-    with ThreadPoolExecutor(max_workers=20) as executor:
-        futures = {executor.submit(fetch_current_players, aid): aid for aid in appids}
+    metrics.record(cache_hits=cache_hits, cache_misses=len(appids))
+    metrics.increment(api_calls=len(appids))
+    return df, appids
+
+
+# yields (appid, player count) pairs in the order the API answers
+# we have to use threading to avoid hitting the rate limit
+#  and to speed up the process it still takes 15min
+def fetch_players(appids):
+    # the workers start in a copy of this context, so the run metrics
+    #  count their API errors against the current stage
+    executor = ThreadPoolExecutor(
+        max_workers=20, initializer=metrics.worker_initializer()
+    )
+    try:
+        futures = {
+            executor.submit(fetch_current_players, aid): aid
+            for aid in appids
+        }
         for future in as_completed(futures):
-            aid = futures[future]
-            new_entries.append({"appid": aid, "current_players": future.result()})
+            yield futures[future], future.result()
+    finally:
+        # a consumer that stops early does not wait for the remaining calls
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+# adds freshly fetched counts to the cache and the history samples
+def save_fetched_players(
+    cache: pd.DataFrame,
+    new_cache: pd.DataFrame,
+    observed_at: pd.Timestamp,
+    cache_path: Path | None = None,
+    samples_path: Path | None = None,
+):
+    new_cache = new_cache.assign(fetched_at=observed_at)
+    cache = pd.concat([cache, new_cache], ignore_index=True) \
+        .drop_duplicates("appid", keep="last")
+    save_player_cache(
+        cache[["appid", "current_players", "fetched_at"]], cache_path
+    )
+    save_player_samples(new_cache.assign(
+        observed_at=observed_at.isoformat(),
+        player_count=new_cache["current_players"],
+    ), samples_path)
+
+
+# update the current players column in the dataframe
+#  by merging with the cache and fetching new data
+@profiled()
+def update_current_players(
+    df: pd.DataFrame,
+    cache_path: Path | None = None,
+    samples_path: Path | None = None,
+) -> pd.DataFrame:
+    cache = load_player_cache(cache_path)
+    df, appids = apply_player_cache(df, cache)
+    observed_at = pd.Timestamp.now(tz="UTC")
+    new_entries = [
+        {"appid": aid, "current_players": count}
+        for aid, count in fetch_players(appids)
+    ]
     # updates the cache with new entries
     #  and merges with the dataframe
     # also makes sure they are integers, had to come back to this
     if new_entries:
         new_cache = pd.DataFrame(new_entries)
-        cache = pd.concat([cache, new_cache], ignore_index=True) \
-            .drop_duplicates("appid", keep="last")
-        save_player_cache(cache)
+        save_fetched_players(
+            cache, new_cache, observed_at, cache_path, samples_path
+        )
         df = df.merge(new_cache, on="appid", how="left", suffixes=("", "_new"))
         df.loc[
             df["current_players"] == 0, "current_players"
@@ -79,6 +181,21 @@ def update_current_players(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+# rows kept from a previous enriched file take the cached counts, which
+#  are never older, e.g. the ones the prefetch refreshed during extract
+def refresh_current_players(
+    df: pd.DataFrame, cache_path: Path | None = None
+) -> pd.DataFrame:
+    cache = load_player_cache(cache_path)
+    counts = cache.drop_duplicates("appid", keep="last") \
+        .set_index("appid")["current_players"]
+    refreshed = df["appid"].map(counts)
+    df = df.copy()
+    df["current_players"] = refreshed.fillna(df["current_players"]) \
+        .fillna(0).astype(int)
+    return df
+
+
 # rename the peak_ccu column to current_players
 #  and add a release_year column for filtering and grouping
 def enrich_dates(df: pd.DataFrame) -> pd.DataFrame:
@@ -128,14 +245,80 @@ def enrich_metrics(df: pd.DataFrame) -> pd.DataFrame:
 
 
 # execute order 66 "cleaning"
-def enrich_data(df: pd.DataFrame) -> pd.DataFrame:
+def enrich_data(
+    df: pd.DataFrame,
+    cache_path: Path | None = None,
+    samples_path: Path | None = None,
+) -> pd.DataFrame:
+    metrics.record(rows_in=len(df))
     df = enrich_dates(df)
     df = enrich_price(df)
-    df = update_current_players(df)
+    df = update_current_players(df, cache_path, samples_path)
     df = enrich_metrics(df)
+    metrics.record(rows_out=len(df))
     return df
 
 
+# the last enrich step of a batch whose player counts are all in
+def finish_batch(df: pd.DataFrame) -> pd.DataFrame:
+    df["current_players"] = (
+        pd.to_numeric(df["current_players"], errors="coerce")
+        .fillna(0)
+        .astype(int)
+    )
+    return enrich_metrics(df)
+
+
+def enrich_batches(
+    df: pd.DataFrame,
+    batch_rows: int = STREAM_BATCH_ROWS,
+    cache_path: Path | None = None,
+    samples_path: Path | None = None,
+):
+    """
+    enrich_data as a generator for the streaming load. It yields
+    enriched batches of up to `batch_rows` rows as soon as their player
+    counts are known: first the rows the cache or peak_ccu already
+    cover, then the others as the Steam API answers. The player cache
+    and history samples are saved once every count is in. Rows come
+    out in that order, not in the order of `df`.
+    """
+    metrics.record(rows_in=len(df))
+    df = enrich_price(enrich_dates(df))
+    with profiling.step("update_current_players"):
+        cache = load_player_cache(cache_path)
+        df, appids = apply_player_cache(df, cache)
+    waiting = df["current_players"] == 0
+    ready, df_waiting = df.loc[~waiting], df.loc[waiting]
+    for start in range(0, len(ready), batch_rows):
+        yield finish_batch(ready.iloc[start:start + batch_rows].copy())
+
+    observed_at = pd.Timestamp.now(tz="UTC")
+    fetched, batch = {}, {}
+    for aid, count in fetch_players(appids):
+        batch[aid] = count
+        if len(batch) >= batch_rows:
+            fetched.update(batch)
+            yield _resolved(df_waiting, batch)
+            batch = {}
+    if batch:
+        fetched.update(batch)
+        yield _resolved(df_waiting, batch)
+
+    if fetched:
+        save_fetched_players(cache, pd.DataFrame({
+            "appid": list(fetched), "current_players": list(fetched.values())
+        }), observed_at, cache_path, samples_path)
+    metrics.record(rows_out=len(df))
+
+
+# the waiting rows of the appids in `counts`, with their fetched counts
+def _resolved(df_waiting: pd.DataFrame, counts: dict) -> pd.DataFrame:
+    rows = df_waiting.loc[df_waiting["appid"].isin(list(counts))].copy()
+    rows["current_players"] = rows["appid"].map(counts)
+    return finish_batch(rows)
+
+
 # timer + file paths, remember children when you struggling brute force it
 if __name__ == "__main__":
     BASE_DIR = Path(__file__).resolve().parent.parent.parent
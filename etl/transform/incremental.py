@@ -0,0 +1,261 @@
+import json
+import os
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from etl.transform.clean import (
+    load_data,
+    drop_unnecessary_columns,
+    hash_columns,
+    to_signed,
+    clean_numerical_columns,
+    clean_categorical_columns,
+    normalize_list_columns,
+)
+from etl.transform.enrich import (
+    STREAM_BATCH_ROWS,
+    enrich_batches,
+    enrich_data,
+    refresh_current_players,
+)
+from etl.transform.sample import mark_sampled, sample_rows
+from utils import metrics
+
+
+# one 64-bit hash per row over the pruned columns, the row_hash column
+#  drop_unnecessary_columns added, or computed the same way
+def row_hashes(df: pd.DataFrame) -> pd.DataFrame:
+    if "row_hash" in df.columns:
+        hashes = df["row_hash"].to_numpy()
+    else:
+        hashes = to_signed(hash_columns(df)[0])
+    return pd.DataFrame({
+        "appid": df["appid"].to_numpy(),
+        "row_hash": hashes,
+    })
+
+
+# the hashes saved by the previous run, empty on the first run
+#  files written before the hashes were signed hold the same bits
+def load_hashes(path: Path) -> pd.DataFrame:
+    if Path(path).exists():
+        hashes = pd.read_csv(path, dtype={"appid": int})
+        hashes["row_hash"] = to_signed(hashes["row_hash"].to_numpy())
+        return hashes
+    return pd.DataFrame({
+        "appid": pd.Series(dtype=int),
+        "row_hash": pd.Series(dtype="int64"),
+    })
+
+
+def save_hashes(hashes: pd.DataFrame, path: Path):
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    hashes.to_csv(path, index=False)
+
+
+def diff_snapshot(current: pd.DataFrame, previous: pd.DataFrame) -> dict:
+    """
+    Compare the row hashes of a new snapshot with the previous run.
+    Returns a dict of appid arrays: "added" (new appids), "changed"
+    (same appid, different hash) and "removed" (appids that are gone).
+    """
+    merged = current.drop_duplicates("appid").merge(
+        previous.drop_duplicates("appid"), on="appid", how="outer",
+        suffixes=("", "_prev"), indicator=True,
+    )
+    both = merged["_merge"] == "both"
+    return {
+        "added": merged.loc[merged["_merge"] == "left_only", "appid"]
+        .to_numpy(),
+        "changed": merged.loc[
+            both & (merged["row_hash"] != merged["row_hash_prev"]), "appid"
+        ].to_numpy(),
+        "removed": merged.loc[merged["_merge"] == "right_only", "appid"]
+        .to_numpy(),
+    }
+
+
+# enriched files written before clean added row_hash cannot be merged
+def has_row_hash(enriched_csv: Path) -> bool:
+    return "row_hash" in pd.read_csv(enriched_csv, nrows=0).columns
+
+
+# the clean steps that come after the column pruning and dedup
+def clean_rows(df: pd.DataFrame) -> pd.DataFrame:
+    df = clean_numerical_columns(df)
+    df = clean_categorical_columns(df)
+    df = normalize_list_columns(df)
+    return df
+
+
+# what the clean step hands to the enrich step next to the clean rows
+def delta_path(clean_csv: Path) -> Path:
+    return Path(clean_csv).with_name("steam_games_delta.json")
+
+
+# the new snapshot's hashes, only promoted once the enrich step succeeded
+def pending_hashes_path(hashes_csv: Path) -> Path:
+    hashes_csv = Path(hashes_csv)
+    return hashes_csv.with_name(f"{hashes_csv.stem}.pending.csv")
+
+
+def clean_snapshot(
+    raw_csv_path: Path,
+    clean_csv: Path,
+    enriched_csv: Path,
+    hashes_csv: Path,
+    full: bool = False,
+    sample: float | int | None = None,
+) -> pd.DataFrame:
+    """
+    The clean half of a transform, persisted so enrich can rerun alone.
+
+    1) Load and prune the raw snapshot (dedup stays catalogue wide).
+       With a `sample`, keep only that stable subset of it and mark the
+       output directory as sampled, see etl.transform.sample.
+    2) Unless `full`, diff its row hashes against `hashes_csv` and keep
+       only the added and changed rows, so the Steam API is only asked
+       about those.
+    3) Clean them into `clean_csv`, and save the new hashes as pending
+       plus a delta file naming the previous appids the rows supersede.
+    Falls back to the whole catalogue when there is no previous state.
+    """
+    df = drop_unnecessary_columns(load_data(raw_csv_path))
+    metrics.record(
+        rows_in=len(df), bytes_read=metrics.file_size(raw_csv_path)
+    )
+    if sample is not None:
+        df = sample_rows(df, sample)
+        mark_sampled(Path(clean_csv).parent, sample, len(df))
+        print(f"Sampled {len(df)} games ({sample})")
+    current = row_hashes(df)
+
+    previous = load_hashes(hashes_csv)
+    delta = {"full": True, "stale": []}
+    if full:
+        df_clean = clean_rows(df)
+    elif previous.empty or not Path(enriched_csv).exists():
+        print("No previous run to diff against, transforming everything")
+        df_clean = clean_rows(df)
+    elif not has_row_hash(enriched_csv):
+        # its kept rows would be loaded with an empty row_hash
+        print("The previous enriched file has no row_hash, "
+              "transforming everything")
+        df_clean = clean_rows(df)
+    else:
+        diff = diff_snapshot(current, previous)
+        print(
+            f"Snapshot diff: {len(diff['added'])} added, "
+            f"{len(diff['changed'])} changed, {len(diff['removed'])} removed"
+        )
+        todo = df["appid"].isin(diff["added"]) | \
+            df["appid"].isin(diff["changed"])
+        metrics.record(rows_changed=int(todo.sum()))
+        df_clean = clean_rows(df.loc[todo].copy())
+        stale = np.concatenate([diff["changed"], diff["removed"]])
+        delta = {"full": False, "stale": sorted(int(a) for a in stale)}
+
+    df_clean.to_csv(clean_csv, index=False)
+    save_hashes(current, pending_hashes_path(hashes_csv))
+    delta_path(clean_csv).write_text(json.dumps(delta))
+    metrics.record(
+        rows_out=len(df_clean), bytes_written=metrics.file_size(clean_csv)
+    )
+    return df_clean
+
+
+def enrich_snapshot(
+    clean_csv: Path,
+    enriched_csv: Path,
+    hashes_csv: Path,
+    df_clean: pd.DataFrame | None = None,
+    cache_path: Path | None = None,
+    samples_path: Path | None = None,
+) -> pd.DataFrame:
+    """
+    The enrich half: enrich the rows clean_snapshot saved (or the same
+    rows passed in memory) and merge them into the previous
+    `enriched_csv`, dropping the appids they supersede. Kept rows take
+    the player counts refreshed in the cache since. Only then are the
+    pending hashes promoted, so a failed enrich is simply rerun.
+    The player counts are cached in `cache_path` and the fetched ones
+    appended to `samples_path`, enrich.py's defaults when not given.
+    """
+    delta = json.loads(delta_path(clean_csv).read_text())
+    if df_clean is None:
+        df_clean = pd.read_csv(clean_csv, parse_dates=["release_date"])
+
+    if delta["full"]:
+        df_enriched = enrich_data(df_clean, cache_path, samples_path)
+    else:
+        prev_enriched = pd.read_csv(enriched_csv, parse_dates=["release_date"])
+        kept = refresh_current_players(
+            prev_enriched.loc[~prev_enriched["appid"].isin(delta["stale"])],
+            cache_path,
+        )
+        if len(df_clean):
+            df_enriched = pd.concat(
+                [kept, enrich_data(df_clean, cache_path, samples_path)],
+                ignore_index=True,
+            )
+        else:
+            df_enriched = kept.reset_index(drop=True)
+
+    df_enriched.to_csv(enriched_csv, index=False)
+    promote_hashes(hashes_csv)
+    metrics.record(
+        rows_out=len(df_enriched),
+        bytes_written=metrics.file_size(enriched_csv),
+    )
+    return df_enriched
+
+
+# the snapshot is fully enriched, diff the next one against it
+def promote_hashes(hashes_csv: Path):
+    pending = pending_hashes_path(hashes_csv)
+    if pending.exists():
+        os.replace(pending, hashes_csv)
+
+
+def stream_enrich_snapshot(
+    clean_csv: Path,
+    enriched_csv: Path,
+    batch_rows: int = STREAM_BATCH_ROWS,
+    cache_path: Path | None = None,
+    samples_path: Path | None = None,
+):
+    """
+    enrich_snapshot as batches for a streaming load. It yields the rows
+    kept from the previous `enriched_csv`, then the fresh rows as
+    enrich_batches yields them. Together they are the whole new
+    catalogue. The caller writes them out and then calls
+    promote_hashes.
+    """
+    delta = json.loads(delta_path(clean_csv).read_text())
+    df_clean = pd.read_csv(clean_csv, parse_dates=["release_date"])
+    if not delta["full"]:
+        prev_enriched = pd.read_csv(enriched_csv, parse_dates=["release_date"])
+        kept = refresh_current_players(
+            prev_enriched.loc[~prev_enriched["appid"].isin(delta["stale"])],
+            cache_path,
+        )
+        for start in range(0, len(kept), batch_rows):
+            yield kept.iloc[start:start + batch_rows]
+    if len(df_clean):
+        yield from enrich_batches(
+            df_clean, batch_rows, cache_path, samples_path
+        )
+
+
+def transform_incremental(
+    raw_csv_path: Path, enriched_csv: Path, hashes_csv: Path
+) -> pd.DataFrame:
+    """
+    Clean and enrich only the rows that changed since the previous run,
+    see clean_snapshot and enrich_snapshot.
+    """
+    clean_csv = Path(enriched_csv).with_name("steam_games_clean.csv")
+    df_clean = clean_snapshot(
+        raw_csv_path, clean_csv, enriched_csv, hashes_csv
+    )
+    return enrich_snapshot(clean_csv, enriched_csv, hashes_csv, df_clean)
@@ -0,0 +1,105 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+import etl.transform.enrich as enrich
+from utils import metrics
+
+
+class PlayerPrefetch:
+    """
+    Refreshes the stale cached player counts of the previous catalogue
+    while the new snapshot is still downloading.
+
+    run() asks the Steam API about every appid of the previous
+    `enriched_csv` whose cache entry is older than PLAYER_CACHE_TTL,
+    and blocks until the answers are in. Once the new snapshot's appids
+    are known, reconcile() drops the ones that left the catalogue.
+    Their queued calls are cancelled and late answers are discarded.
+    run() then saves the remaining counts to the cache and the history
+    samples, so enrich sees them as cache hits and only calls the API
+    for appids that are new.
+    """
+
+    def __init__(
+        self,
+        enriched_csv: Path,
+        max_workers: int = 20,
+        cache_path: Path | None = None,
+        samples_path: Path | None = None,
+    ):
+        self.enriched_csv = Path(enriched_csv)
+        self.max_workers = max_workers
+        self.cache_path = cache_path
+        self.samples_path = samples_path
+        # the new snapshot's appids, None until reconcile()
+        self._keep = None
+        self._futures = {}
+        self._lock = threading.Lock()
+
+    # previously loaded appids whose cached count expired
+    def stale_appids(self, cache: pd.DataFrame) -> np.ndarray:
+        if not self.enriched_csv.exists():
+            return np.array([], dtype=int)
+        known = pd.read_csv(self.enriched_csv, usecols=["appid"])["appid"]
+        stale = cache.loc[enrich.stale_entries(cache), "appid"]
+        return np.intersect1d(known.to_numpy(), stale.to_numpy())
+
+    def run(self) -> int:
+        cache = enrich.load_player_cache(self.cache_path)
+        appids = self.stale_appids(cache)
+        observed_at = pd.Timestamp.now(tz="UTC")
+        metrics.record(prefetch_candidates=len(appids))
+
+        # counts API errors against the prefetch stage
+        executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            initializer=metrics.worker_initializer(),
+        )
+        try:
+            with self._lock:
+                for aid in appids:
+                    if self._keep is None or aid in self._keep:
+                        self._futures[int(aid)] = executor.submit(
+                            enrich.fetch_current_players, int(aid)
+                        )
+            wait(list(self._futures.values()))
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+        with self._lock:
+            calls = sum(
+                not future.cancelled() for future in self._futures.values()
+            )
+            counts = {
+                aid: future.result()
+                for aid, future in self._futures.items()
+                if not future.cancelled()
+                and (self._keep is None or aid in self._keep)
+            }
+        if counts:
+            enrich.save_fetched_players(cache, pd.DataFrame({
+                "appid": list(counts),
+                "current_players": list(counts.values()),
+            }), observed_at, self.cache_path, self.samples_path)
+        metrics.record(
+            api_calls=calls,
+            prefetched=len(counts),
+            prefetch_dropped=len(self._futures) - len(counts),
+        )
+        print(f"Prefetched player counts for {len(counts)} known games")
+        return len(counts)
+
+    def reconcile(self, appids):
+        """Keep only the prefetches of appids in the new snapshot."""
+        with self._lock:
+            self._keep = {int(aid) for aid in appids}
+            for aid, future in self._futures.items():
+                if aid not in self._keep:
+                    future.cancel()
+
+    # the run failed, e.g. on validation, nothing is kept or saved
+    def cancel(self):
+        self.reconcile(())
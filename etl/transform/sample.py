@@ -0,0 +1,96 @@
+import argparse
+import json
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+# written into every directory of sampled stage outputs
+MARKER = "SAMPLE.json"
+
+
+class SampledDataError(RuntimeError):
+    """Sampled data was about to be loaded into a full (production) target."""
+
+
+def parse_sample(text: str) -> float | int:
+    """
+    argparse type for --sample: a fraction of the catalogue ("0.05")
+    or a number of games ("2000").
+    """
+    try:
+        value = float(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"not a number: {text}")
+    if 0 < value < 1:
+        return value
+    if value >= 1 and value.is_integer():
+        return int(value)
+    raise argparse.ArgumentTypeError(
+        f"expected a fraction in (0, 1) or a row count, got {text}"
+    )
+
+
+# the same thresholds as enrich_price's tiers, on the raw price column
+def price_tiers(price: pd.Series) -> np.ndarray:
+    price = pd.to_numeric(price, errors="coerce").fillna(0).to_numpy()
+    return np.select(
+        [price == 0, price <= 25, price <= 40],
+        ["Free", "Indie", "Standard"],
+        default="Premium",
+    )
+
+
+def sample_rows(df: pd.DataFrame, sample: float | int) -> pd.DataFrame:
+    """
+    A stable, stratified subset of the catalogue.
+
+    The strata are release year and price tier, and each gets its share
+    of the sample (largest remainder, so a row count is met exactly).
+    Within a stratum the games with the lowest appid hash are taken, so
+    the same games are picked on every run.
+    """
+    total = len(df)
+    size = min(total, round(sample * total) if sample < 1 else int(sample))
+    if size >= total:
+        return df
+
+    strata = pd.DataFrame({
+        "year": df["release_date"].dt.year.fillna(0).astype(int).to_numpy(),
+        "tier": price_tiers(df["price"]),
+        "hash": pd.util.hash_array(df["appid"].to_numpy()),
+    })
+    counts = strata.groupby(["year", "tier"]).size()
+    quotas = counts * size / total
+    taken = np.floor(quotas).astype(int)
+    # the remaining rows go to the strata with the largest remainders
+    remainder = (quotas - taken).sort_values(ascending=False, kind="stable")
+    taken.loc[remainder.index[:size - taken.sum()]] += 1
+
+    ranks = strata.sort_values("hash", kind="stable") \
+        .groupby(["year", "tier"]).cumcount().sort_index()
+    quota = strata.merge(
+        taken.rename("quota"), left_on=["year", "tier"], right_index=True,
+        how="left",
+    )["quota"]
+    return df.loc[ranks.to_numpy() < quota.to_numpy()]
+
+
+def mark_sampled(data_dir: Path, sample: float | int, rows: int):
+    data_dir = Path(data_dir)
+    data_dir.mkdir(parents=True, exist_ok=True)
+    (data_dir / MARKER).write_text(
+        json.dumps({"sample": sample, "rows": rows})
+    )
+
+
+def is_sampled(path: Path) -> bool:
+    """True for files in a directory of sampled stage outputs."""
+    return (Path(path).parent / MARKER).exists()
+
+
+def check_not_sampled(path: Path):
+    if is_sampled(path):
+        raise SampledDataError(
+            f"{path} is sampled data (see {Path(path).parent / MARKER}) "
+            "and can only be loaded into the sample database"
+        )
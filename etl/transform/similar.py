@@ -0,0 +1,124 @@
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from utils import metrics
+from utils.profiling import profiled
+
+SIMILAR_PATH = Path("data") / "steam_games_similar.csv"
+# neighbours kept per game
+TOP_K = 10
+# rows per block of the similarity product, each block is a dense
+#  BLOCK_SIZE x catalogue float32 array (256 x 100k is about 100 MB)
+BLOCK_SIZE = 256
+# tags on at least 1 in DENSE_TAG_SHARE games are multiplied densely
+DENSE_TAG_SHARE = 1000
+# how much each kind of tag counts, categories are broad so count less
+FEATURE_WEIGHTS = {"genres": 1.0, "categories": 0.5, "developers": 1.0}
+
+
+# one (row position, tag) pair per distinct tag of a comma-joined
+#  column, also accepting the raw "['a', 'b']" list format
+def explode_tags(cells: pd.Series) -> pd.DataFrame:
+    lists = cells.fillna("").astype(str).str.strip("[]").str.split(",")
+    tags = pd.DataFrame({
+        "row": np.repeat(np.arange(len(cells)), lists.str.len()),
+        "tag": lists.explode().str.strip().str.strip("'\"").str.strip()
+        .to_numpy(),
+    })
+    return tags[tags["tag"] != ""].drop_duplicates()
+
+
+def tag_vectors(df: pd.DataFrame) -> sparse.csr_matrix:
+    """
+    Sparse games x tags matrix over genres, categories and developers,
+    weighted by FEATURE_WEIGHTS and L2-normalised per row, so the dot
+    product of two rows is their cosine similarity.
+    """
+    rows, cols, vals = [], [], []
+    offset = 0
+    for column, weight in FEATURE_WEIGHTS.items():
+        tags = explode_tags(df[column])
+        codes, vocab = pd.factorize(tags["tag"])
+        rows.append(tags["row"].to_numpy())
+        cols.append(codes + offset)
+        vals.append(np.full(len(codes), weight, dtype=np.float32))
+        offset += len(vocab)
+    matrix = sparse.csr_matrix(
+        (np.concatenate(vals), (np.concatenate(rows), np.concatenate(cols))),
+        shape=(len(df), offset), dtype=np.float32,
+    )
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)))
+    norms[norms == 0] = 1
+    return sparse.csr_matrix(matrix.multiply(1 / norms))
+
+
+@profiled()
+def similar_games(
+    df: pd.DataFrame, top_k: int = TOP_K, block_size: int = BLOCK_SIZE
+) -> pd.DataFrame:
+    """
+    Top-k most similar games for every game by cosine similarity of
+    their tag vectors. The all-pairs product is computed a block of
+    rows at a time so memory stays bounded by block_size x catalogue.
+    Returns (appid, neighbour_appid, score, rank) rows, rank 1 = best,
+    games without any tags in common are never listed.
+    """
+    vectors = tag_vectors(df)
+    appids = df["appid"].to_numpy()
+    n = len(df)
+    k = min(top_k, n - 1)
+    if k <= 0:
+        return pd.DataFrame(
+            columns=["appid", "neighbour_appid", "score", "rank"]
+        )
+
+    # tags shared by many games (genres, categories) make the product
+    #  nearly dense, so those columns go through a dense BLAS matmul and
+    #  only the long tail (mostly developers) through the sparse one
+    games_per_tag = np.bincount(vectors.indices, minlength=vectors.shape[1])
+    common = games_per_tag >= max(2, n // DENSE_TAG_SHARE)
+    common_t = vectors[:, common].T.toarray()
+    rare = vectors[:, ~common].tocsr()
+    rare_t = rare.T.tocsc()
+
+    blocks = []
+    for start in range(0, n, block_size):
+        stop = min(start + block_size, n)
+        scores = vectors[start:stop][:, common].toarray() @ common_t
+        tail = (rare[start:stop] @ rare_t).tocoo()
+        scores[tail.row, tail.col] += tail.data
+        # a game is not its own neighbour
+        scores[np.arange(stop - start), np.arange(start, stop)] = -1
+        top = np.argpartition(scores, n - k, axis=1)[:, n - k:]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind="stable")
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+        blocks.append(pd.DataFrame({
+            "appid": np.repeat(appids[start:stop], k),
+            "neighbour_appid": appids[top.ravel()],
+            "score": top_scores.ravel().round(4),
+            "rank": np.tile(np.arange(1, k + 1), stop - start),
+        }))
+
+    similar = pd.concat(blocks, ignore_index=True)
+    return similar[similar["score"] > 0].reset_index(drop=True)
+
+
+def save_similar_games(
+    df: pd.DataFrame, path: Path = SIMILAR_PATH
+) -> pd.DataFrame:
+    similar = similar_games(df)
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    similar.to_csv(path, index=False)
+    metrics.record(
+        rows_in=len(df), rows_out=len(similar),
+        bytes_written=metrics.file_size(path),
+    )
+    print(
+        f"Saved {len(similar)} similar-game pairs for {len(df)} games "
+        f"to '{Path(path).name}'"
+    )
+    return similar
@@ -1,21 +1,46 @@
 from pathlib import Path
 import pandas as pd
-from etl.transform.clean import load_and_clean_data
-from etl.transform.enrich import enrich_data
+from etl.transform.incremental import clean_snapshot, enrich_snapshot
+from etl.transform.similar import save_similar_games
+from utils import metrics
 
 
-# loads the downloaded dataset then runs the cleaning and enrichment functions
-def transform_steam_games(raw_csv_path: Path) -> pd.DataFrame:
-    raw_csv_path = Path(raw_csv_path)
-    clean_csv = raw_csv_path.parent / "steam_games_clean.csv"
-    enriched_csv = raw_csv_path.parent / "steam_games_enriched.csv"
+# the intermediate files of a transform, all next to the raw CSV
+def artifact_paths(data_dir: Path) -> dict:
+    data_dir = Path(data_dir)
+    return {
+        "raw": data_dir / "games_march2025_full.csv",
+        "clean": data_dir / "steam_games_clean.csv",
+        "enriched": data_dir / "steam_games_enriched.csv",
+        "hashes": data_dir / "steam_games_hashes.csv",
+        "similar": data_dir / "steam_games_similar.csv",
+        "cache": data_dir / "steam_players_cache.csv",
+        "samples": data_dir / "steam_players_samples.csv",
+    }
 
-    df_clean = load_and_clean_data(raw_csv_path)
-    df_clean.to_csv(clean_csv, index=False)
 
-    df_enriched = enrich_data(df_clean)
-    df_enriched.to_csv(enriched_csv, index=False)
+# loads the downloaded dataset then runs the cleaning and enrichment functions
+# incremental runs only redo the rows that changed since the last run
+# similar games are always recomputed over the whole enriched catalogue
+# run_etl runs the same three steps as separate stages of its DAG
+def transform_steam_games(
+    raw_csv_path: Path, incremental: bool = False
+) -> pd.DataFrame:
+    raw_csv_path = Path(raw_csv_path)
+    paths = artifact_paths(raw_csv_path.parent)
 
+    with metrics.stage("clean"):
+        df_clean = clean_snapshot(
+            raw_csv_path, paths["clean"], paths["enriched"], paths["hashes"],
+            full=not incremental,
+        )
+    with metrics.stage("enrich"):
+        df_enriched = enrich_snapshot(
+            paths["clean"], paths["enriched"], paths["hashes"], df_clean,
+            paths["cache"], paths["samples"],
+        )
+    with metrics.stage("similar"):
+        save_similar_games(df_enriched, paths["similar"])
     return df_enriched
 
 
@@ -0,0 +1,156 @@
+import os
+from difflib import get_close_matches
+from pathlib import Path
+import pandas as pd
+
+from etl.transform.clean import COLUMNS_FOR_ANALYSIS, drop_unnecessary_columns
+from utils import metrics
+
+# share of a column's values that may fail a check before the run stops
+MAX_INVALID_SHARE = float(os.getenv("ETL_VALIDATE_MAX_INVALID", "0.01"))
+# INTEGER columns of create_tb.sql, Postgres' INTEGER is 32-bit
+INTEGER_COLUMNS = (
+    "appid", "dlc_count", "metacritic_score", "recommendations",
+    "positive", "negative", "peak_ccu",
+)
+INTEGER_MAX = 2**31 - 1
+# price is NUMERIC(10,2)
+PRICE_MAX = 1e8
+BOOLEAN_COLUMNS = ("windows", "mac", "linux")
+BOOLEAN_VALUES = ("true", "false", "1", "0")
+# the "low - high" ranges owner_to_numeric splits
+OWNERS_PATTERN = r"^\s*\d+\s*-\s*\d+\s*$"
+# invalid values quoted per failed check
+EXAMPLES = 3
+
+
+class ValidationError(ValueError):
+    """The raw snapshot is not what clean, enrich and load expect."""
+
+    def __init__(self, path: Path, problems: list):
+        self.problems = problems
+        super().__init__(
+            f"{Path(path).name} failed validation:\n"
+            + "\n".join(f" - {problem}" for problem in problems)
+        )
+
+
+def check_header(columns) -> list:
+    """Missing columns, with the closest unknown column as a rename hint."""
+    unknown = [col for col in columns if col not in COLUMNS_FOR_ANALYSIS]
+    problems = []
+    for col in COLUMNS_FOR_ANALYSIS:
+        if col not in columns:
+            close = get_close_matches(col, unknown, n=1)
+            hint = f" (renamed to {close[0]}?)" if close else ""
+            problems.append(f"missing column {col}{hint}")
+    return problems
+
+
+# a problem line when more than `max_share` of the values are `bad`
+def _invalid(col, values, bad, rule, max_share):
+    count = int(bad.sum())
+    if count == 0 or count <= max_share * len(values):
+        return None
+    examples = ", ".join(
+        repr(value) for value in values[bad].unique()[:EXAMPLES]
+    )
+    return (
+        f"{col}: {count:,} of {len(values):,} values {rule}, e.g. {examples}"
+    )
+
+
+def check_values(df: pd.DataFrame, max_share: float = MAX_INVALID_SHARE):
+    """
+    Vectorized checks over the raw columns, read as strings. Empty
+    cells are allowed except for appid and name. Each column may have up
+    to `max_share` invalid values, appid none at all. Returns a list of
+    problems, empty when the snapshot is fine.
+    """
+    problems = []
+
+    def check(col, bad, rule, share=max_share):
+        values = df[col].dropna()
+        problems.append(_invalid(col, values, bad(values), rule, share))
+
+    missing_appids = int(df["appid"].isna().sum())
+    if missing_appids:
+        problems.append(f"appid: {missing_appids:,} rows have no appid")
+    missing_names = int(df["name"].isna().sum())
+    if missing_names > max_share * len(df):
+        problems.append(f"name: {missing_names:,} rows have no name")
+
+    def not_integer(values, high=INTEGER_MAX):
+        num = pd.to_numeric(values, errors="coerce")
+        return num.isna() | (num < 0) | (num > high) | (num % 1 != 0)
+
+    for col in INTEGER_COLUMNS:
+        check(
+            col, not_integer, f"are not integers from 0 to {INTEGER_MAX}",
+            share=0 if col == "appid" else max_share,
+        )
+    check(
+        "metacritic_score", lambda v: not_integer(v, 100),
+        "are not scores from 0 to 100",
+    )
+
+    def bad_price(values):
+        num = pd.to_numeric(values, errors="coerce")
+        return num.isna() | (num < 0) | (num >= PRICE_MAX)
+
+    check("price", bad_price, f"are not prices from 0 to {PRICE_MAX:.0f}")
+    for col in BOOLEAN_COLUMNS:
+        check(
+            col, lambda v: ~v.str.strip().str.lower().isin(BOOLEAN_VALUES),
+            "are not booleans",
+        )
+    # parsed like load_data does, a new format shows up as NaT
+    check(
+        "release_date",
+        lambda v: pd.to_datetime(v, errors="coerce").isna(),
+        "do not parse as dates",
+    )
+    check(
+        "estimated_owners",
+        lambda v: ~v.str.match(OWNERS_PATTERN),
+        'are not "low - high" owner ranges',
+    )
+
+    # the table's PRIMARY KEY, after clean's own dedup
+    appids = drop_unnecessary_columns(df)["appid"]
+    duplicated = appids[appids.duplicated()].unique()
+    if len(duplicated):
+        examples = ", ".join(duplicated[:EXAMPLES])
+        problems.append(
+            f"appid: {len(duplicated):,} appids are on differing rows, the "
+            f"table's primary key needs them unique, e.g. {examples}"
+        )
+    return [problem for problem in problems if problem]
+
+
+def validate_raw(raw_csv_path: Path, max_share: float = MAX_INVALID_SHARE):
+    """
+    Pre-flight check of a downloaded snapshot, run before anything
+    calls the Steam API or a database. The header is checked first on
+    its own, then one pass over the columns the pipeline reads. Raises
+    ValidationError listing every problem, returns the number of rows.
+    """
+    raw_csv_path = Path(raw_csv_path)
+    if not raw_csv_path.exists():
+        raise ValidationError(
+            raw_csv_path, ["file not found, did the extract fail?"]
+        )
+    header = pd.read_csv(raw_csv_path, nrows=0).columns
+    problems = check_header(header)
+    if problems:
+        raise ValidationError(raw_csv_path, problems)
+
+    df = pd.read_csv(raw_csv_path, usecols=COLUMNS_FOR_ANALYSIS, dtype=str)
+    metrics.record(
+        rows_in=len(df), bytes_read=metrics.file_size(raw_csv_path)
+    )
+    problems = check_values(df, max_share) if len(df) else ["no rows"]
+    if problems:
+        raise ValidationError(raw_csv_path, problems)
+    print(f"Validated {len(df):,} rows of '{raw_csv_path.name}'")
+    return len(df)
@@ -1,48 +1,325 @@
+import argparse
 import sys
 import time
+from contextlib import contextmanager
 from pathlib import Path
 from dotenv import load_dotenv
+import pandas as pd
 from etl.extract.extract import extract_steam_data
-from etl.transform.transform import transform_steam_games
-from etl.load.load import load_data_to_postgres
+from etl.pipeline import MAX_WORKERS, Stage, run_pipeline, select_stages
+from etl.stream import stream_to_target
+from etl.transform.incremental import (
+    clean_snapshot,
+    delta_path,
+    enrich_snapshot,
+    load_hashes,
+    pending_hashes_path,
+    promote_hashes,
+    stream_enrich_snapshot,
+)
+from etl.transform.prefetch import PlayerPrefetch
+from etl.transform.sample import parse_sample
+from etl.transform.similar import save_similar_games
+from etl.transform.validate import validate_raw
+from etl.transform.transform import artifact_paths
+from etl.load.snapshot import SNAPSHOT_PATH, write_snapshot
+from etl.load.targets import SQLiteTarget, get_load_target
+from utils import metrics, profiling
 
 # sets up the project root directory
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
-# Check if the script is run with the correct argument
-if len(sys.argv) != 2 or sys.argv[1] not in ("dev", "test"):
-    raise ValueError("Usage: run_etl [dev|test]")
 
+# Check if the script is run with the correct arguments
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="run_etl", description="Run the Steam games ETL pipeline."
+    )
+    parser.add_argument("env", choices=("dev", "test"))
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="clean and enrich the whole catalogue instead of only the "
+             "rows that changed since the previous run",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="profile every stage and sub-step (cProfile, tracemalloc and "
+             "sampled stacks) into profiles/<run id>/, stages then run "
+             "one at a time",
+    )
+    parser.add_argument(
+        "--metrics-prom",
+        type=Path,
+        default=metrics.PROM_PATH,
+        help="also write the run's metrics to this Prometheus textfile "
+             "(default: $ETL_METRICS_PROM)",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="run enrich and load as one enrich_load stage that loads "
+             "batches while the player counts are still being fetched",
+    )
+    parser.add_argument(
+        "--sample",
+        type=parse_sample,
+        metavar="N",
+        help="work on a stable stratified subset, a fraction (0.05) or a "
+             "number of games (2000), kept in data/sample/ and loaded "
+             "into data/sample/steam.db",
+    )
+    parser.add_argument(
+        "--no-prefetch",
+        dest="prefetch",
+        action="store_false",
+        help="do not refresh the stale player counts of known games "
+             "while the extract downloads",
+    )
+    parser.add_argument(
+        "--from",
+        dest="start",
+        metavar="STAGE",
+        help="start at this stage and run everything downstream of it, "
+             "earlier stages' outputs are read from data/",
+    )
+    parser.add_argument(
+        "--to",
+        dest="stop",
+        metavar="STAGE",
+        help="stop after this stage, running only what it depends on",
+    )
+    parser.add_argument(
+        "--only",
+        nargs="+",
+        metavar="STAGE",
+        help="run just these stages",
+    )
+    return parser.parse_args(argv)
 
+
+# gets the data for the ETL pipeline
+def main(argv=None):
+    args = parse_args(argv)
 # Load the appropriate .env file based on the argument
-env_file = PROJECT_ROOT / f".env.{sys.argv[1]}"
-load_dotenv(env_file, override=True)
-print(f"→ Loaded environment from {env_file.name}")
+    env_file = PROJECT_ROOT / f".env.{args.env}"
+    load_dotenv(env_file, override=True)
+    print(f"→ Loaded environment from {env_file.name}")
 
+# every stage appends a metrics record tagged with this run's id
+    run = metrics.start_run(prom_path=args.metrics_prom)
+    print(f"→ Run {run.run_id}, metrics in {run.path}")
+# opt-in profiling, each stage below becomes a profiled step
+    if args.profile:
+        run_dir = PROJECT_ROOT / "profiles" / run.run_id
+        profiling.enable(run_dir)
+        print(f"→ Profiling into {run_dir}")
+    status = "failed"
+    try:
+        run_stages(args)
+        status = "ok"
+    finally:
+        profiling.disable()
+        metrics.finish_run(status)
 
-# gets the data for the ETL pipeline
-def main():
-    DATA_DIR = PROJECT_ROOT / "data"
-    RAW_CSV = DATA_DIR / "games_march2025_full.csv"
-    ENRICHED_CSV = DATA_DIR / "steam_games_enriched.csv"
-# start timer
+
+# a metrics stage and, with --profile, a profiled step of the same name
+@contextmanager
+def stage(name: str):
+    with metrics.stage(name), profiling.step(name):
+        yield
+
+
+# wraps a stage function with its progress lines, metrics and profile
+def step(name: str, message: str, func):
+    def run():
+        print(f"▶︎ {message}…")
+        t0 = time.perf_counter()
+        with stage(name):
+            func()
+        print(f"✔ {name} completed in {time.perf_counter() - t0:.2f}s\n")
+    return run
+
+
+# where a run keeps its intermediates, sampled runs never touch the
+#  full catalogue's files
+def data_dir(args) -> Path:
+    if args.sample is not None:
+        return PROJECT_ROOT / "data" / "sample"
+    return PROJECT_ROOT / "data"
+
+
+# the pipeline as a DAG over the files in data/, see etl/pipeline.py
+#  every intermediate is persisted, so any stage can be rerun on its own
+def build_stages(args, target) -> list[Stage]:
+    paths = artifact_paths(data_dir(args))
+    # every run reads the same download
+    paths["raw"] = artifact_paths(PROJECT_ROOT / "data")["raw"]
+    snapshot_path = (
+        paths["enriched"].with_name("steam_games.arrow")
+        if args.sample is not None else SNAPSHOT_PATH
+    )
+    delta = delta_path(paths["clean"])
+    # the database stages never overlap: SQLite has a single writer, and
+    #  on Postgres each of them runs CREATE TABLE IF NOT EXISTS on the
+    #  shared dataset_version table, which races on a fresh database
+    database = ("database",)
+
+    prefetch = PlayerPrefetch(
+        paths["enriched"],
+        cache_path=paths["cache"], samples_path=paths["samples"],
+    )
+
+    # once the new snapshot's appids are known, the prefetch drops the
+    #  games that are gone
+    def clean():
+        clean_snapshot(
+            paths["raw"], paths["clean"], paths["enriched"],
+            paths["hashes"], full=args.full, sample=args.sample,
+        )
+        pending = load_hashes(pending_hashes_path(paths["hashes"]))
+        prefetch.reconcile(pending["appid"])
+
+    def load():
+        target.load(paths["enriched"])
+        # the memory-mapped copy read by DASHBOARD_SOURCE=file
+        snapshot = write_snapshot(paths["enriched"], snapshot_path)
+        metrics.record(snapshot_bytes=metrics.file_size(snapshot))
+
+    # enrich produces batches while load consumes them, see etl/stream.py
+    def enrich_load():
+        stream_to_target(
+            stream_enrich_snapshot(
+                paths["clean"], paths["enriched"],
+                cache_path=paths["cache"], samples_path=paths["samples"],
+            ),
+            target, paths["enriched"],
+        )
+        promote_hashes(paths["hashes"])
+        snapshot = write_snapshot(paths["enriched"], snapshot_path)
+        metrics.record(snapshot_bytes=metrics.file_size(snapshot))
+
+    def similar():
+        df = pd.read_csv(paths["enriched"])
+        save_similar_games(df, paths["similar"])
+
+    # enrich waits for the prefetched counts to be in the cache
+    prefetched = ("prefetch",) if args.prefetch else ()
+    if args.stream:
+        enrich_and_load = [
+            Stage(
+                "enrich_load",
+                step("enrich_load", "Enriching and streaming into "
+                     f"{target.name}", enrich_load),
+                inputs=(paths["clean"], delta),
+                outputs=(paths["enriched"],),
+                after=prefetched,
+                resources=database,
+            ),
+        ]
+    else:
+        enrich_and_load = [
+            Stage(
+                "enrich",
+                step("enrich", "Enriching data", lambda: enrich_snapshot(
+                    paths["clean"], paths["enriched"], paths["hashes"],
+                    cache_path=paths["cache"], samples_path=paths["samples"],
+                )),
+                inputs=(paths["clean"], delta),
+                outputs=(paths["enriched"],),
+                after=prefetched,
+            ),
+            Stage(
+                "load",
+                step("load", f"Loading enriched data into {target.name}",
+                     load),
+                inputs=(paths["enriched"],),
+                resources=database,
+            ),
+        ]
+
+    stages = [
+        Stage(
+            "extract",
+            step("extract", "Extracting raw data from Kaggle",
+                 extract_steam_data),
+            outputs=(paths["raw"],),
+        ),
+        # fails in seconds on a malformed download, before enrich calls
+        #  the Steam API and before any database stage
+        Stage(
+            "validate",
+            step("validate", "Validating raw data",
+                 lambda: validate_raw(paths["raw"])),
+            inputs=(paths["raw"],),
+        ),
+        Stage(
+            "clean",
+            step("clean", "Cleaning data", clean),
+            inputs=(paths["raw"],),
+            outputs=(paths["clean"], delta),
+            after=("validate",),
+        ),
+        *enrich_and_load,
+        Stage(
+            "similar",
+            step("similar", "Computing similar games", similar),
+            inputs=(paths["enriched"],),
+            outputs=(paths["similar"],),
+        ),
+        Stage(
+            "load_similar",
+            step("load_similar", "Loading similar games", lambda: (
+                metrics.record(
+                    rows_out=target.load_similar(paths["similar"])
+                )
+            )),
+            inputs=(paths["similar"],),
+            resources=database,
+        ),
+        # the samples are written by enrich, but only when it fetched any
+        Stage(
+            "history",
+            step("history", "Appending player count history", lambda: (
+                metrics.record(
+                    rows_out=target.append_history(paths["samples"])
+                )
+            )),
+            after=tuple(stage.name for stage in enrich_and_load),
+            resources=database,
+        ),
+    ]
+    # refreshes known games' counts while extract downloads, a failed
+    #  extract or validate cancels the calls still queued
+    if args.prefetch:
+        stages.insert(1, Stage(
+            "prefetch",
+            step("prefetch", "Prefetching stale player counts",
+                 prefetch.run),
+            cancel=prefetch.cancel,
+        ))
+    return stages
+
+
+# runs the selected stages, independent ones at the same time
+def run_stages(args):
     total_start = time.perf_counter()
-# starts the extraction
-    print("▶︎ Extracting raw data from Kaggle…")
-    t0 = time.perf_counter()
-    extract_steam_data()
-    print(f"✔ Extraction completed in {time.perf_counter() - t0:.2f}s\n")
-# starts the transformation
-    print("▶︎ Cleaning & enriching data…")
-    t0 = time.perf_counter()
-    transform_steam_games(RAW_CSV)
-    print(f"✔ Transform completed in {time.perf_counter() - t0:.2f}s\n")
-# loads the cleaned and enriched data into pagila
-    print("▶︎ Loading enriched data into database…")
-    t0 = time.perf_counter()
-    load_data_to_postgres(ENRICHED_CSV)
-    print(f"✔ Load completed in {time.perf_counter() - t0:.2f}s\n")
+    # loads into pagila (or LOAD_TARGET), samples into their own database
+    if args.sample is not None:
+        target = SQLiteTarget(data_dir(args) / "steam.db", sample=True)
+    else:
+        target = get_load_target()
+    stages = build_stages(args, target)
+    selected = select_stages(
+        stages, only=args.only, start=args.start, stop=args.stop
+    )
+    print(f"→ Stages: {', '.join(s.name for s in selected)}\n")
+    # one stage at a time under --profile, cProfile traces one thread
+    run_pipeline(
+        stages, selected, max_workers=1 if args.profile else MAX_WORKERS
+    )
 # total Pipeline time
     elapsed = time.perf_counter() - total_start
     print(f"Total ETL pipeline time: {elapsed:.2f}s")
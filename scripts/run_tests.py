@@ -1,12 +1,20 @@
 # The following function was generated with the assistance of ChatGPT.
-from config import setup_env
+"""
+Usage: run_tests {unit,integration,component,all,lint,bench} [options]
+
+bench runs the benchmarks and exits non-zero if any of them regressed
+against tests/benchmarks/baseline.json, see `run_tests bench --help`.
+"""
 import os
 import sys
 import subprocess
+from pathlib import Path
 
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
+from utils.env_config import setup_env  # noqa: E402
+
 # Map commands → test folders and coverage targets
 TEST_CONFIG = {
     "unit": {
@@ -63,6 +71,14 @@ def run_linting():
     report_lint("SQL", sql)
 
 
+# the benchmark suite lives with the tests, so it runs from the repo root
+def run_benchmarks(args):
+    return subprocess.call(
+        [sys.executable, "-m", "tests.benchmarks.suite", *args],
+        cwd=PROJECT_ROOT,
+    )
+
+
 def get_cov_command(cmd):
     cfg = TEST_CONFIG[cmd]
     test_dir = cfg["dir"]
@@ -85,6 +101,9 @@ def main():
         run_linting()
         return
 
+    if cmd == "bench":
+        sys.exit(run_benchmarks(sys.argv[2:]))
+
     if cmd not in TEST_CONFIG:
         print(f"Unknown command: {cmd}")
         print(__doc__)
@@ -101,5 +120,4 @@ def main():
 
 
 if __name__ == "__main__":
-    from pathlib import Path
     main()
@@ -16,6 +16,7 @@ setup(
         "etl", "etl.*",
         "utils", "utils.*",
         "scripts", "scripts.*",
+        "dashboard", "dashboard.*",
        ]
     ),
     include_package_data=True,
@@ -23,7 +24,7 @@ setup(
     entry_points={
         "console_scripts": [
             "run_etl=scripts.run_etl:main",
-            "run_tests=tests.run_tests:main",
+            "run_tests=scripts.run_tests:main",
         ],
     },
     classifiers=[
@@ -31,5 +32,5 @@ setup(
         "License :: OSI Approved :: MIT License",
         "Operating System :: OS Independent",
     ],
-    python_requires=">=3.6",
+    python_requires=">=3.10",
 )
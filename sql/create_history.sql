@@ -0,0 +1,21 @@
+-- unlike kr_so_capstone these tables are never dropped, every run appends
+
+CREATE TABLE IF NOT EXISTS c12de.player_count_history (
+    appid        INTEGER     NOT NULL,
+    observed_at  TIMESTAMPTZ NOT NULL,
+    player_count INTEGER     NOT NULL
+) PARTITION BY RANGE (observed_at);
+
+CREATE INDEX IF NOT EXISTS player_count_history_observed_at_idx
+ON c12de.player_count_history USING brin (observed_at);
+
+CREATE TABLE IF NOT EXISTS c12de.player_count_rollup (
+    appid        INTEGER       NOT NULL,
+    grain        VARCHAR(5)    NOT NULL,
+    bucket_start TIMESTAMPTZ   NOT NULL,
+    sample_count INTEGER       NOT NULL,
+    sum_players  BIGINT        NOT NULL,
+    max_players  INTEGER       NOT NULL,
+    avg_players  NUMERIC(12,1) NOT NULL,
+    PRIMARY KEY (appid, grain, bucket_start)
+);
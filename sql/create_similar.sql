@@ -0,0 +1,11 @@
+-- top-K most similar games per game, rebuilt from scratch by every load
+-- the primary key serves the details view's single read per game
+DROP TABLE IF EXISTS c12de.kr_so_capstone_similar;
+
+CREATE TABLE c12de.kr_so_capstone_similar (
+    appid           INTEGER  NOT NULL,
+    neighbour_appid INTEGER  NOT NULL,
+    score           REAL     NOT NULL,
+    rank            SMALLINT NOT NULL,
+    PRIMARY KEY (appid, rank)
+);
@@ -23,5 +23,31 @@ CREATE TABLE c12de.kr_so_capstone (
     release_year      INTEGER,
     estimated_revenue NUMERIC(14,1),
     price_tier        VARCHAR(20),
-    positive_ratio    NUMERIC(5,1)
-);
\ No newline at end of file
+    positive_ratio    NUMERIC(5,1),
+    -- hash of the source row, see etl.transform.clean.hash_columns
+    row_hash          BIGINT,
+    genre_tags        TEXT[] GENERATED ALWAYS AS (
+        string_to_array(nullif(genres, ''), ',')
+    ) STORED,
+    category_tags     TEXT[] GENERATED ALWAYS AS (
+        string_to_array(nullif(categories, ''), ',')
+    ) STORED,
+    search_vector     TSVECTOR GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(name, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(developers, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(genres, '')), 'C') ||
+        setweight(to_tsvector('english', coalesce(about_the_game, '')), 'D')
+    ) STORED
+);
+
+CREATE INDEX kr_so_capstone_genre_tags_idx
+ON c12de.kr_so_capstone USING gin (genre_tags);
+
+CREATE INDEX kr_so_capstone_category_tags_idx
+ON c12de.kr_so_capstone USING gin (category_tags);
+
+CREATE INDEX kr_so_capstone_current_players_idx
+ON c12de.kr_so_capstone (current_players DESC NULLS LAST);
+
+CREATE INDEX kr_so_capstone_search_idx
+ON c12de.kr_so_capstone USING gin (search_vector);
@@ -0,0 +1,7 @@
+-- one row per published table, bumped in the same transaction as the
+-- data so the dashboard can tell cheaply whether anything changed
+CREATE TABLE IF NOT EXISTS c12de.dataset_version (
+    table_name VARCHAR(63) PRIMARY KEY,
+    version    BIGINT      NOT NULL,
+    loaded_at  TIMESTAMPTZ NOT NULL
+);
@@ -0,0 +1,22 @@
+-- SQLite version of sql/create_history.sql, no partitions or BRIN here
+-- so observed_at gets a plain index instead
+
+CREATE TABLE IF NOT EXISTS player_count_history (
+    appid        INTEGER NOT NULL,
+    observed_at  TEXT    NOT NULL,
+    player_count INTEGER NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS player_count_history_observed_at_idx
+ON player_count_history (observed_at);
+
+CREATE TABLE IF NOT EXISTS player_count_rollup (
+    appid        INTEGER       NOT NULL,
+    grain        VARCHAR(5)    NOT NULL,
+    bucket_start TEXT          NOT NULL,
+    sample_count INTEGER       NOT NULL,
+    sum_players  BIGINT        NOT NULL,
+    max_players  INTEGER       NOT NULL,
+    avg_players  NUMERIC(12,1) NOT NULL,
+    PRIMARY KEY (appid, grain, bucket_start)
+);
@@ -0,0 +1,11 @@
+-- SQLite version of sql/create_similar.sql
+
+DROP TABLE IF EXISTS kr_so_capstone_similar;
+
+CREATE TABLE kr_so_capstone_similar (
+    appid           INTEGER  NOT NULL,
+    neighbour_appid INTEGER  NOT NULL,
+    score           REAL     NOT NULL,
+    rank            SMALLINT NOT NULL,
+    PRIMARY KEY (appid, rank)
+);
@@ -0,0 +1,66 @@
+-- SQLite schema for the embedded load target, mirrors sql/create_tb.sql
+-- SQLite has no TEXT[] or GIN, so genres and categories also get
+-- normalised bridge tables indexed by tag, and full-text search is an
+-- FTS5 index over the table instead of a tsvector column
+
+DROP TABLE IF EXISTS kr_so_capstone_search;
+DROP TABLE IF EXISTS kr_so_capstone_genres;
+DROP TABLE IF EXISTS kr_so_capstone_categories;
+DROP TABLE IF EXISTS kr_so_capstone;
+
+CREATE TABLE kr_so_capstone (
+    appid             INTEGER       PRIMARY KEY,
+    name              TEXT          NOT NULL,
+    release_date      DATE,
+    price             NUMERIC(10,2),
+    dlc_count         INTEGER,
+    header_image      TEXT,
+    about_the_game    TEXT,
+    windows           BOOLEAN,
+    mac               BOOLEAN,
+    linux             BOOLEAN,
+    metacritic_score  INTEGER,
+    recommendations   INTEGER,
+    developers        TEXT,
+    categories        TEXT,
+    genres            TEXT,
+    positive          INTEGER,
+    negative          INTEGER,
+    estimated_owners  INTEGER,
+    current_players   INTEGER,
+    release_year      INTEGER,
+    estimated_revenue NUMERIC(14,1),
+    price_tier        VARCHAR(20),
+    positive_ratio    NUMERIC(5,1),
+    row_hash          BIGINT
+);
+
+-- SQLite already sorts NULLs last for DESC and rejects NULLS LAST here
+CREATE INDEX kr_so_capstone_current_players_idx
+ON kr_so_capstone (current_players DESC);
+
+CREATE TABLE kr_so_capstone_genres (
+    genre TEXT    NOT NULL,
+    appid INTEGER NOT NULL,
+    PRIMARY KEY (genre, appid)
+);
+
+CREATE INDEX kr_so_capstone_genres_appid_idx
+ON kr_so_capstone_genres (appid);
+
+CREATE TABLE kr_so_capstone_categories (
+    category TEXT    NOT NULL,
+    appid    INTEGER NOT NULL,
+    PRIMARY KEY (category, appid)
+);
+
+CREATE INDEX kr_so_capstone_categories_appid_idx
+ON kr_so_capstone_categories (appid);
+
+-- external content: the text stays in kr_so_capstone, the load rebuilds
+-- the index once all rows are in
+CREATE VIRTUAL TABLE kr_so_capstone_search USING fts5 (
+    name, developers, genres, about_the_game,
+    content = 'kr_so_capstone', content_rowid = 'appid',
+    tokenize = 'porter unicode61'
+);
@@ -0,0 +1,7 @@
+-- SQLite version of sql/create_version.sql
+
+CREATE TABLE IF NOT EXISTS dataset_version (
+    table_name VARCHAR(63) PRIMARY KEY,
+    version    BIGINT      NOT NULL,
+    loaded_at  TEXT        NOT NULL
+);
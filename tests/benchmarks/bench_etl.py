@@ -0,0 +1,173 @@
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import tempfile
+import time
+from pathlib import Path
+import pandas as pd
+
+from tests.benchmarks.synthetic import SCALES, write_games_csv
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+# generated inputs are kept here and reused across runs, per scale/seed
+BENCH_DIR = Path(os.getenv("BENCH_DIR", PROJECT_ROOT / ".bench"))
+# stages in pipeline order, each reads the previous one's output
+STAGES = ("clean", "enrich", "load")
+
+
+def run_clean(workdir: Path, raw_csv: Path):
+    from etl.transform.clean import load_and_clean_data
+
+    load_and_clean_data(raw_csv)
+
+
+def run_enrich(workdir: Path, raw_csv: Path):
+    import etl.transform.enrich as enrich
+
+    # no network: every uncached game gets a stubbed player count, so
+    #  this times the enrichment itself and not the Steam API
+    enrich.fetch_current_players = lambda appid: appid % 1000
+    df = pd.read_csv(
+        workdir / "data" / "steam_games_clean.csv",
+        parse_dates=["release_date"],
+    )
+    df = enrich.enrich_data(df)
+    df.to_csv(workdir / "data" / "steam_games_enriched.csv", index=False)
+
+
+def run_load(workdir: Path, raw_csv: Path):
+    from etl.load.targets import SQLiteTarget, get_load_target
+
+    name = os.getenv("BENCH_LOAD_TARGET", "sqlite")
+    target = (
+        SQLiteTarget(workdir / "steam.db") if name == "sqlite"
+        else get_load_target(name)
+    )
+    target.load(workdir / "data" / "steam_games_enriched.csv")
+
+
+STAGE_FUNCTIONS = {
+    "clean": run_clean,
+    "enrich": run_enrich,
+    "load": run_load,
+}
+
+
+# peak RSS of this process image in KB. Linux carries ru_maxrss over
+#  from the parent across fork and exec, VmHWM starts afresh at exec
+def peak_rss_kb() -> int:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+# runs in a fresh process, so the peak RSS is this stage's own
+def _measure(stage: str, workdir: str, raw_csv: str, results):
+    os.chdir(workdir)
+    start = time.perf_counter()
+    STAGE_FUNCTIONS[stage](Path(workdir), Path(raw_csv))
+    seconds = time.perf_counter() - start
+    results.put({
+        "seconds": seconds,
+        "peak_rss_mb": peak_rss_kb() / 1024,
+    })
+
+
+def measure_stage(stage: str, workdir: Path, raw_csv: Path) -> dict:
+    """
+    Wall time and peak RSS of one stage, run in a spawned
+    process so earlier stages' memory does not count towards its peak.
+    """
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    process = context.Process(
+        target=_measure, args=(stage, str(workdir), str(raw_csv), results)
+    )
+    process.start()
+    process.join()
+    if process.exitcode != 0:
+        raise RuntimeError(f"Stage {stage} failed (exit {process.exitcode})")
+    return results.get(timeout=5)
+
+
+def synthetic_input(rows: int, seed: int = 0) -> Path:
+    raw_csv = BENCH_DIR / f"games_{rows}_seed{seed}.csv"
+    if not raw_csv.exists():
+        write_games_csv(raw_csv, rows, seed)
+    return raw_csv
+
+
+def run_benchmarks(scales, stages=STAGES, seed: int = 0) -> list[dict]:
+    """
+    Run the pipeline over a synthetic catalogue of each scale, in a
+    throwaway working directory, and return one result per requested
+    stage. Earlier stages a requested one reads from run unrecorded.
+    """
+    results = []
+    last = max(STAGES.index(stage) for stage in stages)
+    for scale in scales:
+        rows = SCALES.get(str(scale).lower()) or int(scale)
+        raw_csv = synthetic_input(rows, seed)
+        with tempfile.TemporaryDirectory(dir=BENCH_DIR) as workdir:
+            (Path(workdir) / "data").mkdir()
+            for stage in STAGES[:last + 1]:
+                result = measure_stage(stage, Path(workdir), raw_csv)
+                if stage not in stages:
+                    continue
+                results.append({
+                    "stage": stage,
+                    "scale": str(scale),
+                    "rows": rows,
+                    "seconds": round(result["seconds"], 3),
+                    "peak_rss_mb": round(result["peak_rss_mb"], 1),
+                    "rows_per_sec": round(rows / result["seconds"]),
+                })
+                print(format_result(results[-1]))
+    return results
+
+
+def format_result(result: dict) -> str:
+    return (
+        f"{result['stage']:<8} {result['scale']:>5}  "
+        f"{result['seconds']:>9.2f}s  {result['peak_rss_mb']:>8.0f} MB  "
+        f"{result['rows_per_sec']:>10,} rows/s"
+    )
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="bench_etl",
+        description="Time the ETL stages on synthetic catalogues.",
+    )
+    parser.add_argument(
+        "scales", nargs="*", default=["100k"],
+        help=f"any of {tuple(SCALES)} or a row count",
+    )
+    parser.add_argument(
+        "--stages", nargs="+", choices=STAGES, default=list(STAGES)
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--json", type=Path, help="also write the results to this file"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    BENCH_DIR.mkdir(parents=True, exist_ok=True)
+    results = run_benchmarks(args.scales, args.stages, args.seed)
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2) + "\n")
+    return results
+
+
+if __name__ == "__main__":
+    main()
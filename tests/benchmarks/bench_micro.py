@@ -0,0 +1,88 @@
+import time
+import tracemalloc
+import pandas as pd
+
+from etl.transform import clean, enrich, incremental
+from tests.benchmarks.synthetic import generate_games
+
+# timed runs per function, the fastest one is reported
+REPEATS = 3
+
+
+def stage_inputs(rows: int, seed: int = 0) -> dict:
+    """
+    The frame each micro-benchmarked function receives in the pipeline,
+    built once from a synthetic catalogue of `rows` games.
+    """
+    raw = generate_games(rows, seed)
+    raw["release_date"] = pd.to_datetime(raw["release_date"], errors="coerce")
+    pruned = clean.drop_unnecessary_columns(raw)
+    numeric = clean.clean_numerical_columns(pruned.copy())
+    categorical = clean.clean_categorical_columns(numeric)
+    cleaned = clean.normalize_list_columns(categorical.copy())
+    dated = enrich.enrich_dates(cleaned)
+    priced = enrich.enrich_price(dated.copy())
+    return {
+        "clean.drop_unnecessary_columns": raw,
+        "clean.clean_numerical_columns": pruned,
+        "clean.clean_categorical_columns": numeric,
+        "clean.normalize_list_columns": categorical,
+        # without the row_hash column clean adds, so the hashing is timed
+        "incremental.row_hashes": pruned.drop(columns="row_hash"),
+        "enrich.enrich_dates": cleaned,
+        "enrich.enrich_price": dated,
+        "enrich.enrich_metrics": priced,
+    }
+
+
+FUNCTIONS = {
+    "clean.drop_unnecessary_columns": clean.drop_unnecessary_columns,
+    "clean.clean_numerical_columns": clean.clean_numerical_columns,
+    "clean.clean_categorical_columns": clean.clean_categorical_columns,
+    "clean.normalize_list_columns": clean.normalize_list_columns,
+    "incremental.row_hashes": incremental.row_hashes,
+    "enrich.enrich_dates": enrich.enrich_dates,
+    "enrich.enrich_price": enrich.enrich_price,
+    "enrich.enrich_metrics": enrich.enrich_metrics,
+}
+
+
+def measure_function(func, df: pd.DataFrame, repeats: int = REPEATS):
+    """
+    Best wall time of `repeats` calls, each on a fresh copy since some
+    steps modify their input, and the peak traced allocation of one
+    more call. Tracing slows the call down, so it is never timed.
+    """
+    best = float("inf")
+    for _ in range(repeats):
+        frame = df.copy()
+        start = time.perf_counter()
+        func(frame)
+        best = min(best, time.perf_counter() - start)
+    frame = df.copy()
+    tracemalloc.start()
+    try:
+        func(frame)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak / 2**20
+
+
+def run_micro_benchmarks(rows: int, seed: int = 0, names=None) -> list[dict]:
+    inputs = stage_inputs(rows, seed)
+    results = []
+    for name in names or FUNCTIONS:
+        seconds, peak_mb = measure_function(FUNCTIONS[name], inputs[name])
+        results.append({
+            "stage": name,
+            "scale": str(rows),
+            "rows": rows,
+            "seconds": round(seconds, 4),
+            "peak_alloc_mb": round(peak_mb, 1),
+            "rows_per_sec": round(rows / seconds),
+        })
+        print(
+            f"{name:<34} {seconds:>8.3f}s  {peak_mb:>6.0f} MB allocated"
+        )
+    return results
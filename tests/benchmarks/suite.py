@@ -0,0 +1,221 @@
+import argparse
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+from tests.benchmarks import bench_etl, bench_micro
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+# every run is recorded here under the commit it measured
+RESULTS_PATH = bench_etl.BENCH_DIR / "results.json"
+# allowed slowdown and memory growth over the baseline, as fractions
+TIME_TOLERANCE = 0.25
+MEMORY_TOLERANCE = 0.15
+# differences below these are noise, whatever the ratio
+MIN_SECONDS = 0.05
+MIN_MB = 5.0
+MICRO_ROWS = 100_000
+MACRO_SCALES = ("100k",)
+# size of the fixed workload timings are scaled by, see calibrate()
+CALIBRATION_ROWS = 1_000_000
+
+
+def current_commit() -> str:
+    """The checked-out commit, marked dirty if the tree has changes."""
+    def git(*args):
+        return subprocess.run(
+            ["git", *args], capture_output=True, text=True,
+            cwd=bench_etl.PROJECT_ROOT,
+        ).stdout.strip()
+
+    commit = git("rev-parse", "--short", "HEAD") or "unknown"
+    if git("status", "--porcelain", "--untracked-files=no"):
+        commit += "-dirty"
+    return commit
+
+
+def calibrate(rows: int = CALIBRATION_ROWS, repeats: int = 3) -> float:
+    """
+    Best time of a fixed pandas workload (hash, sort, group by) on this
+    machine. Timings are compared relative to it, so a baseline
+    recorded on one machine still gates runs on a faster or slower one.
+    """
+    rng = np.random.default_rng(0)
+    keys = rng.integers(0, rows // 10, rows)
+    df = pd.DataFrame({
+        "key": keys, "text": keys.astype(str), "value": rng.random(rows),
+    })
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        pd.util.hash_pandas_object(df, index=False)
+        df.sort_values("value").groupby("text")["value"].sum()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def result_key(result: dict) -> str:
+    return f"{result['kind']}:{result['stage']}:{result['scale']}"
+
+
+def run_suite(micro_rows=MICRO_ROWS, scales=MACRO_SCALES) -> list[dict]:
+    results = [
+        {"kind": "micro", **r}
+        for r in bench_micro.run_micro_benchmarks(micro_rows)
+    ]
+    if scales:
+        results += [
+            {"kind": "macro", **r}
+            for r in bench_etl.run_benchmarks(scales)
+        ]
+    return results
+
+
+def record_results(
+    results, commit: str, path: Path = RESULTS_PATH,
+    calibration: float | None = None,
+):
+    """Store the results under their commit, replacing an earlier run."""
+    path = Path(path)
+    history = json.loads(path.read_text()) if path.exists() else {}
+    history[commit] = {
+        "recorded_at": pd.Timestamp.now(tz="UTC").isoformat(),
+        "calibration_seconds": calibration,
+        "results": results,
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(history, indent=2) + "\n")
+
+
+def find_regressions(
+    results,
+    baseline,
+    time_tolerance: float = TIME_TOLERANCE,
+    memory_tolerance: float = MEMORY_TOLERANCE,
+    speed: float = 1.0,
+) -> list[str]:
+    """
+    One message per metric that got worse than the baseline by more
+    than its tolerance. Benchmarks missing from the baseline are new
+    and never count as regressions. `speed` is how much longer this
+    machine takes for the calibration workload than the baseline's
+    did, the baseline's timings are scaled by it before comparing.
+    """
+    expected = {result_key(r): r for r in baseline}
+    limits = {
+        "seconds": (time_tolerance, MIN_SECONDS),
+        "peak_rss_mb": (memory_tolerance, MIN_MB),
+        "peak_alloc_mb": (memory_tolerance, MIN_MB),
+    }
+    regressions = []
+    for result in results:
+        base = expected.get(result_key(result))
+        if base is None:
+            continue
+        for metric, (tolerance, slack) in limits.items():
+            if metric not in result or metric not in base:
+                continue
+            scaled = base[metric] * (speed if metric == "seconds" else 1)
+            allowed = max(scaled * (1 + tolerance), scaled + slack)
+            if result[metric] > allowed:
+                regressions.append(
+                    f"{result_key(result)} {metric}: {result[metric]} vs "
+                    f"baseline {round(scaled, 4)} (+{tolerance:.0%} "
+                    "allowed)"
+                )
+    return regressions
+
+
+def load_baseline(path: Path = BASELINE_PATH) -> dict:
+    if not Path(path).exists():
+        return {"results": []}
+    return json.loads(Path(path).read_text())
+
+
+def save_baseline(
+    results, commit: str, calibration: float, path: Path = BASELINE_PATH
+):
+    Path(path).write_text(json.dumps({
+        "commit": commit,
+        "calibration_seconds": round(calibration, 4),
+        "results": results,
+    }, indent=2) + "\n")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="run_tests bench",
+        description="Run the benchmarks and compare them to the baseline.",
+    )
+    parser.add_argument(
+        "scales", nargs="*", default=list(MACRO_SCALES),
+        help="scales for the pipeline benchmarks, e.g. 100k 1m",
+    )
+    parser.add_argument("--micro-rows", type=int, default=MICRO_ROWS)
+    parser.add_argument(
+        "--time-tolerance", type=float, default=TIME_TOLERANCE,
+        help="allowed slowdown as a fraction, default %(default)s",
+    )
+    parser.add_argument(
+        "--memory-tolerance", type=float, default=MEMORY_TOLERANCE,
+        help="allowed memory growth as a fraction, default %(default)s",
+    )
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument(
+        "--update-baseline", action="store_true",
+        help="save this run as the new baseline instead of comparing, "
+             "only from a tree without uncommitted changes",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    bench_etl.BENCH_DIR.mkdir(parents=True, exist_ok=True)
+    commit = current_commit()
+    # a baseline has to name the commit it measured
+    if args.update_baseline and commit.endswith("-dirty"):
+        print(
+            f"Not saving a baseline for {commit}, commit or stash the "
+            "changes first"
+        )
+        return 2
+    # timed before and after the suite, to follow a machine whose speed
+    #  drifts while the suite runs, e.g. a shared CI runner
+    before = calibrate()
+    results = run_suite(args.micro_rows, args.scales)
+    calibration = (before + calibrate()) / 2
+    record_results(results, commit, calibration=calibration)
+    print(f"Recorded {len(results)} results for {commit} in {RESULTS_PATH}")
+
+    if args.update_baseline:
+        save_baseline(results, commit, calibration, args.baseline)
+        print(f"Saved the baseline to {args.baseline}")
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    # baselines without a calibration compare absolute timings
+    speed = calibration / baseline.get("calibration_seconds", calibration)
+    print(
+        f"This machine takes {speed:.2f}x the baseline's time for the "
+        "calibration workload"
+    )
+    regressions = find_regressions(
+        baseline=baseline["results"], results=results,
+        time_tolerance=args.time_tolerance,
+        memory_tolerance=args.memory_tolerance, speed=speed,
+    )
+    for message in regressions:
+        print(f"REGRESSION {message}")
+    if regressions:
+        return 1
+    print("No regressions against the baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,259 @@
+import argparse
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+# named scales, the real catalogue is a little under 100k games
+SCALES = {"100k": 100_000, "1m": 1_000_000, "10m": 10_000_000}
+# rows generated and written at a time, bounds the generator's memory
+CHUNK_ROWS = 250_000
+# share of rows that repeat an earlier game's name, are playtests,
+#  have no name, are exact copies of an earlier row or have no date
+DUPLICATE_NAME_SHARE = 0.02
+PLAYTEST_SHARE = 0.01
+MISSING_NAME_SHARE = 0.002
+DUPLICATE_ROW_SHARE = 0.005
+MISSING_DATE_SHARE = 0.005
+# the raw file's columns, in its order, with a few the ETL ignores
+RAW_COLUMNS = [
+    "appid", "name", "release_date", "required_age", "price", "dlc_count",
+    "header_image", "about_the_game", "short_description", "windows",
+    "mac", "linux", "metacritic_score", "recommendations", "developers",
+    "publishers", "categories", "genres", "positive", "negative",
+    "estimated_owners", "peak_ccu", "supported_languages",
+]
+
+GENRES = [
+    "Indie", "Action", "Casual", "Adventure", "Simulation", "Strategy",
+    "RPG", "Early Access", "Free To Play", "Sports", "Racing",
+    "Massively Multiplayer", "Education", "Utilities", "Violent", "Gore",
+    "Design & Illustration", "Animation & Modeling", "Nudity",
+    "Sexual Content", "Software Training", "Audio Production",
+]
+CATEGORIES = [
+    "Single-player", "Steam Achievements", "Family Sharing",
+    "Steam Cloud", "Full controller support", "Multi-player",
+    "Partial Controller Support", "Steam Trading Cards", "PvP",
+    "Online PvP", "Co-op", "Steam Leaderboards", "Remote Play Together",
+    "Online Co-op", "Shared/Split Screen", "Includes level editor",
+    "Steam Workshop", "In-App Purchases", "Cross-Platform Multiplayer",
+    "Captions available", "Stats", "VR Support", "LAN PvP",
+    "Commentary available", "Valve Anti-Cheat enabled", "MMO",
+]
+LANGUAGES = [
+    "English", "German", "French", "Spanish - Spain", "Russian",
+    "Simplified Chinese", "Japanese", "Italian", "Portuguese - Brazil",
+    "Korean", "Polish", "Traditional Chinese", "Turkish",
+]
+# (low, high) owner ranges as Steam reports them, most games sell little
+OWNER_RANGES = [
+    (0, 0), (0, 20000), (20000, 50000), (50000, 100000),
+    (100000, 200000), (200000, 500000), (500000, 1000000),
+    (1000000, 2000000), (2000000, 5000000), (5000000, 10000000),
+    (10000000, 20000000), (20000000, 50000000), (50000000, 100000000),
+    (100000000, 200000000),
+]
+OWNER_WEIGHTS = [
+    0.03, 0.70, 0.10, 0.06, 0.04, 0.03, 0.015, 0.01,
+    0.007, 0.004, 0.002, 0.001, 0.0007, 0.0003,
+]
+ADJECTIVES = [
+    "Dark", "Lost", "Eternal", "Super", "Tiny", "Broken", "Hidden",
+    "Crimson", "Silent", "Cosmic", "Wild", "Last", "Iron", "Neon",
+    "Ancient", "Frozen", "Little", "Infinite", "Savage", "Golden",
+]
+NOUNS = [
+    "Kingdom", "Dungeon", "Frontier", "Legends", "Tactics", "Farm",
+    "Racer", "Odyssey", "Survivors", "Empire", "Quest", "Station",
+    "Islands", "Chronicles", "Arena", "Protocol", "Garden", "Horizon",
+    "Defense", "Hunter", "Simulator", "Realm", "Escape", "Heroes",
+]
+WORDS = (
+    "explore a vast world build craft survive fight alongside friends "
+    "uncover the secrets of an ancient civilisation in this hand drawn "
+    "adventure with challenging puzzles fast paced combat and a story "
+    "shaped by every choice you make across dozens of unique levels"
+).split()
+
+
+def zipf_weights(n: int, exponent: float = 1.1) -> np.ndarray:
+    weights = 1 / np.arange(1, n + 1) ** exponent
+    return weights / weights.sum()
+
+
+def list_literals(rng, vocab, n_combos, max_items, exponent=1.1):
+    """
+    A pool of n_combos "['a', 'b']" cells in the raw file's list format
+    with popularity weights, popular items show up in most of them.
+    """
+    weights = zipf_weights(len(vocab), exponent)
+    cells = []
+    for size in rng.integers(1, max_items + 1, n_combos):
+        items = rng.choice(len(vocab), size, replace=False, p=weights)
+        cells.append(str([vocab[i] for i in items]))
+    return np.array(cells, dtype=object), zipf_weights(n_combos, 0.9)
+
+
+def generate_games(
+    rows: int, seed: int = 0, first_appid: int = 10
+) -> pd.DataFrame:
+    """
+    Deterministic raw catalogue rows shaped like games_march2025_full.csv.
+
+    The same (rows, seed, first_appid) always gives the same frame. Tags,
+    developers, owners, prices and player counts are skewed the way the
+    real data is: a few popular values and a long tail. Some rows carry
+    the cases the cleaning has to handle, see the *_SHARE constants.
+    """
+    rng = np.random.default_rng([seed, first_appid])
+    genres, genre_p = list_literals(rng, GENRES, 400, 4)
+    categories, category_p = list_literals(rng, CATEGORIES, 800, 8, 0.8)
+    languages, language_p = list_literals(rng, LANGUAGES, 60, 6, 1.5)
+    studios = np.array(
+        [f"{a} {n} Studio" for a in ADJECTIVES for n in NOUNS], dtype=object
+    )
+    developers = np.array([str([s]) for s in studios], dtype=object)
+    developer_p = zipf_weights(len(developers), 0.8)
+    descriptions = np.array([
+        " ".join(rng.choice(WORDS, rng.integers(5, 200)))
+        for _ in range(500)
+    ], dtype=object)
+
+    # sparse ascending ids, like Steam's
+    appids = first_appid + np.cumsum(rng.integers(1, 20, rows))
+    names = pd.Series(
+        rng.choice(ADJECTIVES, rows).astype(object) + " "
+        + rng.choice(NOUNS, rows).astype(object) + " "
+        + pd.Series(appids).astype(str).to_numpy(dtype=object),
+        dtype=object,
+    )
+    # re-releases, demos and ports under an earlier game's name
+    repeats = rng.random(rows) < DUPLICATE_NAME_SHARE
+    names[repeats] = names.to_numpy()[
+        (rng.random(repeats.sum()) * np.flatnonzero(repeats)).astype(int)
+    ]
+    playtests = rng.random(rows) < PLAYTEST_SHARE
+    names[playtests] = names[playtests] + " Playtest"
+    names[rng.random(rows) < MISSING_NAME_SHARE] = None
+
+    # most games are recent, releases roughly double every few years
+    years = 2025 - np.minimum(rng.geometric(0.18, rows) - 1, 28)
+    days = rng.integers(0, 365, rows)
+    dates = pd.Series(np.datetime_as_string(
+        (years - 1970).astype("datetime64[Y]") + days.astype("timedelta64[D]")
+    ), dtype=object)
+    dates[rng.random(rows) < MISSING_DATE_SHARE] = None
+
+    free = rng.random(rows) < 0.2
+    prices = np.where(
+        free, 0.0,
+        np.round(np.clip(rng.lognormal(2.0, 0.8, rows), 0.49, 99.99)) - 0.01,
+    ).round(2)
+    prices[prices < 0] = 0.49
+
+    owners = rng.choice(len(OWNER_RANGES), rows, p=OWNER_WEIGHTS)
+    owner_ranges = np.array(
+        [f"{low} - {high}" for low, high in OWNER_RANGES], dtype=object
+    )
+    # reviews and players follow the owner bucket, with a heavy tail
+    reach = np.array([(low + high) / 2 for low, high in OWNER_RANGES])
+    audience = reach[owners] * rng.lognormal(0, 1, rows)
+    positive = (audience * rng.uniform(0.001, 0.05, rows)).astype(np.int64)
+    negative = (positive * rng.beta(2, 8, rows)).astype(np.int64)
+    online = rng.random(rows) < 0.15
+    peak_ccu = np.where(
+        online, audience * rng.uniform(0, 0.01, rows), 0
+    ).astype(np.int64)
+    metacritic = np.where(
+        rng.random(rows) < 0.05, rng.integers(20, 98, rows), 0
+    )
+
+    df = pd.DataFrame({
+        "appid": appids,
+        "name": names,
+        "release_date": dates,
+        "required_age": np.where(rng.random(rows) < 0.03, 18, 0),
+        "price": prices,
+        "dlc_count": rng.geometric(0.7, rows) - 1,
+        "header_image": [
+            f"https://cdn.akamai.steamstatic.com/steam/apps/{a}/header.jpg"
+            for a in appids
+        ],
+        "about_the_game": descriptions[rng.integers(0, 500, rows)],
+        "short_description": descriptions[rng.integers(0, 500, rows)],
+        "windows": rng.random(rows) < 0.99,
+        "mac": rng.random(rows) < 0.2,
+        "linux": rng.random(rows) < 0.15,
+        "metacritic_score": metacritic,
+        "recommendations": (positive * rng.uniform(0, 0.5, rows))
+        .astype(np.int64),
+        "developers": developers[
+            rng.choice(len(developers), rows, p=developer_p)
+        ],
+        "publishers": developers[
+            rng.choice(len(developers), rows, p=developer_p)
+        ],
+        "categories": categories[
+            rng.choice(len(categories), rows, p=category_p)
+        ],
+        "genres": genres[rng.choice(len(genres), rows, p=genre_p)],
+        "positive": positive,
+        "negative": negative,
+        "estimated_owners": owner_ranges[owners],
+        "peak_ccu": peak_ccu,
+        "supported_languages": languages[
+            rng.choice(len(languages), rows, p=language_p)
+        ],
+    }, columns=RAW_COLUMNS)
+    # rows the source lists twice, copied over a later row
+    take = np.arange(rows)
+    copies = np.flatnonzero(rng.random(rows) < DUPLICATE_ROW_SHARE)
+    take[copies] = (rng.random(len(copies)) * copies).astype(int)
+    return df.iloc[take].reset_index(drop=True)
+
+
+def write_games_csv(
+    path: Path, rows: int, seed: int = 0, chunk_rows: int = CHUNK_ROWS
+) -> Path:
+    """
+    Write `rows` synthetic games to a CSV, chunk_rows at a time so even
+    10M rows never have to fit in memory at once.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    first_appid = 10
+    with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+        for start in range(0, rows, chunk_rows):
+            chunk = generate_games(
+                min(chunk_rows, rows - start), seed, first_appid
+            )
+            chunk.to_csv(f, header=start == 0, index=False)
+            first_appid = int(chunk["appid"].max())
+    tmp_path.replace(path)
+    print(f"Generated {rows} synthetic games in '{path.name}'")
+    return path
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="synthetic",
+        description="Generate a synthetic games_march2025_full.csv.",
+    )
+    parser.add_argument("scale", help=f"one of {tuple(SCALES)} or a count")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--out", type=Path,
+        default=Path("data") / "games_march2025_full.csv",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    rows = SCALES.get(args.scale.lower()) or int(args.scale)
+    write_games_csv(args.out, rows, args.seed)
+
+
+if __name__ == "__main__":
+    main()
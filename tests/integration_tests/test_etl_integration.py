@@ -1,10 +1,11 @@
 import pandas as pd
 import pytest
-from pathlib import Path
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
 
+import etl.transform.enrich as enrich
 from etl.transform.transform import transform_steam_games
-import etl.load.load as load_mod
+from etl.load.queries import filter_games_by_tags
+from etl.load.targets import SQLiteTarget
 
 
 @pytest.fixture
@@ -42,60 +43,22 @@ def tmp_data_dir(tmp_path_factory):
 
 
 @pytest.fixture
-def sqlite_engine():
+def sqlite_target(tmp_path, monkeypatch):
     """
-    Create an in-memory SQLite engine and monkey-patch load_data_to_postgres
-    so it writes into SQLite instead of Postgres.
+    Embedded SQLite load target writing to a temporary database file.
+    The player cache and samples are redirected to the temp folder and
+    the Steam API is stubbed so the run is hermetic.
     """
-    engine = create_engine("sqlite:///:memory:")
+    monkeypatch.setattr(enrich, "CACHE_PATH", tmp_path / "cache.csv")
+    monkeypatch.setattr(enrich, "SAMPLES_PATH", tmp_path / "samples.csv")
+    monkeypatch.setattr(enrich, "fetch_current_players", lambda aid: 7)
+    return SQLiteTarget(tmp_path / "steam.db")
 
-    def load_sqlite(csv_path: Path):
-        # 1) Read enriched data
-        df = pd.read_csv(csv_path)
 
-        # 2) Create table schema
-        with engine.begin() as conn:
-            conn.execute(text("""
-                CREATE TABLE IF NOT EXISTS kr_so_capstone (
-                    appid INTEGER PRIMARY KEY,
-                    name TEXT,
-                    release_date DATE,
-                    price TEXT,
-                    dlc_count INTEGER,
-                    header_image TEXT,
-                    about_the_game TEXT,
-                    windows BOOLEAN,
-                    mac BOOLEAN,
-                    linux BOOLEAN,
-                    metacritic_score INTEGER,
-                    recommendations INTEGER,
-                    developers TEXT,
-                    categories TEXT,
-                    genres TEXT,
-                    positive INTEGER,
-                    negative INTEGER,
-                    estimated_owners INTEGER,
-                    current_players INTEGER,
-                    release_year INTEGER,
-                    estimated_revenue REAL,
-                    price_tier TEXT,
-                    positive_ratio REAL
-                )
-            """))
-
-        # 3) Bulk insert via pandas
-        df.to_sql("kr_so_capstone", engine, if_exists="replace", index=False)
-
-    # Override the real loader
-    load_mod.load_data_to_postgres = load_sqlite
-
-    return engine
-
-
-def test_full_pipeline(tmp_data_dir, sqlite_engine):
+def test_full_pipeline(tmp_data_dir, sqlite_target):
     """
     Run the full ETL: extract (skipped, we already have CSV),
-    transform → enriched CSV, then load into SQLite.
+    transform → enriched CSV, then load into the embedded target.
     Finally verify table contents.
     """
     data_dir = tmp_data_dir
@@ -110,10 +73,15 @@ def test_full_pipeline(tmp_data_dir, sqlite_engine):
     assert "positive_ratio" in df_enriched.columns
 
     # Load into our SQLite
-    load_mod.load_data_to_postgres(enriched_csv)
+    sqlite_target.load(enriched_csv)
+    # fetched counts are sampled next to the other artifacts and land
+    #  in the history rollups
+    samples_csv = data_dir / "steam_players_samples.csv"
+    assert sqlite_target.append_history(samples_csv) == 2
 
     # Verify via SQLAlchemy
-    with sqlite_engine.connect() as conn:
+    engine = sqlite_target.engine()
+    with engine.connect() as conn:
         # row count
         count = conn.execute(text("SELECT COUNT(*) FROM kr_so_capstone")).scalar()
         assert count == 2
@@ -125,3 +93,16 @@ def test_full_pipeline(tmp_data_dir, sqlite_engine):
         assert row["name"] == "Game A"
         # positive_ratio = 10/(10+2)*100 ≈ 83.3
         assert pytest.approx(row["positive_ratio"], rel=1e-2) == 10 / (10 + 2) * 100
+
+        # the embedded database runs in WAL mode
+        mode = conn.exec_driver_sql("PRAGMA journal_mode").scalar()
+        assert mode == "wal"
+
+        rollups = conn.execute(
+            text("SELECT COUNT(*) FROM player_count_rollup")
+        ).scalar()
+        assert rollups == 2 * 2  # two games, hour and day grains
+
+    # genre filters go through the bridge tables
+    rpg = filter_games_by_tags(engine, genres=["RPG"])
+    assert rpg["appid"].tolist() == [1]
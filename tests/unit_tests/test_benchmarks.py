@@ -0,0 +1,96 @@
+import json
+
+import pandas as pd
+
+from etl.transform.clean import load_and_clean_data
+from tests.benchmarks import bench_etl, suite
+from tests.benchmarks.synthetic import (
+    RAW_COLUMNS,
+    generate_games,
+    write_games_csv,
+)
+
+
+def test_generate_games_is_deterministic():
+    first = generate_games(2000, seed=3)
+    assert first.equals(generate_games(2000, seed=3))
+    assert not first.equals(generate_games(2000, seed=4))
+    assert first.columns.tolist() == RAW_COLUMNS
+
+
+def test_generated_rows_exercise_the_cleaning(tmp_path, monkeypatch):
+    raw_csv = write_games_csv(tmp_path / "raw.csv", 5000, chunk_rows=2000)
+    raw = pd.read_csv(raw_csv)
+    assert len(raw) == 5000
+    assert raw["genres"].str.startswith("['").all()
+    assert raw["name"].str.contains("Playtest", na=False).any()
+    assert raw.duplicated().any()
+
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "data").mkdir()
+    clean = load_and_clean_data(raw_csv)
+    assert 0 < len(clean) < len(raw)
+    assert clean["name"].is_unique
+    assert not clean["name"].str.contains("Playtest").any()
+    assert clean["estimated_owners"].notna().all()
+
+
+def test_run_benchmarks_reports_each_stage(tmp_path, monkeypatch):
+    monkeypatch.setattr(bench_etl, "BENCH_DIR", tmp_path)
+    results = bench_etl.run_benchmarks([500], stages=("enrich",))
+    # clean runs first, but only the requested stage is reported
+    assert [r["stage"] for r in results] == ["enrich"]
+    assert results[0]["rows"] == 500
+    assert results[0]["seconds"] > 0
+    assert results[0]["peak_rss_mb"] > 0
+
+
+def test_find_regressions_applies_tolerances():
+    baseline = [
+        {"kind": "macro", "stage": "clean", "scale": "100k",
+         "seconds": 10.0, "peak_rss_mb": 200.0},
+        {"kind": "micro", "stage": "enrich.enrich_price", "scale": "100000",
+         "seconds": 0.01, "peak_alloc_mb": 10.0},
+    ]
+    results = [
+        # 20% slower and 10% more memory are within the tolerances
+        {"kind": "macro", "stage": "clean", "scale": "100k",
+         "seconds": 12.0, "peak_rss_mb": 220.0},
+        # 3x slower, but by less than MIN_SECONDS, so noise
+        {"kind": "micro", "stage": "enrich.enrich_price", "scale": "100000",
+         "seconds": 0.03, "peak_alloc_mb": 10.0},
+        # not in the baseline yet
+        {"kind": "macro", "stage": "load", "scale": "100k",
+         "seconds": 99.0, "peak_rss_mb": 999.0},
+    ]
+    assert suite.find_regressions(results, baseline) == []
+
+    results[0]["seconds"] = 13.0
+    results[0]["peak_rss_mb"] = 240.0
+    regressions = suite.find_regressions(results, baseline)
+    assert len(regressions) == 2
+    assert regressions[0].startswith("macro:clean:100k seconds")
+
+
+def test_find_regressions_scales_timings_by_machine_speed():
+    baseline = [{"kind": "macro", "stage": "clean", "scale": "100k",
+                 "seconds": 10.0, "peak_rss_mb": 200.0}]
+    results = [{"kind": "macro", "stage": "clean", "scale": "100k",
+                "seconds": 18.0, "peak_rss_mb": 200.0}]
+    # a machine twice as slow on the calibration workload
+    assert suite.find_regressions(results, baseline, speed=2.0) == []
+    assert len(suite.find_regressions(results, baseline)) == 1
+    # and memory does not scale with speed
+    results[0]["peak_rss_mb"] = 300.0
+    regressions = suite.find_regressions(results, baseline, speed=2.0)
+    assert [r.split()[1] for r in regressions] == ["peak_rss_mb:"]
+
+
+def test_record_results_keys_runs_by_commit(tmp_path):
+    path = tmp_path / "results.json"
+    suite.record_results([{"stage": "clean"}], "abc123", path)
+    suite.record_results([{"stage": "load"}], "def456", path)
+    suite.record_results([{"stage": "enrich"}], "abc123", path)
+    history = json.loads(path.read_text())
+    assert list(history) == ["abc123", "def456"]
+    assert history["abc123"]["results"] == [{"stage": "enrich"}]
@@ -27,26 +27,27 @@ def test_owner_to_numeric_invalid():
 # drop_unnecessary_columns
 def test_drop_unnecessary_columns():
     data = {
-        'appid': [1, 2, 2],
-        'name': ["A", "B", "B"],
-        'release_date': ["2020-01-01", "2021-02-02", "2021-02-02"],
-        'price': [0, 5, 5],
-        'dlc_count': [0, 1, 1],
-        'header_image': ["u1", "u2", "u2"],
-        'about_the_game': ["d1", "d2", "d2"],
-        'windows': [True, False, False],
-        'mac': [False, True, True],
-        'linux': [False, False, False],
-        'metacritic_score': [0, 80, 80],
-        'recommendations': [10, 20, 20],
-        'developers': ["X", "Y", "Y"],
-        'categories': ["['C1']", "['C2']", "['C2']"],
-        'genres': ["['G1']", "['G2']", "['G2']"],
-        'positive': [5, 10, 10],
-        'negative': [1, 2, 2],
-        'estimated_owners': ["0-10", "100-200", "100-200"],
-        'peak_ccu': [100, 200, 200],
-        'extra': ['x', 'y', 'y']
+        'appid': [1, 2, 2, 3],
+        'name': ["A", "B", "B", "C"],
+        'release_date': ["2020-01-01", "2021-02-02", "2021-02-02",
+                         "2022-03-03"],
+        'price': [0, 5, 5, 9],
+        'dlc_count': [0, 1, 1, 0],
+        'header_image': ["u1", "u2", "u2", None],
+        'about_the_game': ["d1", "d2", "d2", "d3"],
+        'windows': [True, False, False, True],
+        'mac': [False, True, True, False],
+        'linux': [False, False, False, True],
+        'metacritic_score': [0, 80, 80, 70],
+        'recommendations': [10, 20, 20, 30],
+        'developers': ["X", "Y", "Y", "Z"],
+        'categories': ["['C1']", "['C2']", "['C2']", "['C3']"],
+        'genres': ["['G1']", "['G2']", "['G2']", "['G3']"],
+        'positive': [5, 10, 10, 15],
+        'negative': [1, 2, 2, 3],
+        'estimated_owners': ["0-10", "100-200", "100-200", "0-10"],
+        'peak_ccu': [100, 200, 200, 300],
+        'extra': ['x', 'y', 'y', 'z']
     }
     df = pd.DataFrame(data)
     out = drop_unnecessary_columns(df)
@@ -55,11 +56,19 @@ def test_drop_unnecessary_columns():
         'appid', 'name', 'release_date', 'price', 'dlc_count', 'header_image',
         'about_the_game', 'windows', 'mac', 'linux', 'metacritic_score',
         'recommendations', 'developers', 'categories', 'genres', 'positive',
-        'negative', 'estimated_owners', 'current_players'
+        'negative', 'estimated_owners', 'current_players', 'row_hash'
     }
     assert set(out.columns) == expected_cols
     # duplicates by 'name' dropped
-    assert out['name'].tolist() == ["A", "B"]
+    assert out['name'].tolist() == ["A", "B", "C"]
+    # the same values pandas hashes the pruned row to, as signed int64,
+    #  without the player counts that churn between snapshots, including
+    #  the game without a header image
+    pruned = df.drop(columns=['extra', 'peak_ccu']).iloc[[0, 1, 3]]
+    expected = pd.util.hash_pandas_object(pruned, index=False)
+    assert out['row_hash'].dtype == 'int64'
+    assert out['row_hash'].tolist() == \
+        expected.to_numpy().view('int64').tolist()
 
 
 # clean_numerical_columns
@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboard.cube import Cube
+from dashboard.queries import Filters
+
+
+@pytest.fixture
+def games():
+    return pd.DataFrame({
+        "appid": [1, 2, 3, 4, 5, 6],
+        "name": list("ABCDEF"),
+        "current_players": [100, 50, 10, 75, np.nan, 60],
+        "genres": ["Action,RPG", "RPG", "Indie", "Action RPG", "RPG", "RPG"],
+        "categories": ["Co-op", "", "Co-op", "", "", ""],
+        "release_year": [2020, 2021, 2021, np.nan, 2021, 2021],
+        "price_tier": ["Free", "Indie", "Premium", "Indie", "Indie", "Indie"],
+    })
+
+
+def test_rows_with_the_same_dimensions_share_a_cell(games):
+    cube = Cube(games)
+    # B, E and F are (2021, Indie, RPG, "")
+    assert len(cube.cells) == 4
+    cell = cube.cells[cube.cells["games"] == 3].iloc[0]
+    assert cell["sum_players"] == 110
+
+
+def test_release_counts_match_a_row_scan(games):
+    cube = Cube(games)
+    counts = cube.release_counts(Filters(genres=("RPG",)))
+    assert counts.to_dict() == {2020: 1, 2021: 3}
+
+
+def test_top_rows_merge_cells_and_respect_top_k(games):
+    cube = Cube(games, top_k=2)
+    rows = cube.top_rows_for(Filters(), 2)
+    assert games.loc[rows, "appid"].tolist() == [1, 4]
+    # E (no player count) never reaches the gallery
+    rpg = cube.top_rows_for(Filters(genres=("RPG",)), 2)
+    assert games.loc[rpg, "appid"].tolist() == [1, 6]
+    with pytest.raises(ValueError):
+        cube.top_rows_for(Filters(), 3)
@@ -0,0 +1,74 @@
+import numpy as np
+
+from dashboard.queries import (
+    Filters,
+    game_details_query,
+    release_counts_query,
+    search_query,
+    top_games_query,
+    where_clause,
+)
+
+
+def test_filters_from_selection_normalises_types():
+    filters = Filters.from_selection(
+        ["RPG"], [], [np.int64(2021)], ["Indie"], "all"
+    )
+    assert filters == Filters(("RPG",), (), (2021,), ("Indie",), "all")
+    assert isinstance(filters.years[0], int)
+    # hashable, so it can key st.cache_data
+    hash(filters)
+
+
+def test_where_clause_empty_without_selection():
+    assert where_clause(Filters()) == ("", {})
+
+
+def test_where_clause_postgres_parameterizes_everything():
+    filters = Filters(("RPG", "Action"), (), (2020, 2021), ("Free",), "all")
+    sql, params = where_clause(filters)
+    assert sql == (
+        " WHERE genre_tags @> CAST(:genres AS TEXT[])"
+        " AND release_year IN (:release_year_0, :release_year_1)"
+        " AND price_tier IN (:price_tier_0)"
+    )
+    assert params == {
+        "genres": ["RPG", "Action"],
+        "release_year_0": 2020,
+        "release_year_1": 2021,
+        "price_tier_0": "Free",
+    }
+
+
+def test_where_clause_sqlite_uses_bridge_tables():
+    sql, params = where_clause(Filters(categories=("Co-op",)), "sqlite")
+    assert "kr_so_capstone_categories" in sql
+    assert params == {"categories_0": "Co-op"}
+
+
+def test_top_games_query_pushes_order_and_limit():
+    sql, params = top_games_query(Filters(tiers=("Indie",)), 10)
+    assert "SELECT appid, name, header_image, current_players" in sql.text
+    assert "about_the_game" not in sql.text
+    assert sql.text.endswith(
+        "ORDER BY current_players DESC NULLS LAST LIMIT :top_n"
+    )
+    assert params["top_n"] == 10
+
+
+def test_release_counts_and_details_queries():
+    sql, _ = release_counts_query(Filters())
+    assert "GROUP BY release_year" in sql.text
+    sql, params = game_details_query(np.int64(7))
+    assert sql.text.endswith("WHERE appid = :appid")
+    assert params == {"appid": 7}
+
+
+def test_search_query_pages_and_dialects():
+    sql, params = search_query("half-life 2", page=3, page_size=10)
+    assert "websearch_to_tsquery" in sql.text
+    assert params == {"query": "half-life 2", "limit": 10, "offset": 20}
+
+    sql, params = search_query("half-life 2", dialect="sqlite")
+    assert "MATCH :query" in sql.text
+    assert params["query"] == '"half" "life" "2"'
@@ -0,0 +1,95 @@
+import pytest
+from sqlalchemy.pool import NullPool
+
+import utils.db as db
+from utils.db_config import (
+    DatabaseConfigError,
+    load_db_config,
+    load_pool_config,
+)
+
+ENV = {
+    "DB_NAME": "steam",
+    "DB_USER": "etl",
+    "DB_PASSWORD": "p@ss:word",
+    "DB_HOST": "localhost",
+}
+
+
+@pytest.fixture(autouse=True)
+def fresh_engines():
+    db.dispose_engines()
+    yield
+    db.dispose_engines()
+
+
+@pytest.fixture
+def captured(monkeypatch):
+    """Record the arguments every create_engine() call receives."""
+    calls = []
+    real_create = db.create_engine
+
+    def fake_create(url, **kwargs):
+        calls.append({"url": url, **kwargs})
+        return real_create(url, **kwargs)
+
+    monkeypatch.setattr(db, "create_engine", fake_create)
+    return calls
+
+
+# load_db_config / load_pool_config
+def test_load_db_config_defaults():
+    cfg = load_db_config({"DB_NAME": "x", "DB_USER": "u", "DB_HOST": "h"})
+    assert cfg["password"] == ""
+    assert cfg["port"] == "5432"
+    assert cfg["schema"] == "c12de"
+
+
+def test_load_db_config_missing_var():
+    with pytest.raises(DatabaseConfigError):
+        load_db_config({"DB_USER": "u", "DB_HOST": "h"})
+
+
+def test_load_pool_config_reads_and_validates():
+    pool = load_pool_config({"DB_POOL_SIZE": "2", "DB_PGBOUNCER": "true"})
+    assert pool["pool_size"] == 2
+    assert pool["pgbouncer"] is True
+    with pytest.raises(DatabaseConfigError):
+        load_pool_config({"DB_POOL_SIZE": "many"})
+
+
+# get_engine
+def test_get_engine_is_shared_per_config(captured):
+    first = db.get_engine("dash", source=ENV)
+    assert db.get_engine("dash", source=ENV) is first
+    assert db.get_engine("etl", source=ENV) is not first
+    assert len(captured) == 2
+
+
+def test_get_engine_pool_and_session_settings(captured):
+    engine = db.get_engine("dash", source={**ENV, "DB_POOL_SIZE": "3"})
+    kwargs = captured[0]
+    assert kwargs["pool_size"] == 3
+    assert kwargs["pool_pre_ping"] is True
+    assert kwargs["connect_args"]["application_name"] == "dash"
+    options = kwargs["connect_args"]["options"]
+    assert "-csearch_path=c12de" in options
+    assert "-cstatement_timeout=30000" in options
+    # the password is escaped by URL.create, not mangled
+    assert engine.url.password == "p@ss:word"
+
+
+def test_get_engine_statement_timeout_override(captured):
+    db.get_engine("etl", source=ENV, statement_timeout_ms=0)
+    assert "statement_timeout" not in captured[0]["connect_args"]["options"]
+
+
+def test_get_engine_pgbouncer_mode(captured):
+    engine = db.get_engine(source={**ENV, "DB_PGBOUNCER": "1"})
+    assert isinstance(engine.pool, NullPool)
+    assert "options" not in captured[0]["connect_args"]
+
+
+def test_get_engine_url_override():
+    engine = db.get_engine(url="sqlite://")
+    assert engine.dialect.name == "sqlite"
@@ -17,6 +17,9 @@ def temp_cache_dir(tmp_path, monkeypatch):
     """
     fake_cache = tmp_path / "steam_players_cache.csv"
     monkeypatch.setattr(enrich, "CACHE_PATH", fake_cache)
+    monkeypatch.setattr(
+        enrich, "SAMPLES_PATH", tmp_path / "steam_players_samples.csv"
+    )
     return tmp_path
 
 
@@ -93,13 +96,19 @@ def test_update_current_players_with_cache_and_api(tmp_path, monkeypatch):
     new_cache = pd.read_csv(cache_path)
     assert set(new_cache["appid"]) == {1, 2}
 
+    # Only the freshly fetched count is recorded as a history sample
+    samples = pd.read_csv(enrich.SAMPLES_PATH)
+    assert samples["appid"].tolist() == [2]
+    assert samples["player_count"].tolist() == [222]
+    assert samples["observed_at"].notna().all()
+
 
 def test_enrich_data_pipeline(monkeypatch):
     # Stub out update_current_players to avoid I/O
     monkeypatch.setattr(
         enrich, 
         "update_current_players", 
-        lambda df: df.assign(current_players=5)
+        lambda df, *paths: df.assign(current_players=5)
     )
 
     # Raw DataFrame with all needed columns
@@ -119,3 +128,43 @@ def test_enrich_data_pipeline(monkeypatch):
     assert "estimated_revenue" in out.columns
     assert out.loc[0, "current_players"] == 5
     assert "positive_ratio" in out.columns
+
+
+def test_enrich_batches_yield_cached_rows_first(monkeypatch):
+    enrich.CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    pd.DataFrame({"appid": [3], "current_players": [33]}).to_csv(
+        enrich.CACHE_PATH, index=False
+    )
+    monkeypatch.setattr(enrich, "fetch_current_players", lambda aid: 100)
+    df = pd.DataFrame({
+        "appid": [1, 2, 3],
+        "release_date": pd.to_datetime(["2022-01-01"] * 3),
+        "peak_ccu": [0, 0, 0],
+        "price": ["10"] * 3,
+        "estimated_owners": [10] * 3,
+        "positive": [7] * 3,
+        "negative": [3] * 3,
+    })
+
+    batches = list(enrich.enrich_batches(df, batch_rows=1))
+    assert [b["appid"].tolist() for b in batches][0] == [3]
+    out = pd.concat(batches).set_index("appid")
+    assert out["current_players"].to_dict() == {1: 100, 2: 100, 3: 33}
+    assert "positive_ratio" in out.columns
+
+    # the fetched counts are cached and sampled once all are in
+    assert set(pd.read_csv(enrich.CACHE_PATH)["appid"]) == {1, 2, 3}
+    assert sorted(pd.read_csv(enrich.SAMPLES_PATH)["appid"]) == [1, 2]
+
+
+def test_player_files_follow_the_given_paths(tmp_path, monkeypatch):
+    # e.g. a sampled run keeps them in data/sample/
+    cache, samples = tmp_path / "s" / "cache.csv", tmp_path / "s" / "samples.csv"
+    monkeypatch.setattr(enrich, "fetch_current_players", lambda aid: 100)
+    df = pd.DataFrame({"appid": [1, 2], "current_players": [0, 0]})
+    enrich.update_current_players(df, cache, samples)
+
+    assert sorted(pd.read_csv(cache)["appid"]) == [1, 2]
+    assert sorted(pd.read_csv(samples)["appid"]) == [1, 2]
+    assert not enrich.CACHE_PATH.exists()
+    assert not enrich.SAMPLES_PATH.exists()
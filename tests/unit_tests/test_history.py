@@ -0,0 +1,81 @@
+import pandas as pd
+import pytest
+from unittest.mock import MagicMock
+
+import etl.load.history as history
+
+
+@pytest.fixture
+def fake_engine(monkeypatch):
+    """
+    Fake Engine whose .begin() connection and raw cursor record
+    every statement, patched into the history module.
+    """
+    fake_conn = MagicMock()
+    fake_begin = MagicMock()
+    fake_begin.__enter__.return_value = fake_conn
+    fake_begin.__exit__.return_value = False
+
+    fake_cursor = MagicMock()
+    fake_raw = MagicMock()
+    fake_raw.cursor.return_value = fake_cursor
+
+    engine = MagicMock()
+    engine.begin.return_value = fake_begin
+    engine.raw_connection.return_value = fake_raw
+    monkeypatch.setattr(history, "get_engine", lambda: engine)
+    return {"conn": fake_conn, "cursor": fake_cursor, "raw": fake_raw}
+
+
+def test_partition_ddl_covers_one_month():
+    ddl = history.partition_ddl(pd.Timestamp("2025-12-01"))
+    assert "player_count_history_y2025m12" in ddl
+    assert "FROM ('2025-12-01') TO ('2026-01-01')" in ddl
+
+
+def test_sample_months_are_unique_and_sorted():
+    samples = pd.DataFrame({
+        "observed_at": [
+            "2025-03-31T23:00:00+00:00",
+            "2025-02-10T10:00:00+00:00",
+            "2025-03-01T00:00:00+00:00",
+        ]
+    })
+    months = history.sample_months(samples)
+    assert months == [pd.Timestamp("2025-02-01"), pd.Timestamp("2025-03-01")]
+
+
+def test_append_player_history_copies_and_rolls_up(tmp_path, fake_engine):
+    samples_csv = tmp_path / "samples.csv"
+    pd.DataFrame({
+        "appid": [1, 2],
+        "observed_at": ["2025-03-01T10:00:00+00:00"] * 2,
+        "player_count": [5, 7],
+    }).to_csv(samples_csv, index=False)
+
+    assert history.append_player_history(samples_csv) == 2
+
+    ddl = [c.args[0].text for c in fake_engine["conn"].execute.call_args_list]
+    assert any("PARTITION BY RANGE" in sql for sql in ddl)
+    assert any("player_count_history_y2025m03" in sql for sql in ddl)
+
+    fake_engine["cursor"].copy_expert.assert_called_once()
+    executed = [c.args[0] for c in fake_engine["cursor"].execute.call_args_list]
+    assert any("INSERT INTO c12de.player_count_history" in s for s in executed)
+    rollups = [s for s in executed if "player_count_rollup" in s]
+    assert len(rollups) == len(history.GRAINS)
+    fake_engine["raw"].commit.assert_called_once()
+    # the samples are consumed once appended
+    assert not samples_csv.exists()
+
+
+def test_append_player_history_without_samples(tmp_path, fake_engine):
+    assert history.append_player_history(tmp_path / "missing.csv") == 0
+    # tables are still created so the dashboard can query them
+    fake_engine["conn"].execute.assert_called_once()
+    fake_engine["cursor"].copy_expert.assert_not_called()
+
+
+def test_player_trend_rejects_unknown_grain():
+    with pytest.raises(ValueError):
+        history.player_trend(MagicMock(), 1, grain="minute")
@@ -0,0 +1,177 @@
+import pandas as pd
+import pytest
+
+import etl.transform.enrich as enrich
+import etl.transform.incremental as incremental
+
+
+def raw_frame(rows):
+    """Raw Kaggle-shaped rows, `rows` is a list of (appid, name, price)."""
+    n = len(rows)
+    return pd.DataFrame({
+        "appid": [r[0] for r in rows],
+        "name": [r[1] for r in rows],
+        "release_date": ["2023-01-01"] * n,
+        "price": [r[2] for r in rows],
+        "dlc_count": [0] * n,
+        "header_image": [""] * n,
+        "about_the_game": ["desc"] * n,
+        "windows": [True] * n,
+        "mac": [False] * n,
+        "linux": [False] * n,
+        "metacritic_score": [0] * n,
+        "recommendations": [0] * n,
+        "developers": ["Dev"] * n,
+        "categories": ["['Co-op']"] * n,
+        "genres": ["['RPG']"] * n,
+        "positive": [1] * n,
+        "negative": [1] * n,
+        "estimated_owners": ["0-20"] * n,
+        "peak_ccu": [0] * n,
+    })
+
+
+@pytest.fixture
+def enrich_calls(tmp_path, monkeypatch):
+    """Stub the player fetch and record which appids were enriched."""
+    monkeypatch.setattr(enrich, "CACHE_PATH", tmp_path / "cache.csv")
+    calls = []
+
+    def fake_update(df, *paths):
+        calls.append(sorted(df["appid"].tolist()))
+        return df.assign(current_players=df["appid"] * 10)
+
+    monkeypatch.setattr(enrich, "update_current_players", fake_update)
+    return calls
+
+
+# row_hashes / diff_snapshot
+def test_row_hashes_are_stable_and_content_sensitive():
+    df = raw_frame([(1, "A", 0), (2, "B", 5)])
+    first = incremental.row_hashes(df)
+    assert first.equals(incremental.row_hashes(df.copy()))
+
+    df.loc[1, "price"] = 6
+    second = incremental.row_hashes(df)
+    assert first["row_hash"][0] == second["row_hash"][0]
+    assert first["row_hash"][1] != second["row_hash"][1]
+
+    # player counts churn between snapshots, the game did not change
+    df["peak_ccu"] = [100, 200]
+    assert incremental.row_hashes(df).equals(second)
+
+
+def test_diff_snapshot_classifies_rows():
+    previous = pd.DataFrame({"appid": [1, 2, 3], "row_hash": [10, 20, 30]})
+    current = pd.DataFrame({"appid": [1, 2, 4], "row_hash": [10, 21, 40]})
+    diff = incremental.diff_snapshot(current, previous)
+    assert diff["added"].tolist() == [4]
+    assert diff["changed"].tolist() == [2]
+    assert diff["removed"].tolist() == [3]
+
+
+def test_load_hashes_missing_file_is_empty(tmp_path):
+    assert incremental.load_hashes(tmp_path / "none.csv").empty
+
+
+# transform_incremental
+def test_transform_incremental_only_redoes_changed_rows(
+    tmp_path, enrich_calls
+):
+    raw = tmp_path / "raw.csv"
+    enriched = tmp_path / "enriched.csv"
+    hashes = tmp_path / "hashes.csv"
+
+    raw_frame([(1, "A", 0), (2, "B", 5), (3, "C", 10)]).to_csv(
+        raw, index=False
+    )
+    first = incremental.transform_incremental(raw, enriched, hashes)
+    assert sorted(first["appid"]) == [1, 2, 3]
+    assert enrich_calls == [[1, 2, 3]]
+
+    # B changes price, C disappears, D is new, A is untouched
+    raw_frame([(1, "A", 0), (2, "B", 50), (4, "D", 1)]).to_csv(
+        raw, index=False
+    )
+    second = incremental.transform_incremental(raw, enriched, hashes)
+    assert enrich_calls[-1] == [2, 4]
+    assert sorted(second["appid"]) == [1, 2, 4]
+    assert second.set_index("appid").loc[2, "price_tier"] == "Premium"
+
+    # the merged artifact and hashes are saved for the next run
+    assert sorted(pd.read_csv(enriched)["appid"]) == [1, 2, 4]
+    assert sorted(incremental.load_hashes(hashes)["appid"]) == [1, 2, 4]
+
+    # nothing changed, nothing is enriched
+    incremental.transform_incremental(raw, enriched, hashes)
+    assert len(enrich_calls) == 2
+
+    # neither when only the snapshot's player counts moved
+    churned = raw_frame([(1, "A", 0), (2, "B", 50), (4, "D", 1)])
+    churned["peak_ccu"] = [10, 20, 30]
+    churned.to_csv(raw, index=False)
+    incremental.transform_incremental(raw, enriched, hashes)
+    assert len(enrich_calls) == 2
+
+
+# clean_snapshot / enrich_snapshot
+def test_hashes_are_only_promoted_after_enrich(tmp_path, enrich_calls):
+    raw = tmp_path / "raw.csv"
+    clean = tmp_path / "clean.csv"
+    enriched = tmp_path / "enriched.csv"
+    hashes = tmp_path / "hashes.csv"
+    raw_frame([(1, "A", 0), (2, "B", 5)]).to_csv(raw, index=False)
+
+    incremental.clean_snapshot(raw, clean, enriched, hashes)
+    assert not hashes.exists()
+    assert incremental.pending_hashes_path(hashes).exists()
+
+    # enrich reruns on its own from what clean persisted
+    df = incremental.enrich_snapshot(clean, enriched, hashes)
+    assert sorted(df["appid"]) == [1, 2]
+    assert hashes.exists()
+    assert not incremental.pending_hashes_path(hashes).exists()
+
+
+def test_kept_rows_take_refreshed_player_counts(tmp_path, enrich_calls):
+    raw = tmp_path / "raw.csv"
+    enriched = tmp_path / "enriched.csv"
+    hashes = tmp_path / "hashes.csv"
+    raw_frame([(1, "A", 0), (2, "B", 5)]).to_csv(raw, index=False)
+    incremental.transform_incremental(raw, enriched, hashes)
+
+    # e.g. the prefetch refreshed appid 1 while the extract downloaded
+    pd.DataFrame({
+        "appid": [1], "current_players": [99],
+        "fetched_at": [pd.Timestamp.now(tz="UTC")],
+    }).to_csv(enrich.CACHE_PATH, index=False)
+    df = incremental.transform_incremental(raw, enriched, hashes)
+    assert len(enrich_calls) == 1
+    assert df.set_index("appid")["current_players"].to_dict() == {
+        1: 99, 2: 20,
+    }
+
+
+def test_enriched_file_without_row_hash_is_rebuilt(tmp_path, enrich_calls):
+    raw = tmp_path / "raw.csv"
+    enriched = tmp_path / "enriched.csv"
+    hashes = tmp_path / "hashes.csv"
+    raw_frame([(1, "A", 0), (2, "B", 5)]).to_csv(raw, index=False)
+    incremental.transform_incremental(raw, enriched, hashes)
+
+    # as written before clean kept the row_hash column
+    pd.read_csv(enriched).drop(columns="row_hash").to_csv(
+        enriched, index=False
+    )
+    raw_frame([(1, "A", 0), (2, "B", 50)]).to_csv(raw, index=False)
+    df = incremental.transform_incremental(raw, enriched, hashes)
+    assert enrich_calls[-1] == [1, 2]
+    assert df["row_hash"].notna().all()
+    assert df["row_hash"].dtype == "int64"
+
+
+def test_load_hashes_reads_unsigned_files(tmp_path):
+    path = tmp_path / "hashes.csv"
+    path.write_text("appid,row_hash\n1,18446744073709551615\n2,5\n")
+    hashes = incremental.load_hashes(path)
+    assert hashes["row_hash"].tolist() == [-1, 5]
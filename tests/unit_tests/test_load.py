@@ -77,3 +77,44 @@ def test_load_data_to_postgres_executes(dummy_sql_dir, monkeypatch):
 
     # 2) Verify COPY was called on the psycopg cursor
     fake_cursor.copy_expert.assert_called_once()
+
+
+def test_load_batches_to_postgres_copies_each_batch(monkeypatch):
+    fake_engine = MagicMock()
+    fake_raw = MagicMock()
+    fake_cursor = MagicMock()
+    fake_cursor.rowcount = 2
+    fake_cursor.fetchall.return_value = [("appid",)]
+    fake_raw.cursor.return_value = fake_cursor
+    fake_engine.raw_connection.return_value = fake_raw
+    monkeypatch.setattr(load_mod, "get_engine", lambda: fake_engine)
+    monkeypatch.setattr(load_mod, "bump_version", lambda *a, **k: 1)
+
+    executed_before_last_batch = []
+
+    def batches():
+        yield "appid\n1\n2\n"
+        executed_before_last_batch.extend(
+            c.args[0] for c in fake_cursor.execute.call_args_list
+        )
+        yield "appid\n3\n4\n"
+
+    rows = load_mod.load_batches_to_postgres(batches())
+
+    assert rows == 4
+    assert fake_cursor.copy_expert.call_count == 2
+    assert all(
+        "kr_so_capstone_staging (appid)" in c.args[0]
+        for c in fake_cursor.copy_expert.call_args_list
+    )
+    # the live table already has every column, so it is left alone while
+    #  the batches stream into the staging table
+    assert not any(
+        sql == load_mod.PROJECT_ROOT.joinpath("sql", "create_tb.sql")
+        .read_text() for sql in executed_before_last_batch
+    )
+    executed = [c.args[0] for c in fake_cursor.execute.call_args_list]
+    assert executed[-1] == "DROP TABLE c12de.kr_so_capstone_staging"
+    assert executed[-2].startswith("INSERT INTO c12de.kr_so_capstone (appid)")
+    # the staging table is committed up front, the swap in one transaction
+    assert fake_raw.commit.call_count == 2
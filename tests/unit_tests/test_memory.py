@@ -0,0 +1,12 @@
+from utils.memory import SessionMemory, rss_mb
+
+
+def test_rss_is_positive():
+    assert rss_mb() > 0
+
+
+def test_session_memory_counts_sessions():
+    tracker = SessionMemory()
+    assert tracker.register() == 1
+    assert tracker.register() == 2
+    assert "2 session(s)" in tracker.report()
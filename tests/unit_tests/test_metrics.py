@@ -0,0 +1,88 @@
+import contextvars
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from utils import metrics
+
+
+def read_records(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_helpers_are_no_ops_outside_a_run():
+    assert metrics._active is None
+    with metrics.stage("clean") as values:
+        metrics.record(rows_in=1)
+        metrics.increment(api_calls=1)
+    assert values == {}
+
+
+def test_stages_share_the_run_id(tmp_path):
+    path = tmp_path / "metrics.jsonl"
+    prom = tmp_path / "etl.prom"
+    run = metrics.start_run("run-1", path, prom)
+    try:
+        with metrics.stage("transform"):
+            with metrics.stage("enrich"):
+                metrics.record(rows_in=10, cache_hits=3, cache_misses=1)
+                # the Steam API fetches count from worker threads
+                with ThreadPoolExecutor(max_workers=4) as executor:
+                    for _ in range(100):
+                        executor.submit(
+                            contextvars.copy_context().run,
+                            metrics.increment, api_calls=1,
+                        )
+            metrics.record(rows_out=9)
+    finally:
+        metrics.finish_run()
+    assert metrics._active is None
+
+    records = read_records(path)
+    assert [r["stage"] for r in records] == [
+        "transform.enrich", "transform", "run",
+    ]
+    assert {r["run_id"] for r in records} == {run.run_id}
+    enrich = records[0]
+    assert enrich["api_calls"] == 100
+    assert enrich["cache_hit_ratio"] == 0.75
+    assert enrich["process_peak_rss_bytes"] > 0
+    assert enrich["peak_rss_growth_bytes"] >= 0
+    assert records[1]["rows_out"] == 9
+
+    text = prom.read_text()
+    assert 'etl_run_info{run_id="run-1"} 1' in text
+    assert "etl_run_success 1" in text
+    assert 'etl_stage_api_calls{stage="transform.enrich"} 100' in text
+    assert "etl_stage_status" not in text
+
+
+def test_failed_stage_is_recorded(tmp_path):
+    path = tmp_path / "metrics.jsonl"
+    metrics.start_run("run-2", path)
+    try:
+        with pytest.raises(ValueError):
+            with metrics.stage("load"):
+                raise ValueError("boom")
+    finally:
+        metrics.finish_run("failed")
+    records = read_records(path)
+    assert [(r["stage"], r["status"]) for r in records] == [
+        ("load", "failed"), ("run", "failed"),
+    ]
+
+
+def test_worker_initializer_counts_against_the_callers_stage(tmp_path):
+    path = tmp_path / "metrics.jsonl"
+    metrics.start_run("run-1", path)
+    try:
+        with metrics.stage("prefetch"):
+            with ThreadPoolExecutor(
+                max_workers=4, initializer=metrics.worker_initializer()
+            ) as executor:
+                for _ in range(100):
+                    executor.submit(metrics.increment, api_errors=1)
+    finally:
+        metrics.finish_run()
+    assert read_records(path)[0]["api_errors"] == 100
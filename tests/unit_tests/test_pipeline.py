@@ -0,0 +1,118 @@
+import threading
+import time
+
+import pytest
+
+from etl.pipeline import PipelineError, Stage, run_pipeline, select_stages
+
+
+def diamond(tmp_path, calls, fail=None):
+    """a -> (b, c) -> d through files, b and c share a resource."""
+    def run(name, output=None):
+        def inner():
+            if name == fail:
+                raise ValueError(name)
+            calls.append(name)
+            if output is not None:
+                (tmp_path / output).write_text(name)
+        return inner
+
+    return [
+        Stage("a", run("a", "a.txt"), outputs=(tmp_path / "a.txt",)),
+        Stage("b", run("b", "b.txt"), inputs=(tmp_path / "a.txt",),
+              outputs=(tmp_path / "b.txt",)),
+        Stage("c", run("c", "c.txt"), inputs=(tmp_path / "a.txt",),
+              outputs=(tmp_path / "c.txt",)),
+        Stage("d", run("d"),
+              inputs=(tmp_path / "b.txt", tmp_path / "c.txt")),
+    ]
+
+
+def names(stages):
+    return [stage.name for stage in stages]
+
+
+# select_stages
+def test_select_stages_from_to_and_only(tmp_path):
+    stages = diamond(tmp_path, [])
+    assert names(select_stages(stages)) == ["a", "b", "c", "d"]
+    assert names(select_stages(stages, start="b")) == ["b", "d"]
+    assert names(select_stages(stages, stop="b")) == ["a", "b"]
+    assert names(select_stages(stages, start="a", stop="c")) == ["a", "c"]
+    assert names(select_stages(stages, only=["c", "a"])) == ["a", "c"]
+    with pytest.raises(PipelineError, match="Unknown stage"):
+        select_stages(stages, only=["nope"])
+
+
+# run_pipeline
+def test_run_pipeline_respects_dependencies(tmp_path):
+    calls = []
+    timings = run_pipeline(diamond(tmp_path, calls))
+    assert calls[0] == "a" and calls[-1] == "d"
+    assert sorted(calls[1:3]) == ["b", "c"]
+    assert set(timings) == {"a", "b", "c", "d"}
+
+
+def test_partial_run_reads_persisted_inputs(tmp_path):
+    calls = []
+    stages = diamond(tmp_path, calls)
+    rest = select_stages(stages, only=["b", "c", "d"])
+    with pytest.raises(PipelineError, match="run --from a"):
+        run_pipeline(stages, rest)
+    assert calls == []
+
+    run_pipeline(stages, select_stages(stages, only=["a"]))
+    run_pipeline(stages, rest)
+    assert calls[0] == "a" and calls[-1] == "d"
+    assert sorted(calls[1:3]) == ["b", "c"]
+
+
+def test_independent_stages_overlap_unless_they_share_a_resource():
+    barrier = threading.Barrier(2, timeout=5)
+    active, overlaps = [], []
+
+    def together():
+        barrier.wait()
+
+    def alone():
+        active.append(1)
+        overlaps.append(len(active))
+        time.sleep(0.05)
+        active.pop()
+
+    # the barrier only releases if both stages run at once
+    run_pipeline([Stage("x", together), Stage("y", together)])
+    run_pipeline([
+        Stage(name, alone, resources=("db",)) for name in ("p", "q", "r")
+    ])
+    assert overlaps == [1, 1, 1]
+
+
+def test_failure_stops_downstream_stages(tmp_path):
+    calls = []
+    with pytest.raises(PipelineError) as info:
+        run_pipeline(diamond(tmp_path, calls, fail="b"))
+    message = str(info.value)
+    assert "Stage b failed" in message
+    assert "Not run: d" in message
+    assert "--from b" in message
+    assert "d" not in calls
+    assert isinstance(info.value.__cause__, ValueError)
+
+
+def test_failure_cancels_running_stages():
+    cancelled = threading.Event()
+
+    def fail():
+        time.sleep(0.05)
+        raise ValueError("bad download")
+
+    stages = [
+        Stage("slow", lambda: cancelled.wait(5), cancel=cancelled.set),
+        Stage("check", fail),
+    ]
+    start = time.perf_counter()
+    with pytest.raises(PipelineError, match="Stage check failed"):
+        run_pipeline(stages)
+    assert cancelled.is_set()
+    assert time.perf_counter() - start < 1
@@ -0,0 +1,105 @@
+import threading
+
+import pandas as pd
+import pytest
+
+import etl.transform.enrich as enrich
+from etl.transform.prefetch import PlayerPrefetch
+
+
+@pytest.fixture
+def enriched_csv(tmp_path, monkeypatch):
+    """
+    A previous run that loaded appids 1-3 and cached their counts two
+    TTLs ago, plus a fresh cache entry for appid 4.
+    """
+    monkeypatch.setattr(enrich, "CACHE_PATH", tmp_path / "cache.csv")
+    monkeypatch.setattr(enrich, "SAMPLES_PATH", tmp_path / "samples.csv")
+    old = pd.Timestamp.now(tz="UTC") - 2 * enrich.PLAYER_CACHE_TTL
+    pd.DataFrame({
+        "appid": [1, 2, 3, 4],
+        "current_players": [1, 2, 3, 4],
+        "fetched_at": [old, old, old, pd.Timestamp.now(tz="UTC")],
+    }).to_csv(enrich.CACHE_PATH, index=False)
+    csv = tmp_path / "steam_games_enriched.csv"
+    pd.DataFrame({"appid": [1, 2, 4], "current_players": [1, 2, 4]}) \
+        .to_csv(csv, index=False)
+    return csv
+
+
+def test_prefetch_refreshes_stale_known_appids(enriched_csv, monkeypatch):
+    calls = []
+
+    def fetch(aid):
+        calls.append(aid)
+        return aid * 100
+
+    monkeypatch.setattr(enrich, "fetch_current_players", fetch)
+    assert PlayerPrefetch(enriched_csv).run() == 2
+    # 3 is stale but no longer loaded, 4 is fresh
+    assert sorted(calls) == [1, 2]
+
+    cache = enrich.load_player_cache().set_index("appid")
+    assert cache["current_players"].to_dict() == {
+        1: 100, 2: 200, 3: 3, 4: 4,
+    }
+    assert not enrich.stale_entries(cache.loc[[1, 2]]).any()
+    assert sorted(pd.read_csv(enrich.SAMPLES_PATH)["appid"]) == [1, 2]
+
+
+def test_reconcile_drops_appids_that_disappeared(enriched_csv, monkeypatch):
+    started, release = threading.Event(), threading.Event()
+
+    def fetch(aid):
+        started.set()
+        release.wait(5)
+        return 7
+
+    monkeypatch.setattr(enrich, "fetch_current_players", fetch)
+    prefetch = PlayerPrefetch(enriched_csv, max_workers=1)
+    runner = threading.Thread(target=prefetch.run)
+    runner.start()
+    started.wait(5)
+    # the new snapshot no longer has appid 1, whose call is in flight
+    prefetch.reconcile([2, 5])
+    release.set()
+    runner.join(5)
+
+    cache = enrich.load_player_cache().set_index("appid")
+    assert cache.loc[1, "current_players"] == 1
+    assert cache.loc[2, "current_players"] == 7
+
+
+def test_cancel_discards_everything(enriched_csv, monkeypatch):
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def fetch(aid):
+        calls.append(aid)
+        started.set()
+        release.wait(5)
+        return 7
+
+    monkeypatch.setattr(enrich, "fetch_current_players", fetch)
+    prefetch = PlayerPrefetch(enriched_csv, max_workers=1)
+    runner = threading.Thread(target=prefetch.run)
+    runner.start()
+    started.wait(5)
+    # e.g. validate failed, the queued call for appid 2 never runs
+    prefetch.cancel()
+    release.set()
+    runner.join(5)
+
+    assert calls == [1]
+    cache = enrich.load_player_cache().set_index("appid")
+    assert cache["current_players"].to_dict() == {1: 1, 2: 2, 3: 3, 4: 4}
+    assert not enrich.SAMPLES_PATH.exists()
+
+
+def test_update_current_players_refetches_stale_entries(
+    enriched_csv, monkeypatch
+):
+    monkeypatch.setattr(enrich, "fetch_current_players", lambda aid: 50)
+    df = pd.DataFrame({"appid": [1, 4], "current_players": [0, 0]})
+    out = enrich.update_current_players(df).set_index("appid")
+    assert out["current_players"].to_dict() == {1: 50, 4: 4}
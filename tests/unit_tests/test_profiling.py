@@ -0,0 +1,77 @@
+import pstats
+import threading
+
+from utils import profiling
+
+
+def build_list(n):
+    return [str(i) for i in range(n)]
+
+
+@profiling.profiled()
+def build(n):
+    return build_list(n)
+
+
+def test_steps_are_no_ops_when_profiling_is_off():
+    assert profiling._active is None
+    with profiling.step("anything"):
+        pass
+    assert build(3) == ["0", "1", "2"]
+
+
+def test_nested_steps_write_their_own_reports(tmp_path):
+    profiling.enable(tmp_path)
+    try:
+        with profiling.step("transform"):
+            build(50_000)
+    finally:
+        profiling.disable()
+    assert profiling._active is None
+
+    for base in ("01-transform", "02-transform.build"):
+        for suffix in (".pstats", ".txt", ".collapsed", ".alloc.txt"):
+            assert (tmp_path / f"{base}{suffix}").exists()
+
+    # the parent's profile includes what its sub-step called
+    parent = pstats.Stats(str(tmp_path / "01-transform.pstats"))
+    assert any(func == "build_list" for _, _, func in parent.stats)
+
+    summary = (tmp_path / "summary.txt").read_text().splitlines()
+    assert [line.split()[0] for line in summary[1:]] == [
+        "transform", "transform.build",
+    ]
+    assert (tmp_path / "02-transform.build.alloc.txt").read_text() \
+        .startswith("peak traced memory")
+
+
+def test_only_one_thread_is_traced_at_a_time(tmp_path):
+    entered, release = threading.Event(), threading.Event()
+
+    def stage():
+        with profiling.step("enrich"):
+            entered.set()
+            release.wait(5)
+
+    profiling.enable(tmp_path)
+    try:
+        worker = threading.Thread(target=stage)
+        worker.start()
+        entered.wait(5)
+        # e.g. the streaming producer next to the load, Python 3.12+
+        #  refuses a second active cProfile
+        with profiling.step("producer"):
+            build(1000)
+        release.set()
+        worker.join(5)
+        # the slot is free again once the tracing step finished
+        with profiling.step("similar"):
+            build(1000)
+    finally:
+        profiling.disable()
+
+    assert (tmp_path / "01-enrich.pstats").exists()
+    assert not (tmp_path / "02-producer.pstats").exists()
+    assert "not traced" in (tmp_path / "02-producer.txt").read_text()
+    assert (tmp_path / "02-producer.collapsed").exists()
+    assert (tmp_path / "04-similar.pstats").exists()
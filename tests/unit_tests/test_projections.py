@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboard.projections import Projections, Scenario
+
+
+@pytest.fixture
+def projections():
+    return Projections(pd.DataFrame({
+        "appid": [1, 2, 3],
+        "name": ["A", "B", "C"],
+        "estimated_owners": [1000, 200, 50],
+        "price": [0.0, 10.0, 50.0],
+        "price_tier": ["Free", "Indie", "Premium"],
+    }))
+
+
+def test_default_scenario_matches_the_enrich_estimate(projections):
+    (revenue,) = projections.project([Scenario()])
+    # estimated_owners * price * 0.7, as in enrich_price
+    assert revenue.tolist() == pytest.approx([0, 1400, 1750])
+
+
+def test_scenarios_broadcast_over_every_game(projections):
+    scenarios = [
+        Scenario(platform_cut=0.2, refund_rate=0.5),
+        Scenario(conversion_rate=0.1, regional_discount=0.5),
+        Scenario(tier_price_change=(("Premium", 0.2),)),
+    ]
+    revenue = projections.project(scenarios)
+    assert revenue.shape == (3, 3)
+    assert revenue[0].tolist() == pytest.approx([0, 800, 1000])
+    assert revenue[1].tolist() == pytest.approx([0, 70, 87.5])
+    # only the premium game's price moves
+    assert revenue[2].tolist() == pytest.approx([0, 1400, 2100])
+
+
+def test_summary_totals_and_tiers(projections):
+    result = projections.summary(Scenario(platform_cut=0.0), top_n=2)
+    assert result["baseline"] == pytest.approx(3150)
+    assert result["projected"] == pytest.approx(4500)
+    assert result["by_tier"].loc["Indie", "projected"] == pytest.approx(2000)
+    assert result["by_tier"].loc["Standard"].tolist() == [0, 0]
+    assert result["top_games"]["appid"].tolist() == [3, 2]
+    assert np.isfinite(result["top_games"]["projected"]).all()
@@ -0,0 +1,52 @@
+import pandas as pd
+import pytest
+from unittest.mock import MagicMock
+
+import etl.load.queries as queries
+
+
+# tag_filter_clause
+def test_tag_filter_clause_any_uses_overlap():
+    sql, params = queries.tag_filter_clause("genres", ["RPG", " Action "])
+    assert sql == "genre_tags && CAST(:genres AS TEXT[])"
+    assert params == {"genres": ["RPG", "Action"]}
+
+
+def test_tag_filter_clause_all_uses_contains():
+    sql, params = queries.tag_filter_clause(
+        "categories", ["Single-player"], match="all", param="cats"
+    )
+    assert sql == "category_tags @> CAST(:cats AS TEXT[])"
+    assert params == {"cats": ["Single-player"]}
+
+
+def test_tag_filter_clause_empty_tags_skips_filter():
+    assert queries.tag_filter_clause("genres", []) == (None, {})
+    assert queries.tag_filter_clause("genres", ["", "  "]) == (None, {})
+
+
+def test_tag_filter_clause_rejects_bad_input():
+    with pytest.raises(ValueError):
+        queries.tag_filter_clause("developers", ["X"])
+    with pytest.raises(ValueError):
+        queries.tag_filter_clause("genres", ["RPG"], match="some")
+
+
+# filter_games_by_tags
+def test_filter_games_by_tags_builds_query(monkeypatch):
+    captured = {}
+
+    def fake_read_sql(sql, conn, params=None):
+        captured["sql"] = sql.text
+        captured["params"] = params
+        return pd.DataFrame({"appid": [1], "name": ["Game A"]})
+
+    monkeypatch.setattr(queries.pd, "read_sql", fake_read_sql)
+    out = queries.filter_games_by_tags(
+        MagicMock(), genres=["RPG"], categories=["Co-op"], match="all"
+    )
+
+    assert out["appid"].tolist() == [1]
+    assert "genre_tags @> CAST(:genres AS TEXT[])" in captured["sql"]
+    assert "category_tags @> CAST(:categories AS TEXT[])" in captured["sql"]
+    assert captured["params"] == {"genres": ["RPG"], "categories": ["Co-op"]}
@@ -0,0 +1,74 @@
+import argparse
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import etl.load.targets as targets
+from etl.transform.sample import (
+    SampledDataError,
+    is_sampled,
+    mark_sampled,
+    parse_sample,
+    price_tiers,
+    sample_rows,
+)
+
+
+@pytest.fixture
+def catalogue():
+    """1000 games over five release years and all four price tiers."""
+    rng = np.random.default_rng(0)
+    n = 1000
+    return pd.DataFrame({
+        "appid": np.arange(10, 10 + n),
+        "release_date": pd.to_datetime(
+            rng.choice(["2019", "2020", "2021", "2022", "2023"], n)
+        ),
+        "price": rng.choice([0, 9.99, 29.99, 59.99], n, p=[.2, .6, .15, .05]),
+    })
+
+
+def strata(df):
+    return pd.Series(
+        list(zip(df["release_date"].dt.year, price_tiers(df["price"])))
+    ).value_counts()
+
+
+def test_parse_sample():
+    assert parse_sample("0.05") == 0.05
+    assert parse_sample("2000") == 2000
+    for bad in ("0", "-1", "1.5", "abc"):
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_sample(bad)
+
+
+def test_sample_rows_is_stable_and_stratified(catalogue):
+    sample = sample_rows(catalogue, 0.1)
+    assert len(sample) == 100
+    # the input order does not matter, only the appids do
+    shuffled = sample_rows(catalogue.sample(frac=1, random_state=1), 0.1)
+    assert sorted(shuffled["appid"]) == sorted(sample["appid"])
+
+    expected = strata(catalogue) * 0.1
+    assert (strata(sample) - expected).abs().max() < 1
+
+
+def test_sample_rows_by_count(catalogue):
+    assert len(sample_rows(catalogue, 123)) == 123
+    assert len(sample_rows(catalogue, 5000)) == len(catalogue)
+
+
+def test_sampled_files_only_load_into_sample_targets(tmp_path):
+    csv = tmp_path / "steam_games_enriched.csv"
+    pd.DataFrame({
+        "appid": [1], "name": ["A"], "genres": ["RPG"], "categories": [""],
+    }).to_csv(csv, index=False)
+    mark_sampled(tmp_path, 0.1, 1)
+    assert is_sampled(csv)
+
+    with pytest.raises(SampledDataError):
+        targets.SQLiteTarget(tmp_path / "steam.db").load(csv)
+    with pytest.raises(SampledDataError):
+        targets.PostgresTarget().load(csv)
+    targets.SQLiteTarget(tmp_path / "steam.db", sample=True).load(csv)
@@ -0,0 +1,62 @@
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import etl.load.similar as similar_load
+from etl.transform import similar
+
+
+@pytest.fixture
+def games():
+    return pd.DataFrame({
+        "appid": [10, 20, 30, 40],
+        "genres": ["Action,RPG", "Action,RPG", "Puzzle", "RPG"],
+        "categories": ["Co-op", "Co-op", "", "Co-op"],
+        "developers": ["['Studio A']", "['Studio A']", "['Studio B']", None],
+    })
+
+
+def test_explode_tags_reads_both_list_formats():
+    tags = similar.explode_tags(pd.Series(["['A', 'B']", "B,B", None]))
+    assert tags.values.tolist() == [[0, "A"], [0, "B"], [1, "B"]]
+
+
+def test_tag_vectors_are_unit_length(games):
+    vectors = similar.tag_vectors(games)
+    norms = np.sqrt(np.asarray(vectors.multiply(vectors).sum(axis=1)))
+    assert np.allclose(norms.ravel(), 1)
+
+
+def test_similar_games_top_k_per_game(games):
+    result = similar.similar_games(games, top_k=2, block_size=3)
+    ten = result[result["appid"] == 10]
+    # same genres, category and developer, then the RPG co-op game
+    assert ten["neighbour_appid"].tolist() == [20, 40]
+    assert ten["score"].iloc[0] == pytest.approx(1.0)
+    assert ten["rank"].tolist() == [1, 2]
+    # nothing in common with the puzzle game, so it has no neighbours
+    assert 30 not in result["appid"].tolist()
+    assert 30 not in result["neighbour_appid"].tolist()
+    # blocks only bound memory, they never change the result
+    pd.testing.assert_frame_equal(
+        result, similar.similar_games(games, top_k=2, block_size=100)
+    )
+
+
+def test_load_similar_games_copies_by_header(tmp_path, monkeypatch):
+    csv = tmp_path / "similar.csv"
+    pd.DataFrame({
+        "appid": [1], "neighbour_appid": [2], "score": [0.5], "rank": [1]
+    }).to_csv(csv, index=False)
+    engine, cursor = MagicMock(), MagicMock()
+    engine.raw_connection.return_value.cursor.return_value = cursor
+    cursor.fetchone.return_value = (1,)
+    monkeypatch.setattr(similar_load, "get_engine", lambda: engine)
+
+    similar_load.load_similar_games(csv)
+    copy_sql = cursor.copy_expert.call_args.args[0]
+    assert "kr_so_capstone_similar (appid,neighbour_appid,score,rank)" in (
+        copy_sql
+    )
@@ -0,0 +1,32 @@
+import pandas as pd
+
+import etl.load.snapshot as snapshot
+from dashboard.dataset import load_snapshot
+
+
+def test_snapshot_round_trips_and_versions(tmp_path):
+    csv = tmp_path / "enriched.csv"
+    path = tmp_path / "steam.arrow"
+    assert snapshot.snapshot_version(path) is None
+
+    pd.DataFrame({
+        "appid": [1, 2], "name": ["A", "B"], "genres": ["RPG", None],
+    }).to_csv(csv, index=False)
+    snapshot.write_snapshot(csv, path)
+    first = snapshot.snapshot_version(path)
+    assert first is not None
+    assert not path.with_suffix(".arrow.tmp").exists()
+
+    table = snapshot.read_snapshot(path)
+    assert table.num_rows == 2
+    assert table.column("name").to_pylist() == ["A", "B"]
+
+    frame = load_snapshot(path, first).frame
+    assert isinstance(frame["appid"].dtype, pd.ArrowDtype)
+    assert frame["genres"].isna().tolist() == [False, True]
+
+    pd.DataFrame({"appid": [3], "name": ["C"], "genres": ["Indie"]}).to_csv(
+        csv, index=False
+    )
+    snapshot.write_snapshot(csv, path)
+    assert snapshot.snapshot_version(path) != first
@@ -0,0 +1,158 @@
+import pandas as pd
+import pytest
+
+from dashboard.dataset import load_dataset
+from dashboard.queries import FRAME_COLUMNS, Filters
+from dashboard.sources import FrameSource, SqlSource
+from etl.load.targets import SQLiteTarget
+from etl.transform.similar import similar_games
+
+
+@pytest.fixture(scope="module")
+def games():
+    """A small enriched catalogue, including a substring-trap genre."""
+    return pd.DataFrame({
+        "appid": [1, 2, 3, 4],
+        "name": ["A", "B", "C", "D"],
+        "release_date": ["2020-01-01", "2021-01-01", "2021-05-05", None],
+        "price": [0, 10, 50, 5],
+        "dlc_count": [0, 1, 2, 0],
+        "header_image": ["a.jpg", "b.jpg", "c.jpg", "d.jpg"],
+        "about_the_game": ["a", "b", "c", "d"],
+        "windows": [True, True, False, True],
+        "mac": [False, True, True, False],
+        "linux": [False, False, True, False],
+        "metacritic_score": [1, 2, 3, 4],
+        "recommendations": [1, 2, 3, 4],
+        "developers": ["D", "E", "F", "G"],
+        "categories": ["Co-op", "Single-player", "Co-op,Single-player", ""],
+        "genres": ["Action,RPG", "RPG", "Indie", "Action RPG"],
+        "positive": [1, 2, 3, 4],
+        "negative": [1, 1, 1, 1],
+        "estimated_owners": [10, 20, 30, 40],
+        "current_players": [100, 50, 10, 75],
+        "release_year": [2020, 2021, 2021, None],
+        "estimated_revenue": [0, 140, 1050, 140],
+        "price_tier": ["Free", "Indie", "Premium", "Indie"],
+        "positive_ratio": [50.0, 66.7, 75.0, 80.0],
+    })
+
+
+@pytest.fixture(scope="module")
+def sources(games, tmp_path_factory):
+    """The same catalogue behind the SQL (SQLite) and in-memory sources."""
+    tmp = tmp_path_factory.mktemp("sources")
+    csv = tmp / "enriched.csv"
+    games.to_csv(csv, index=False)
+    target = SQLiteTarget(tmp / "steam.db")
+    target.load(csv)
+    similar_csv = tmp / "similar.csv"
+    similar_games(games).to_csv(similar_csv, index=False)
+    target.load_similar(similar_csv)
+    engine = target.engine()
+    dataset = load_dataset(engine)
+    return [SqlSource(engine), FrameSource(dataset.frame, engine)]
+
+
+FILTERS = [
+    Filters(),
+    Filters(genres=("RPG",)),
+    Filters(genres=("RPG", "Action"), match="all"),
+    Filters(categories=("Co-op",), years=(2021,)),
+    Filters(tiers=("Indie",)),
+]
+
+
+@pytest.mark.parametrize("filters", FILTERS)
+def test_sources_agree_on_top_games(sources, filters):
+    results = [s.top_games(filters, 10) for s in sources]
+    assert results[0]["appid"].tolist() == results[1]["appid"].tolist()
+    assert list(results[0].columns) == [
+        "appid", "name", "header_image", "current_players"
+    ]
+
+
+@pytest.mark.parametrize("filters", FILTERS)
+def test_sources_agree_on_release_counts(sources, filters):
+    sql, frame = (s.release_counts(filters) for s in sources)
+    assert sql.to_dict() == frame.to_dict()
+
+
+def test_tag_filters_match_whole_tags(sources):
+    # "Action RPG" must not match a filter on "RPG"
+    for source in sources:
+        top = source.top_games(Filters(genres=("RPG",)), 10)
+        assert 4 not in top["appid"].tolist()
+
+
+def test_filter_options_and_details(sources):
+    sql, frame = sources
+    assert sql.filter_options() == frame.filter_options()
+    assert sql.filter_options()["genres"] == [
+        "Action", "Action RPG", "Indie", "RPG"
+    ]
+    assert sql.game_details(3)["name"] == "C"
+    assert sql.game_details(99) is None
+    assert frame.game_details(3)["name"] == "C"
+
+
+def test_summary_frame_fetches_images_and_details_by_appid(games, sources):
+    # the memory source only holds the summary and filter columns
+    sql = sources[0]
+    frame = FrameSource(
+        games[list(FRAME_COLUMNS)].copy(), sql.engine
+    )
+    top = frame.top_games(Filters(), 2)
+    assert top["header_image"].tolist() == ["a.jpg", "d.jpg"]
+    details = frame.game_details(3)
+    assert details["about_the_game"] == "c"
+    assert frame.game_details(99) is None
+
+
+def test_dataset_is_arrow_backed_summary(sources):
+    frame = sources[1].df
+    assert list(frame.columns) == list(FRAME_COLUMNS)
+    assert all(isinstance(t, pd.ArrowDtype) for t in frame.dtypes)
+
+
+def test_search_pages_ranked_matches(sources):
+    sql, frame = sources
+    for source in (sql, frame):
+        # B is the closest match, A and D tie and go by current players
+        results, total = source.search("rpg", 1, 2)
+        assert total == 3
+        assert results["appid"].tolist() == [2, 1]
+        assert list(results.columns) == [
+            "appid", "name", "header_image", "current_players"
+        ]
+        page_two, _ = source.search("rpg", 2, 2)
+        assert page_two["appid"].tolist() == [4]
+        assert source.search("nothing-like-this", 1, 5)[1] == 0
+
+
+def test_search_punctuation_only_is_an_empty_page(sources):
+    for source in sources:
+        results, total = source.search("!!", 1, 10)
+        assert total == 0
+        assert results.empty
+        assert list(results.columns) == [
+            "appid", "name", "header_image", "current_players"
+        ]
+
+
+def test_search_without_database_matches_names(games):
+    frame = FrameSource(games)
+    results, total = frame.search("b", 1, 10)
+    assert total == 1
+    assert results["appid"].tolist() == [2]
+
+
+def test_similar_games_is_one_read_per_game(sources):
+    for source in sources:
+        similar = source.similar_games(2, 5)
+        # B (RPG, single-player) is closest to A (Action, RPG)
+        assert similar["appid"].iloc[0] == 1
+        assert list(similar.columns) == [
+            "appid", "name", "header_image", "current_players", "score"
+        ]
+    assert FrameSource(sources[1].df).similar_games(2, 5).empty
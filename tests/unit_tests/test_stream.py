@@ -0,0 +1,118 @@
+import threading
+
+import pandas as pd
+import pytest
+from sqlalchemy import text
+
+import etl.transform.enrich as enrich
+from etl.load.targets import SQLiteTarget
+from etl.stream import stream_batches, stream_to_target
+
+
+def frames(n, rows=2):
+    """n enriched-shaped batches with consecutive appids."""
+    for i in range(n):
+        yield pd.DataFrame({
+            "appid": range(i * rows + 1, (i + 1) * rows + 1),
+            "name": ["G"] * rows,
+            "genres": ["RPG"] * rows,
+            "categories": [""] * rows,
+            "current_players": [i] * rows,
+        })
+
+
+# stream_batches
+def test_full_queue_blocks_the_producer():
+    produced = []
+
+    def producer():
+        for i in range(10):
+            produced.append(i)
+            yield i
+
+    def consume(stream):
+        seen = []
+        for item in stream:
+            # the producer is at most the queue size plus the batch it
+            #  is trying to put ahead of the consumer
+            assert len(produced) - len(seen) <= 3
+            seen.append(item)
+        return seen
+
+    assert stream_batches(producer(), consume, maxsize=2) == list(range(10))
+
+
+def test_producer_errors_reach_the_consumer():
+    def producer():
+        yield 1
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError, match="boom"):
+        stream_batches(producer(), list)
+
+
+def test_consumer_errors_stop_the_producer():
+    closed = threading.Event()
+
+    def producer():
+        try:
+            while True:
+                yield 1
+        finally:
+            closed.set()
+
+    def consume(stream):
+        next(stream)
+        raise RuntimeError("load failed")
+
+    with pytest.raises(RuntimeError, match="load failed"):
+        stream_batches(producer(), consume, maxsize=1)
+    assert closed.is_set()
+
+
+# stream_to_target
+def test_stream_to_target_loads_and_writes_the_csv(tmp_path):
+    target = SQLiteTarget(tmp_path / "steam.db")
+    csv_path = tmp_path / "steam_games_enriched.csv"
+    assert stream_to_target(frames(3), target, csv_path) == 6
+
+    with target.engine().connect() as conn:
+        assert conn.execute(
+            text("SELECT COUNT(*) FROM kr_so_capstone")
+        ).scalar() == 6
+    df = pd.read_csv(csv_path)
+    assert df["appid"].tolist() == [1, 2, 3, 4, 5, 6]
+    assert not list(tmp_path.glob("*.streaming.csv"))
+
+
+def test_failed_stream_keeps_the_previous_csv(tmp_path):
+    csv_path = tmp_path / "steam_games_enriched.csv"
+    csv_path.write_text("appid\n1\n")
+
+    def broken():
+        yield from frames(1)
+        raise ValueError("fetch failed")
+
+    with pytest.raises(ValueError):
+        stream_to_target(broken(), SQLiteTarget(tmp_path / "steam.db"),
+                         csv_path)
+    assert csv_path.read_text() == "appid\n1\n"
+    assert not list(tmp_path.glob("*.streaming.csv"))
+
+
+def test_stream_to_target_keeps_one_column_order(tmp_path):
+    # kept rows from an older CSV, then fresh rows in enrich's order
+    kept = pd.DataFrame({
+        "name": ["A"], "appid": [1], "genres": ["RPG"], "categories": [""],
+    })
+    fresh = pd.DataFrame({
+        "appid": [2], "categories": [""], "genres": ["RPG"], "name": ["B"],
+    })
+    csv_path = tmp_path / "steam_games_enriched.csv"
+    assert stream_to_target(
+        iter([kept, fresh]), SQLiteTarget(tmp_path / "steam.db"), csv_path
+    ) == 2
+    df = pd.read_csv(csv_path)
+    assert df.columns.tolist() == ["name", "appid", "genres", "categories"]
+    assert df["appid"].tolist() == [1, 2]
+    assert df["name"].tolist() == ["A", "B"]
@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+
+from dashboard.tag_index import TagIndex
+
+
+def make_index():
+    return TagIndex(pd.Series(["Action,RPG", "RPG", None, "Action RPG", ""]))
+
+
+def test_vocabulary_is_sorted_whole_tags():
+    index = make_index()
+    assert index.tags == ["Action", "Action RPG", "RPG"]
+    assert index.matrix.shape == (5, 3)
+    assert index.matrix.dtype == bool
+
+
+def test_match_any_and_all():
+    index = make_index()
+    assert index.match(["RPG"]).tolist() == [True, True, False, False, False]
+    assert index.match(["RPG", "Action"], "any").tolist() == [
+        True, True, False, False, False
+    ]
+    assert index.match(["RPG", "Action"], "all").tolist() == [
+        True, False, False, False, False
+    ]
+
+
+def test_unknown_tags():
+    index = make_index()
+    # unknown tags add nothing to "any" and rule out every row for "all"
+    assert index.match(["Nope", "RPG"], "any").sum() == 2
+    assert not np.any(index.match(["Nope", "RPG"], "all"))
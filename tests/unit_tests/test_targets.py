@@ -0,0 +1,121 @@
+import sqlite3
+
+import pandas as pd
+import pytest
+from sqlalchemy import text
+
+import etl.load.targets as targets
+from etl.load.version import data_versions
+
+
+@pytest.fixture
+def enriched_csv(tmp_path):
+    """Minimal enriched CSV with list columns and a missing value."""
+    csv = tmp_path / "steam_games_enriched.csv"
+    pd.DataFrame({
+        "appid": [1, 2, 3],
+        "name": ["A", "B", "C"],
+        "genres": ["Action,RPG", "RPG", None],
+        "categories": ["Co-op", "", "Co-op,Single-player"],
+        "current_players": [10, 20, 30],
+    }).to_csv(csv, index=False)
+    return csv
+
+
+# get_load_target
+def test_get_load_target_by_name_and_env(monkeypatch):
+    assert isinstance(targets.get_load_target("postgres"),
+                      targets.PostgresTarget)
+    monkeypatch.setenv("LOAD_TARGET", "sqlite")
+    assert isinstance(targets.get_load_target(), targets.SQLiteTarget)
+    with pytest.raises(ValueError):
+        targets.get_load_target("duckdb")
+
+
+# split_tags
+def test_split_tags_skips_empty_cells():
+    chunk = pd.DataFrame({"appid": [1, 2, 3],
+                          "genres": ["Action, RPG", "", None]})
+    assert list(targets.split_tags(chunk, "genres")) == [
+        ("Action", 1), ("RPG", 1)
+    ]
+
+
+# SQLiteTarget
+def test_sqlite_target_loads_table_and_bridges(tmp_path, enriched_csv,
+                                               monkeypatch):
+    monkeypatch.setattr(targets, "BATCH_SIZE", 2)
+    target = targets.SQLiteTarget(tmp_path / "steam.db")
+    target.load(enriched_csv)
+    # reloading replaces the data instead of appending to it
+    target.load(enriched_csv)
+
+    with target.engine().connect() as conn:
+        assert conn.execute(
+            text("SELECT COUNT(*) FROM kr_so_capstone")
+        ).scalar() == 3
+        genres = conn.execute(text(
+            "SELECT genre, appid FROM kr_so_capstone_genres "
+            "ORDER BY genre, appid"
+        )).all()
+        assert [tuple(r) for r in genres] == [
+            ("Action", 1), ("RPG", 1), ("RPG", 2)
+        ]
+        assert conn.execute(
+            text("SELECT COUNT(*) FROM kr_so_capstone_categories")
+        ).scalar() == 3
+    # every load publishes a new data version
+    assert data_versions(target.engine()) == (("kr_so_capstone", 2),)
+
+
+def test_sqlite_target_stream_keeps_old_rows_until_the_end(tmp_path,
+                                                           enriched_csv):
+    target = targets.SQLiteTarget(tmp_path / "steam.db")
+    target.load(enriched_csv)
+    seen = []
+
+    def reader_count():
+        with sqlite3.connect(target.path) as reader:
+            return reader.execute(
+                "SELECT COUNT(*) FROM kr_so_capstone"
+            ).fetchone()[0]
+
+    def batches():
+        for appid in (4, 5):
+            seen.append(reader_count())
+            yield f"appid,name,genres,categories\n{appid},X,RPG,\n"
+        seen.append(reader_count())
+
+    assert target.load_stream(batches()) == 2
+    # a second connection sees the previous rows while the batches stream
+    assert seen == [3, 3, 3]
+    assert reader_count() == 2
+    with target.engine().connect() as conn:
+        genres = conn.execute(text(
+            "SELECT genre, appid FROM kr_so_capstone_genres ORDER BY appid"
+        )).all()
+    assert [tuple(r) for r in genres] == [("RPG", 4), ("RPG", 5)]
+
+
+def test_sqlite_target_rollups_merge_runs(tmp_path):
+    target = targets.SQLiteTarget(tmp_path / "steam.db")
+    samples = tmp_path / "samples.csv"
+    for count, hour in ((10, "10:05"), (30, "10:45")):
+        pd.DataFrame({
+            "appid": [1],
+            "observed_at": [f"2025-03-01T{hour}:00+00:00"],
+            "player_count": [count],
+        }).to_csv(samples, index=False)
+        assert target.append_history(samples) == 1
+        assert not samples.exists()
+
+    with target.engine().connect() as conn:
+        rows = conn.execute(text(
+            "SELECT grain, bucket_start, sample_count, max_players, "
+            "avg_players FROM player_count_rollup ORDER BY grain"
+        )).all()
+    assert [tuple(r) for r in rows] == [
+        ("day", "2025-03-01T00:00:00Z", 2, 30, 20.0),
+        ("hour", "2025-03-01T10:00:00Z", 2, 30, 20.0),
+    ]
+    assert data_versions(target.engine()) == (("player_count_rollup", 2),)
@@ -0,0 +1,80 @@
+import pandas as pd
+import pytest
+
+from etl.transform.clean import COLUMNS_FOR_ANALYSIS
+from etl.transform.validate import (
+    ValidationError,
+    check_header,
+    check_values,
+    validate_raw,
+)
+
+
+@pytest.fixture
+def raw():
+    """200 valid raw rows, as strings like validate_raw reads them."""
+    n = 200
+    df = pd.DataFrame({col: ["x"] * n for col in COLUMNS_FOR_ANALYSIS})
+    df["appid"] = [str(10 + i) for i in range(n)]
+    df["name"] = [f"Game {i}" for i in range(n)]
+    df["release_date"] = "Oct 21, 2008"
+    df["price"] = "9.99"
+    for col in ("dlc_count", "recommendations", "positive", "negative",
+                "peak_ccu"):
+        df[col] = "0"
+    df["metacritic_score"] = "85"
+    for col in ("windows", "mac", "linux"):
+        df[col] = "True"
+    df["estimated_owners"] = "0 - 20000"
+    return df
+
+
+def test_valid_snapshot_passes(raw, tmp_path):
+    assert check_values(raw) == []
+    path = tmp_path / "games.csv"
+    raw.to_csv(path, index=False)
+    assert validate_raw(path) == len(raw)
+
+
+def test_renamed_column_gets_a_hint():
+    columns = [
+        c if c != "peak_ccu" else "peak_ccus" for c in COLUMNS_FOR_ANALYSIS
+    ]
+    assert check_header(columns) == [
+        "missing column peak_ccu (renamed to peak_ccus?)"
+    ]
+
+
+def test_format_changes_fail_past_the_threshold(raw):
+    raw.loc[:2, "price"] = "free"
+    # 3 of 200 invalid is past 1% but within 5%
+    assert [p.split(":")[0] for p in check_values(raw)] == ["price"]
+    assert check_values(raw, max_share=0.05) == []
+
+    raw["estimated_owners"] = "0 .. 20000"
+    raw["release_date"] = "someday"
+    failed = [p.split(":")[0] for p in check_values(raw, max_share=0.05)]
+    assert failed == ["release_date", "estimated_owners"]
+
+
+def test_appids_must_be_unique_and_present(raw):
+    raw.loc[1, "appid"] = "10"
+    problems = check_values(raw)
+    assert len(problems) == 1 and "primary key" in problems[0]
+    # an exact duplicate row is dropped by clean, so it passes
+    raw.loc[1] = raw.loc[0]
+    assert check_values(raw) == []
+
+    raw.loc[5, "appid"] = None
+    assert check_values(raw) == ["appid: 1 rows have no appid"]
+
+
+def test_validate_raw_raises_before_reading_rows(raw, tmp_path):
+    with pytest.raises(ValidationError, match="file not found"):
+        validate_raw(tmp_path / "missing.csv")
+
+    path = tmp_path / "games.csv"
+    raw.drop(columns="genres").to_csv(path, index=False)
+    with pytest.raises(ValidationError) as err:
+        validate_raw(path)
+    assert err.value.problems == ["missing column genres"]
@@ -0,0 +1,34 @@
+import sqlite3
+from unittest.mock import MagicMock
+
+from sqlalchemy import create_engine
+
+import etl.load.version as version
+
+
+def test_bump_version_counts_up_per_table():
+    conn = sqlite3.connect(":memory:")
+    conn.execute(
+        "CREATE TABLE dataset_version (table_name TEXT PRIMARY KEY, "
+        "version BIGINT NOT NULL, loaded_at TEXT NOT NULL)"
+    )
+    cur = conn.cursor()
+    assert version.bump_version(cur, "a", dialect="sqlite") == 1
+    assert version.bump_version(cur, "a", dialect="sqlite") == 2
+    assert version.bump_version(cur, "b", dialect="sqlite") == 1
+
+
+def test_bump_version_notifies_on_postgres():
+    cur = MagicMock()
+    cur.fetchone.return_value = (7,)
+    assert version.bump_version(cur, "kr_so_capstone", schema="c12de") == 7
+    bump_sql = cur.execute.call_args_list[0].args[0]
+    assert "c12de.dataset_version" in bump_sql
+    assert cur.execute.call_args_list[1].args[1] == (
+        version.VERSION_CHANNEL, "kr_so_capstone:7"
+    )
+
+
+def test_data_versions_empty_before_first_load(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'empty.db'}")
+    assert version.data_versions(engine) == ()
@@ -1,30 +1,108 @@
-import os
-from urllib.parse import quote_plus
-from sqlalchemy import create_engine
-from sqlalchemy.engine import URL
-
-
-# gets the env variables for the database connection
-def get_engine(schema: str = "c12de"):
-    user = os.getenv("DB_USER")
-    password = os.getenv("DB_PASSWORD")
-    host = os.getenv("DB_HOST")
-    port = os.getenv("DB_PORT", "5432")
-    dbname = os.getenv("DB_NAME")
-    if not all([user, password, host, dbname]):
-        raise ValueError(
-            "missing environment variables: "
-        )
-# handles the case when the password contains special characters
-    pw_esc = quote_plus(password)
-# creates the connection string
+from collections.abc import Mapping
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import URL, Engine
+from sqlalchemy.pool import NullPool
+
+from utils.db_config import load_db_config, load_pool_config
+
+# one engine (and so one connection pool) per distinct configuration
+#  per process, every entry point shares it instead of building its own
+_ENGINES: dict[tuple, Engine] = {}
+
+
+def get_engine(
+    application_name: str | None = None,
+    *,
+    source: Mapping | None = None,
+    url: str | None = None,
+    schema: str | None = None,
+    **overrides,
+) -> Engine:
+    """
+    Returns the shared pooled engine for the configured database.
+
+    Connection settings come from load_db_config() and pool settings from
+    load_pool_config(), both read from the environment unless `source`
+    (e.g. st.secrets) is given. Any pool setting can be overridden by
+    keyword, e.g. statement_timeout_ms=0 for long-running loads.
+    `url` bypasses the Postgres settings entirely (used for SQLite).
+
+    Every connection is checked with pre-ping, tagged with
+    application_name and gets the schema search_path and statement
+    timeout. With DB_PGBOUNCER set the pool is left to pgbouncer
+    (NullPool) and those settings are applied with SET LOCAL per
+    transaction, since pgbouncer rejects startup options.
+    """
+    pool = load_pool_config(source)
+    pool.update(overrides)
+    if application_name:
+        pool["application_name"] = application_name
+
+    if url is not None:
+        key = (url,)
+        if key not in _ENGINES:
+            _ENGINES[key] = create_engine(url, pool_pre_ping=True)
+        return _ENGINES[key]
+
+    cfg = load_db_config(source)
+    if schema:
+        cfg["schema"] = schema
+    key = tuple(sorted(cfg.items())) + tuple(sorted(pool.items()))
+    if key not in _ENGINES:
+        _ENGINES[key] = _create_postgres_engine(cfg, pool)
+    return _ENGINES[key]
+
+
+def dispose_engines() -> None:
+    """Close every pooled connection, e.g. in tests or after a fork."""
+    for engine in _ENGINES.values():
+        engine.dispose()
+    _ENGINES.clear()
+
+
+def _create_postgres_engine(cfg: dict, pool: dict) -> Engine:
+    # URL.create escapes special characters in the password itself
     url = URL.create(
         "postgresql+psycopg2",
-        username=user,
-        password=pw_esc,
-        host=host,
-        port=port,
-        database=dbname,
-        query={"options": f"-csearch_path={schema}"}
+        username=cfg["user"],
+        password=cfg["password"] or None,
+        host=cfg["host"],
+        port=int(cfg["port"]),
+        database=cfg["dbname"],
+    )
+    session_settings = {"search_path": cfg["schema"]}
+    if pool["statement_timeout_ms"]:
+        session_settings["statement_timeout"] = pool["statement_timeout_ms"]
+    connect_args = {"application_name": pool["application_name"]}
+
+    if pool["pgbouncer"]:
+        engine = create_engine(
+            url,
+            poolclass=NullPool,
+            pool_pre_ping=True,
+            connect_args=connect_args,
+        )
+
+        @event.listens_for(engine, "begin")
+        def set_local(conn):
+            cur = conn.connection.cursor()
+            for name, value in session_settings.items():
+                cur.execute(
+                    "SELECT set_config(%s, %s, true)", (name, str(value))
+                )
+            cur.close()
+
+        return engine
+
+    connect_args["options"] = " ".join(
+        f"-c{name}={value}" for name, value in session_settings.items()
+    )
+    return create_engine(
+        url,
+        pool_size=pool["pool_size"],
+        max_overflow=pool["max_overflow"],
+        pool_timeout=pool["pool_timeout"],
+        pool_recycle=pool["pool_recycle"],
+        pool_pre_ping=True,
+        connect_args=connect_args,
     )
-    return create_engine(url)
@@ -1,28 +1,82 @@
 import os
+from collections.abc import Mapping
 
 
 class DatabaseConfigError(Exception):
     """Raised when any required DB config is missing or invalid."""
 
 
-def load_db_config() -> dict[str, str]:
+def _getter(source: Mapping | None):
     """
-    Reads DB_NAME, DB_USER, DB_PASSWORD, DB_HOST, DB_PORT from environment
-    and returns a dict with those values. Raises DatabaseConfigError
-    if any required var is unset or empty (except DB_PASSWORD).
+    Returns a lookup over `source` (os.environ when None). Streamlit's
+    st.secrets is a Mapping too, so the cloud app can pass it straight in.
     """
+    src = os.environ if source is None else source
+
     def _get(key: str, default: str | None = None) -> str:
-        val = os.getenv(key)
-        if val:
-            return val
+        val = src.get(key)
+        if val not in (None, ""):
+            return str(val)
         if default is not None:
             return default
         raise DatabaseConfigError(f"Missing env var: {key}")
 
+    return _get
+
+
+def load_db_config(source: Mapping | None = None) -> dict[str, str]:
+    """
+    Reads DB_NAME, DB_USER, DB_PASSWORD, DB_HOST, DB_PORT and DB_SCHEMA
+    from environment (or `source`) and returns a dict with those values.
+    Raises DatabaseConfigError if any required var is unset or empty
+    (DB_PASSWORD, DB_PORT and DB_SCHEMA have defaults).
+    """
+    _get = _getter(source)
     return {
         "dbname":   _get("DB_NAME"),
         "user":     _get("DB_USER"),
-        "password": _get("DB_PASSWORD"),
+        "password": _get("DB_PASSWORD", ""),
         "host":     _get("DB_HOST"),
         "port":     _get("DB_PORT", "5432"),
+        "schema":   _get("DB_SCHEMA", "c12de"),
+    }
+
+
+def load_pool_config(source: Mapping | None = None) -> dict:
+    """
+    Reads the connection pool settings, all optional:
+
+      • DB_POOL_SIZE             connections kept open per process (5)
+      • DB_MAX_OVERFLOW          extra connections allowed under load (5)
+      • DB_POOL_TIMEOUT          seconds to wait for a free connection (30)
+      • DB_POOL_RECYCLE          seconds before a connection is replaced
+                                 (1800)
+      • DB_STATEMENT_TIMEOUT_MS  server side statement timeout, 0 = off
+                                 (30000)
+      • DB_APPLICATION_NAME      tag shown in pg_stat_activity
+                                 (ks-capstone)
+      • DB_PGBOUNCER             true when connecting through pgbouncer in
+                                 transaction pooling mode (false)
+
+    Raises DatabaseConfigError if a numeric setting is not an integer.
+    """
+    _get = _getter(source)
+
+    def _int(key: str, default: int) -> int:
+        val = _get(key, str(default))
+        try:
+            return int(val)
+        except ValueError:
+            raise DatabaseConfigError(f"{key} must be an integer, got {val!r}")
+
+    return {
+        "pool_size":            _int("DB_POOL_SIZE", 5),
+        "max_overflow":         _int("DB_MAX_OVERFLOW", 5),
+        "pool_timeout":         _int("DB_POOL_TIMEOUT", 30),
+        "pool_recycle":         _int("DB_POOL_RECYCLE", 1800),
+        "statement_timeout_ms": _int("DB_STATEMENT_TIMEOUT_MS", 30000),
+        "application_name":     _get("DB_APPLICATION_NAME", "ks-capstone"),
+        "pgbouncer": _get("DB_PGBOUNCER", "false").lower() in (
+            "1", "true", "yes"
+        ),
     }
@@ -1,36 +0,0 @@
-from pathlib import Path
-import logging
-
-
-def setup_logger(name, log_file, level=logging.DEBUG, base_path=None):
-    """Function to setup a logger; can be used in multiple modules."""
-    # Ensure the logs directory exists
-    project_root = Path(base_path or __file__).resolve().parent.parent
-    log_directory = project_root / 'logs'
-    log_directory.mkdir(parents=True, exist_ok=True)
-
-    # Create a logger
-    logger = logging.getLogger(name)
-    logger.setLevel(level)
-
-    # Create file handler
-    file_handler = logging.FileHandler(log_directory / log_file)
-    file_handler.setLevel(level)
-
-    # Create console handler
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(level)
-
-    # Create formatter and add it to the handlers
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
-    file_handler.setFormatter(formatter)
-    console_handler.setFormatter(formatter)
-
-    # Add the handlers to the logger
-    if not logger.handlers:
-        logger.addHandler(file_handler)
-        logger.addHandler(console_handler)
-
-    return logger
@@ -0,0 +1,33 @@
+import threading
+import psutil
+
+
+def rss_mb() -> float:
+    """Resident set size of this process in MB."""
+    return psutil.Process().memory_info().rss / 2**20
+
+
+class SessionMemory:
+    """
+    Tracks process RSS as dashboard sessions join, to show what each
+    additional session costs on top of the shared dataset.
+    """
+
+    def __init__(self):
+        self.baseline_mb = rss_mb()
+        self.sessions = 0
+        self._lock = threading.Lock()
+
+    def register(self) -> int:
+        with self._lock:
+            self.sessions += 1
+            return self.sessions
+
+    def per_session_mb(self) -> float:
+        return (rss_mb() - self.baseline_mb) / max(self.sessions, 1)
+
+    def report(self) -> str:
+        return (
+            f"RSS {rss_mb():.0f} MB over {self.sessions} session(s), "
+            f"{self.per_session_mb():+.1f} MB per session"
+        )
@@ -0,0 +1,216 @@
+import contextvars
+import json
+import os
+import resource
+import threading
+import time
+import uuid
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+# one JSON record per stage and one per run, appended across runs
+METRICS_PATH = Path(
+    os.getenv("ETL_METRICS_PATH", PROJECT_ROOT / "logs" / "etl_metrics.jsonl")
+)
+# node_exporter textfile collector file, only written when set
+PROM_PATH = os.getenv("ETL_METRICS_PROM")
+
+# the run run_etl started, None outside of a run
+_active = None
+# (name, values) of the stages entered so far, per thread or task, so
+#  stages the pipeline runs concurrently do not nest into each other
+_stages = contextvars.ContextVar("metrics_stages", default=())
+
+
+def new_run_id() -> str:
+    """Sortable and unique: UTC start time plus a random suffix."""
+    now = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    return f"{now}-{uuid.uuid4().hex[:6]}"
+
+
+# high-water mark of this process, in bytes (ru_maxrss is in KB on Linux)
+def peak_rss_bytes() -> int:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class RunMetrics:
+    """
+    Collects one record of metrics per stage of an ETL run.
+
+    Stages nest like the profiler's steps ("transform.clean"). Code
+    inside a stage adds values to the innermost one with record() or
+    increment(). Each finished stage is appended to `path` as a JSON
+    line carrying the run id. finish() adds a run record and, if
+    `prom_path` is set, rewrites it as a Prometheus textfile with the
+    latest value of every stage metric.
+    """
+
+    def __init__(self, run_id: str, path: Path, prom_path: Path = None):
+        self.run_id = run_id
+        self.path = Path(path)
+        self.prom_path = Path(prom_path) if prom_path else None
+        self.records = []
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+
+    def _write(self, record: dict):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+
+    @contextmanager
+    def stage(self, name: str):
+        values = {}
+        outer = _stages.get()
+        token = _stages.set(outer + ((name, values),))
+        name = ".".join([s for s, _ in outer] + [name])
+        started_at = datetime.now(timezone.utc).isoformat()
+        start = time.perf_counter()
+        peak_before = peak_rss_bytes()
+        status = "ok"
+        try:
+            yield values
+        except BaseException:
+            status = "failed"
+            raise
+        finally:
+            _stages.reset(token)
+            peak = peak_rss_bytes()
+            record = {
+                "run_id": self.run_id,
+                "stage": name,
+                "status": status,
+                "started_at": started_at,
+                "duration_seconds": round(time.perf_counter() - start, 3),
+                # the process' high-water mark so far, the same for every
+                #  stage after the biggest one, and how much this stage
+                #  (or one running next to it) raised it
+                "process_peak_rss_bytes": peak,
+                "peak_rss_growth_bytes": peak - peak_before,
+                **values,
+            }
+            hits = values.get("cache_hits")
+            misses = values.get("cache_misses")
+            if hits is not None and misses is not None:
+                record["cache_hit_ratio"] = round(
+                    hits / max(hits + misses, 1), 4
+                )
+            self.records.append(record)
+            self._write(record)
+
+    def record(self, **values):
+        stages = _stages.get()
+        if stages:
+            stages[-1][1].update(values)
+
+    # safe to call from worker threads that run in a copy of the stage's
+    #  context, like the Steam API fetches
+    def increment(self, **counts):
+        stages = _stages.get()
+        if not stages:
+            return
+        with self._lock:
+            values = stages[-1][1]
+            for key, count in counts.items():
+                values[key] = values.get(key, 0) + count
+
+    def finish(self, status: str = "ok") -> dict:
+        record = {
+            "run_id": self.run_id,
+            "stage": "run",
+            "status": status,
+            "finished_at": datetime.now(timezone.utc).isoformat(),
+            "duration_seconds": round(time.perf_counter() - self._started, 3),
+            "process_peak_rss_bytes": peak_rss_bytes(),
+        }
+        self.records.append(record)
+        self._write(record)
+        if self.prom_path:
+            self.write_prometheus(record)
+        return record
+
+    def write_prometheus(self, run: dict):
+        """
+        Gauges in the text exposition format, written next to the target
+        and renamed over it so the collector never reads half a file.
+        The run id is only a label on etl_run_info, to keep the series
+        per stage stable across runs.
+        """
+        lines = [
+            f'etl_run_info{{run_id="{self.run_id}"}} 1',
+            f"etl_run_success {int(run['status'] == 'ok')}",
+            f"etl_run_duration_seconds {run['duration_seconds']}",
+            f"etl_run_process_peak_rss_bytes {run['process_peak_rss_bytes']}",
+            f"etl_run_last_timestamp_seconds {time.time():.0f}",
+        ]
+        for record in self.records:
+            if record["stage"] == "run":
+                continue
+            for key, value in record.items():
+                if isinstance(value, bool) or not isinstance(
+                    value, (int, float)
+                ):
+                    continue
+                lines.append(
+                    f'etl_stage_{key}{{stage="{record["stage"]}"}} {value}'
+                )
+        self.prom_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.prom_path.with_suffix(".tmp")
+        tmp_path.write_text("\n".join(lines) + "\n")
+        os.replace(tmp_path, self.prom_path)
+
+
+def start_run(
+    run_id: str | None = None, path: Path = METRICS_PATH, prom_path=PROM_PATH
+) -> RunMetrics:
+    global _active
+    _active = RunMetrics(run_id or new_run_id(), path, prom_path)
+    return _active
+
+
+def finish_run(status: str = "ok"):
+    global _active
+    if _active is not None:
+        _active.finish(status)
+    _active = None
+
+
+def stage(name: str):
+    """A metrics stage while a run is active, else a no-op."""
+    return _active.stage(name) if _active is not None else nullcontext({})
+
+
+def record(**values):
+    """Set values on the innermost stage, ignored outside of a run."""
+    if _active is not None:
+        _active.record(**values)
+
+
+def increment(**counts):
+    """Add to counters on the innermost stage, ignored outside a run."""
+    if _active is not None:
+        _active.increment(**counts)
+
+
+def worker_initializer():
+    """
+    A ThreadPoolExecutor initializer that starts each worker thread in
+    a copy of the caller's context, so what the workers record counts
+    against the caller's stage. Cheaper than copying the context for
+    every submitted call when there are thousands of them.
+    """
+    context = contextvars.copy_context()
+
+    def initialize():
+        for var, value in context.items():
+            var.set(value)
+    return initialize
+
+
+def file_size(path) -> int | None:
+    try:
+        return Path(path).stat().st_size
+    except OSError:
+        return None
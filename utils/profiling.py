@@ -0,0 +1,244 @@
+import cProfile
+import functools
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from pathlib import Path
+
+# seconds between stack samples for the collapsed stacks
+SAMPLE_INTERVAL = 0.005
+# allocation sites listed per step
+TOP_ALLOCATIONS = 25
+# functions listed per step in the text report
+TOP_FUNCTIONS = 40
+
+# the profiler run_etl --profile installed, None when profiling is off
+_active = None
+
+
+@dataclass
+class _Step:
+    name: str
+    index: int
+    started: float
+    # None while another thread holds the process' single cProfile
+    profile: cProfile.Profile | None
+    snapshot: tracemalloc.Snapshot
+    # whether this step took the cProfile slot and releases it on exit
+    owns_profiler: bool = False
+    stacks: Counter = field(default_factory=Counter)
+    # profiles and peaks of nested steps, folded into this one on exit
+    children: list = field(default_factory=list)
+    child_peak: int = 0
+
+
+class Profiler:
+    """
+    cProfile, tracemalloc and a stack sampler around each ETL step.
+
+    Steps nest: while a sub-step runs, its parent's profiler is paused
+    and the sub-step's profile is merged back into the parent's when it
+    finishes, so every step's pstats covers everything it called. Only
+    one thread is traced by cProfile at a time, Python 3.12+ refuses a
+    second active profiler: a step that starts while another thread's
+    step holds it gets timings, sampled stacks and allocations but no
+    pstats. tracemalloc is process wide, so steps that overlap share
+    their peaks. run_etl runs its stages one at a time when profiling,
+    so only threads inside a stage (a streaming producer) compete. For
+    each step `run_dir` gets NN-<path>.pstats, a .txt report of the top
+    functions, a .collapsed file of sampled stacks (for flamegraph.pl
+    or speedscope) and a .alloc.txt of the top allocation sites.
+    """
+
+    def __init__(self, run_dir: Path):
+        self.run_dir = Path(run_dir)
+        self.summary = []
+        # open steps per thread id
+        self._stacks = {}
+        # the thread whose steps cProfile traces, None when it is free
+        self._profiling_thread = None
+        self._count = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler = None
+
+    def start(self):
+        self.run_dir.mkdir(parents=True, exist_ok=True)
+        tracemalloc.start()
+        self._sampler = threading.Thread(
+            target=self._sample, name="profiler-sampler", daemon=True
+        )
+        self._sampler.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+        tracemalloc.stop()
+        self._write_summary()
+
+    def _sample(self):
+        while not self._stop.wait(SAMPLE_INTERVAL):
+            frames = sys._current_frames()
+            with self._lock:
+                for thread_id, steps in self._stacks.items():
+                    frame = frames.get(thread_id)
+                    if frame is None or not steps:
+                        continue
+                    collapsed = _collapse(frame)
+                    for step in steps:
+                        step.stacks[collapsed] += 1
+
+    @contextmanager
+    def step(self, name: str):
+        thread = threading.get_ident()
+        with self._lock:
+            stack = self._stacks.setdefault(thread, [])
+            self._count += 1
+            index = self._count
+            owns = self._profiling_thread is None
+            if owns:
+                self._profiling_thread = thread
+            traced = self._profiling_thread == thread
+        parent = stack[-1] if stack else None
+        if parent is not None and parent.profile is not None:
+            parent.profile.disable()
+        tracemalloc.reset_peak()
+        step = _Step(
+            name=".".join([s.name for s in stack] + [name]),
+            index=index,
+            started=time.perf_counter(),
+            profile=cProfile.Profile() if traced else None,
+            snapshot=tracemalloc.take_snapshot(),
+            owns_profiler=owns,
+        )
+        with self._lock:
+            stack.append(step)
+        if step.profile is not None:
+            step.profile.enable()
+        try:
+            yield
+        finally:
+            if step.profile is not None:
+                step.profile.disable()
+            seconds = time.perf_counter() - step.started
+            peak = max(tracemalloc.get_traced_memory()[1], step.child_peak)
+            with self._lock:
+                stack.pop()
+                if step.owns_profiler:
+                    self._profiling_thread = None
+            self._write_step(step, seconds, peak)
+            if parent is not None:
+                if step.profile is not None:
+                    parent.children.append(step.profile)
+                parent.children.extend(step.children)
+                parent.child_peak = max(parent.child_peak, peak)
+                if parent.profile is not None:
+                    parent.profile.enable()
+
+    def _write_step(self, step: _Step, seconds: float, peak: int):
+        base = self.run_dir / f"{step.index:02d}-{step.name}"
+
+        profiles = [p for p in (step.profile, *step.children) if p]
+        if profiles:
+            stats = pstats.Stats(*profiles)
+            stats.dump_stats(f"{base}.pstats")
+            with open(f"{base}.txt", "w", encoding="utf-8") as f:
+                pstats.Stats(f"{base}.pstats", stream=f) \
+                    .sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+        else:
+            Path(f"{base}.txt").write_text(
+                "not traced by cProfile, another thread's step held it, "
+                "see the .collapsed stacks\n"
+            )
+
+        with open(f"{base}.collapsed", "w", encoding="utf-8") as f:
+            for stack, count in sorted(step.stacks.items()):
+                f.write(f"{stack} {count}\n")
+
+        top = _without_profiler(tracemalloc.take_snapshot()).compare_to(
+            _without_profiler(step.snapshot), "lineno"
+        )
+        with open(f"{base}.alloc.txt", "w", encoding="utf-8") as f:
+            f.write(
+                f"peak traced memory {peak / 2**20:.1f} MB, "
+                f"top {TOP_ALLOCATIONS} sites by growth during the step\n"
+            )
+            for diff in top[:TOP_ALLOCATIONS]:
+                f.write(f"{diff}\n")
+
+        with self._lock:
+            self.summary.append({
+                "index": step.index,
+                "step": step.name,
+                "seconds": round(seconds, 3),
+                "peak_mb": round(peak / 2**20, 1),
+            })
+
+    def _write_summary(self):
+        lines = [f"{'step':<48} {'seconds':>9} {'peak MB':>9}"]
+        for row in sorted(self.summary, key=lambda r: r["index"]):
+            lines.append(
+                f"{row['step']:<48} {row['seconds']:>9.2f} "
+                f"{row['peak_mb']:>9.1f}"
+            )
+        (self.run_dir / "summary.txt").write_text("\n".join(lines) + "\n")
+        print(f"Profiles written to {self.run_dir}")
+
+
+# one sampled stack in the collapsed format, outermost frame first
+def _collapse(frame) -> str:
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append(
+            f"{code.co_name} ({Path(code.co_filename).name}"
+            f":{code.co_firstlineno})"
+        )
+        frame = frame.f_back
+    return ";".join(reversed(stack))
+
+
+# leaves out what the profiler itself allocates
+def _without_profiler(snapshot: tracemalloc.Snapshot) -> tracemalloc.Snapshot:
+    return snapshot.filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, cProfile.__file__),
+        tracemalloc.Filter(False, pstats.__file__),
+        tracemalloc.Filter(False, __file__),
+    ])
+
+
+def enable(run_dir: Path) -> Profiler:
+    global _active
+    _active = Profiler(run_dir).start()
+    return _active
+
+
+def disable():
+    global _active
+    if _active is not None:
+        _active.stop()
+    _active = None
+
+
+def step(name: str):
+    """Profile the block as a step when profiling is on, else a no-op."""
+    return _active.step(name) if _active is not None else nullcontext()
+
+
+def profiled(name: str | None = None):
+    """Decorator form of step(), named after the function by default."""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with step(name or func.__name__):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate